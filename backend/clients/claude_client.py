@@ -2,38 +2,119 @@
 Claude API client — generates AI-powered health summaries using the Anthropic SDK.
 
 Uses the prompt template from PROJECT_SCOPE.md Section 6.
-Retries once on failure before raising.
+Transient errors (rate limits, connection problems, 5xx) are retried with exponential
+backoff (honoring retry-after on 429); anything else is raised at once.
 """
 
-import json
+import asyncio
+import hashlib
+import random
+import time
+from collections import OrderedDict
 
-from anthropic import Anthropic
+import orjson
 
 from backend.config import ANTHROPIC_API_KEY, CLAUDE_MODEL
 from backend.utils.logger import get_logger
 
 log = get_logger("CLAUDE")
 
-PROMPT_TEMPLATE = """You are a concise health analyst. Analyze the following health data and provide:
+# Static instructions — sent as a cacheable system block (prompt caching)
+SYSTEM_INSTRUCTIONS = """You are a concise health analyst. Analyze the following health data and provide:
 
 1. **This Week (7-day):** Key highlights — what went well, what needs attention. Compare actuals vs targets.
 2. **Monthly Trend (30-day):** Are things improving, declining, or stable? Focus on weight trend, sleep quality, and nutrition compliance.
 3. **Correlations:** Any patterns you notice (e.g., sleep quality vs nutrition, HRV vs activity).
 4. **Action Items:** 2-3 specific, actionable recommendations for next week.
 
-Keep it under 300 words. Be direct, no fluff. Use bullet points sparingly — prefer short sentences.
+Keep it under 300 words. Be direct, no fluff. Use bullet points sparingly — prefer short sentences."""
 
-Data (last 7 days):
-{data}
+CACHE_CONTROL = {"type": "ephemeral"}
 
-Monthly data (last 30 days):
-{month_data}
+# Max concurrent Claude requests in generate_many()
+MAX_CONCURRENT_REQUESTS = 5
 
-Targets:
-{targets}
+# Retry config for Claude API
+MAX_ATTEMPTS = 5
+MAX_BACKOFF = 60  # seconds
 
-Previous week summaries:
-{prev_weeks}"""
+# In-process LRU of generated summaries keyed by prompt hash
+RESPONSE_CACHE_SIZE = 128
+_response_cache: OrderedDict[str, str] = OrderedDict()
+
+# Anthropic per-minute input-token budget (proactive throttling)
+TOKENS_PER_MINUTE = 40000
+
+
+class _TokenBucket:
+    """Token bucket that delays requests until the per-minute token budget allows them."""
+
+    def __init__(self, rate_tokens_per_min: int, capacity: int):
+        self.rate = rate_tokens_per_min / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def consume(self, tokens: int):
+        """Wait until `tokens` are available, then take them."""
+        tokens = min(tokens, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return
+            wait = (tokens - self.tokens) / self.rate
+            log.info("throttle", f"Token budget exhausted — waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+
+_bucket = _TokenBucket(rate_tokens_per_min=TOKENS_PER_MINUTE, capacity=TOKENS_PER_MINUTE)
+
+
+def _estimate_tokens(*parts: str) -> int:
+    """Rough token estimate (~4 chars per token)."""
+    return sum(len(p) for p in parts) // 4
+
+
+def _prompt_hash(*parts: str) -> str:
+    """Stable cache key for a prompt."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _cache_response(key: str, summary: str):
+    """Store a summary in the LRU, evicting the oldest entry when full."""
+    _response_cache[key] = summary
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+def _to_json(value) -> str:
+    """Compact JSON for the prompt — indentation only costs input tokens."""
+    return orjson.dumps(value, default=str).decode()
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, capped at MAX_BACKOFF."""
+    return min(MAX_BACKOFF, (2 ** attempt) + random.random())
+
+
+def _retry_after(e: Exception) -> float | None:
+    """Read the retry-after header (seconds) from a 429 response, if present."""
+    try:
+        value = e.response.headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (AttributeError, ValueError):
+        return None
 
 
 class ClaudeClient:
@@ -42,10 +123,15 @@ class ClaudeClient:
     def __init__(self):
         if not ANTHROPIC_API_KEY:
             raise ValueError("ANTHROPIC_API_KEY not set in environment")
-        self.client = Anthropic(api_key=ANTHROPIC_API_KEY)
+        # Imported here so processes that never summarize skip the SDK import cost
+        from anthropic import AsyncAnthropic, APIConnectionError, APIStatusError, RateLimitError
+        self.aclient = AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+        self._rate_limit_error = RateLimitError
+        # APITimeoutError is an APIConnectionError; status errors are only retried when 5xx
+        self._transient_errors = (APIConnectionError, APIStatusError)
         self.model = CLAUDE_MODEL
 
-    def generate_weekly_summary(
+    async def generate_weekly_summary(
         self,
         daily_data: list[dict],
         goals: list[dict],
@@ -54,6 +140,7 @@ class ClaudeClient:
     ) -> str:
         """
         Generate a weekly health summary using Claude.
+        The response is streamed and returned once the stream completes.
 
         Args:
             daily_data: Last 7 days of Daily Log data.
@@ -65,42 +152,101 @@ class ClaudeClient:
             Summary text string, or empty string on failure.
 
         Raises:
-            Exception: After 2 failed attempts.
+            RuntimeError: After MAX_ATTEMPTS failed attempts on transient errors.
+            anthropic.APIStatusError: At once for 4xx errors (bad key, permission, bad request).
         """
         log.info("generate", "START — Calling Claude API for weekly summary")
 
-        prompt = PROMPT_TEMPLATE.format(
-            data=json.dumps(daily_data, indent=2, default=str),
-            month_data=json.dumps(month_data, indent=2, default=str),
-            targets=json.dumps(goals, indent=2, default=str),
-            prev_weeks=json.dumps(prev_week_summaries, indent=2, default=str),
-        )
+        # Monthly block repeats across runs in the same window, so it is cached too.
+        # Empty sections are omitted entirely — they would only cost input tokens.
+        month_body = f"Monthly data (last 30 days):\n{_to_json(month_data)}" if month_data else ""
+        sections = [f"Data (last 7 days):\n{_to_json(daily_data)}"]
+        if goals:
+            sections.append(f"Targets:\n{_to_json(goals)}")
+        if prev_week_summaries:
+            sections.append(f"Previous week summaries:\n{_to_json(prev_week_summaries)}")
+        user_body = "\n\n".join(sections)
+
+        system = [{"type": "text", "text": SYSTEM_INSTRUCTIONS, "cache_control": CACHE_CONTROL}]
+        content = []
+        if month_body:
+            content.append({"type": "text", "text": month_body, "cache_control": CACHE_CONTROL})
+        content.append({"type": "text", "text": user_body})
+        prompt_tokens = _estimate_tokens(SYSTEM_INSTRUCTIONS, month_body, user_body)
+
+        cache_key = _prompt_hash(self.model, SYSTEM_INSTRUCTIONS, month_body, user_body)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            _response_cache.move_to_end(cache_key)
+            log.info("generate", f"CACHE HIT — Returning cached summary ({len(cached)} chars)")
+            return cached
 
         last_error = None
-        for attempt in range(1, 3):  # 2 attempts max
+        for attempt in range(1, MAX_ATTEMPTS + 1):
             try:
-                message = self.client.messages.create(
+                await _bucket.consume(prompt_tokens)
+                chunks = []
+                async with self.aclient.messages.stream(
                     model=self.model,
                     max_tokens=1024,
+                    system=system,
                     messages=[
-                        {"role": "user", "content": prompt}
+                        {"role": "user", "content": content}
                     ],
-                )
+                ) as stream:
+                    async for text in stream.text_stream:
+                        chunks.append(text)
+                    message = await stream.get_final_message()
 
-                summary = message.content[0].text
+                summary = "".join(chunks)
+                _cache_response(cache_key, summary)
                 log.info(
                     "generate",
                     f"SUCCESS — Generated {len(summary)} chars "
-                    f"(tokens: {message.usage.input_tokens} in, {message.usage.output_tokens} out)"
+                    f"(tokens: {message.usage.input_tokens} in, {message.usage.output_tokens} out, "
+                    f"{getattr(message.usage, 'cache_read_input_tokens', 0) or 0} cached)"
                 )
                 return summary
 
-            except Exception as e:
+            except self._rate_limit_error as e:
+                last_error = e
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = _backoff_delay(attempt)
+                log.warning("generate", f"Rate limited (429). Attempt {attempt}/{MAX_ATTEMPTS}, retrying in {delay:.1f}s")
+                if attempt < MAX_ATTEMPTS:
+                    await asyncio.sleep(delay)
+
+            except self._transient_errors as e:
+                status = getattr(e, "status_code", None)
+                if status is not None and status < 500:
+                    log.error("generate", f"FAILED — {type(e).__name__}: {e} (not retryable)")
+                    raise
                 last_error = e
-                log.error("generate", f"Attempt {attempt}/2 failed: {type(e).__name__}: {e}")
-                if attempt < 2:
-                    import time
-                    time.sleep(5)  # Brief pause before retry
+                log.error("generate", f"Attempt {attempt}/{MAX_ATTEMPTS} failed: {type(e).__name__}: {e}")
+                if attempt < MAX_ATTEMPTS:
+                    await asyncio.sleep(_backoff_delay(attempt))
+
+        # All attempts failed
+        raise RuntimeError(f"Claude API failed after {MAX_ATTEMPTS} attempts: {last_error}")
+
+    async def generate_many(self, jobs: list[dict]) -> list[str]:
+        """
+        Generate several summaries concurrently (e.g. backfilling past weeks).
+
+        Args:
+            jobs: List of kwargs dicts for generate_weekly_summary().
+
+        Returns:
+            Summary strings in the same order as `jobs`.
+        """
+        log.info("generate_many", f"START — {len(jobs)} summaries (concurrency {MAX_CONCURRENT_REQUESTS})")
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def _bounded(job: dict) -> str:
+            async with sem:
+                return await self.generate_weekly_summary(**job)
 
-        # Both attempts failed
-        raise RuntimeError(f"Claude API failed after 2 attempts: {last_error}")
+        summaries = await asyncio.gather(*[_bounded(job) for job in jobs])
+        log.info("generate_many", f"SUCCESS — Generated {len(summaries)} summaries")
+        return list(summaries)
@@ -4,8 +4,14 @@ Endpoints: /daily_sleep, /daily_readiness, /daily_activity, /sleep, /heartrate
 All dates in Europe/Sofia timezone.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
+from urllib3.util.retry import Retry
 
 from backend.config import OURA_API_TOKEN, OURA_BASE_URL, SYNC_LOOKBACK_DAYS
 from backend.utils.logger import get_logger
@@ -16,16 +22,102 @@ log = get_logger("OURA")
 # Timeout for API requests (seconds)
 REQUEST_TIMEOUT = 30
 
+# Date-range endpoints consolidated by fetch_all_data()
+ENDPOINTS = ("daily_sleep", "daily_readiness", "daily_activity", "sleep")
+
+# Oura field → Daily Log column, per summary endpoint.
+# Source keys are key paths so nested values (contributors.hrv_balance) need no parsing.
+FIELD_MAP = (
+    ("daily_sleep", (
+        (("score",), "Sleep_Score"),
+    )),
+    ("daily_readiness", (
+        (("score",), "Readiness_Score"),
+        (("temperature_deviation",), "Temperature_Deviation"),
+        (("contributors", "hrv_balance"), "HRV_Balance"),
+        (("resting_heart_rate",), "Resting_Heart_Rate"),
+    )),
+    ("daily_activity", (
+        (("steps",), "Steps"),
+        (("score",), "Activity_Score"),
+    )),
+)
+
+# Connection pool sizing — one host, a handful of endpoints per sync
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+# Transport-level retries for transient errors and rate limits (honors Retry-After)
+RETRY_POLICY = Retry(
+    total=5,
+    backoff_factor=1.0,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+    respect_retry_after_header=True,
+)
+
+
+# Days before the newest cached day that every incremental fetch re-requests —
+# Oura finalizes sleep/activity late (ring synced late, day closed after midnight)
+REFETCH_DAYS = 2
+
+# Incremental fetch state per endpoint — lives at module level because a new
+# OuraClient is built for every sync run.
+# endpoint → {"from": first day covered, "max_day": newest day seen, "days": {day: [items]}}
+_fetch_state: dict[str, dict] = {}
+
+
+def _lookup(item: dict, path: tuple[str, ...]):
+    """Read a value by key path (e.g. ("contributors", "hrv_balance")) from a dict."""
+    value = item
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
 
 class OuraClient:
     """Oura Ring API v2 client."""
 
+    # HTTP session shared by all instances (created on first use) — a new client is
+    # built per sync run, and this keeps its pooled TCP/TLS connections alive between runs
+    _session: Optional[requests.Session] = None
+
     def __init__(self):
         self.base_url = OURA_BASE_URL.rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {OURA_API_TOKEN}",
             "Content-Type": "application/json",
         }
+        if OuraClient._session is None:
+            OuraClient._session = self._new_session(self.headers)
+        self.session = OuraClient._session
+
+    @staticmethod
+    def _new_session(headers: dict) -> requests.Session:
+        """Persistent session — reuses the TCP/TLS connection across endpoint calls."""
+        session = requests.Session()
+        session.headers.update(headers)
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                max_retries=RETRY_POLICY,
+            ),
+        )
+        return session
+
+    def close(self):
+        """Drop pooled connections (the shared session stays usable and reconnects on next use)."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def _get(self, endpoint: str, params: dict = None) -> Optional[dict]:
         """
@@ -35,9 +127,9 @@ class OuraClient:
         url = f"{self.base_url}/{endpoint}"
         log.info("api_call", f"GET {endpoint} params={params}")
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=REQUEST_TIMEOUT)
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             items = data.get("data", [])
             log.info("api_call", f"SUCCESS — {endpoint} returned {len(items)} items")
             return data
@@ -45,8 +137,9 @@ class OuraClient:
             log.error("api_call", f"HTTP Error {response.status_code} for {endpoint}: {e}")
             if response.status_code == 401:
                 log.error("api_call", "Token may be expired — check OURA_API_TOKEN")
-            elif response.status_code == 429:
-                log.warning("api_call", "Rate limited by Oura API — slow down requests")
+            return None
+        except requests.exceptions.RetryError as e:
+            log.error("api_call", f"Retries exhausted for {endpoint} (rate limit or server error): {e}")
             return None
         except requests.exceptions.ConnectionError as e:
             log.error("api_call", f"Connection error for {endpoint}: {e}")
@@ -60,30 +153,76 @@ class OuraClient:
 
     # ─── API Endpoints ───────────────────────────────────────────────
 
+    def _fetch_range(self, endpoint: str, start_date: str, end_date: str) -> list[dict]:
+        """
+        Fetch the `data` list of a date-range endpoint.
+
+        For the per-day ENDPOINTS, days already fetched by an earlier sync are served
+        from memory and only the trailing REFETCH_DAYS before the newest known day
+        onward are re-requested. If the request fails, cached days in range are returned.
+        """
+        if endpoint not in ENDPOINTS:
+            data = self._get(endpoint, {"start_date": start_date, "end_date": end_date})
+            return data.get("data", []) if data else []
+
+        state = _fetch_state.get(endpoint)
+        incremental = (
+            state is not None
+            and state["from"] <= start_date
+            and start_date < state["max_day"] <= end_date
+        )
+        if incremental:
+            trailing = date.fromisoformat(state["max_day"]) - timedelta(days=REFETCH_DAYS)
+            fetch_start = max(start_date, trailing.isoformat())
+        else:
+            fetch_start = start_date
+
+        data = self._get(endpoint, {"start_date": fetch_start, "end_date": end_date})
+        if data is None:
+            if state is None:
+                return []
+            # Request failed — fall back to whatever earlier syncs already fetched
+            days = {d: v for d, v in state["days"].items() if start_date <= d <= end_date}
+            log.warning("fetch_range", f"{endpoint}: request failed, serving {len(days)} cached days")
+            return [item for day in sorted(days) for item in days[day]]
+        items = data.get("data", [])
+
+        fresh: dict[str, list[dict]] = {}
+        for item in items:
+            day = item.get("day")
+            if day:
+                fresh.setdefault(day, []).append(item)
+
+        if incremental:
+            days = {d: v for d, v in state["days"].items() if start_date <= d < fetch_start}
+            days.update(fresh)
+            log.info("fetch_range", f"{endpoint}: {len(fresh)} new/updated days, {len(days) - len(fresh)} from cache")
+        else:
+            days = fresh
+
+        if days:
+            _fetch_state[endpoint] = {"from": start_date, "max_day": max(days), "days": days}
+        return [item for day in sorted(days) for item in days[day]]
+
     def fetch_daily_sleep(self, start_date: str, end_date: str) -> list[dict]:
         """Fetch daily sleep scores."""
-        data = self._get("daily_sleep", {"start_date": start_date, "end_date": end_date})
-        return data.get("data", []) if data else []
+        return self._fetch_range("daily_sleep", start_date, end_date)
 
     def fetch_daily_readiness(self, start_date: str, end_date: str) -> list[dict]:
         """Fetch daily readiness scores."""
-        data = self._get("daily_readiness", {"start_date": start_date, "end_date": end_date})
-        return data.get("data", []) if data else []
+        return self._fetch_range("daily_readiness", start_date, end_date)
 
     def fetch_daily_activity(self, start_date: str, end_date: str) -> list[dict]:
         """Fetch daily activity data."""
-        data = self._get("daily_activity", {"start_date": start_date, "end_date": end_date})
-        return data.get("data", []) if data else []
+        return self._fetch_range("daily_activity", start_date, end_date)
 
     def fetch_sleep_details(self, start_date: str, end_date: str) -> list[dict]:
         """Fetch detailed sleep data (stages, efficiency)."""
-        data = self._get("sleep", {"start_date": start_date, "end_date": end_date})
-        return data.get("data", []) if data else []
+        return self._fetch_range("sleep", start_date, end_date)
 
     def fetch_heart_rate(self, start_date: str, end_date: str) -> list[dict]:
         """Fetch heart rate data."""
-        data = self._get("heartrate", {"start_date": start_date, "end_date": end_date})
-        return data.get("data", []) if data else []
+        return self._fetch_range("heartrate", start_date, end_date)
 
     # ─── Data Extraction ─────────────────────────────────────────────
 
@@ -100,98 +239,74 @@ class OuraClient:
 
         log.info("fetch_all", f"START — Fetching Oura data for {start_date} to {end_date}")
 
-        # Initialize empty data for all dates in range
-        all_dates = date_range(start_date, end_date)
-        daily_data: dict[str, dict] = {d: {} for d in all_dates}
-
-        # Fetch all endpoints
-        sleep_scores = self.fetch_daily_sleep(start_date, end_date)
-        readiness = self.fetch_daily_readiness(start_date, end_date)
-        activity = self.fetch_daily_activity(start_date, end_date)
-        sleep_details = self.fetch_sleep_details(start_date, end_date)
-
-        # Process daily sleep scores
-        for item in sleep_scores:
-            day = item.get("day")
-            if day in daily_data:
-                daily_data[day]["Sleep_Score"] = item.get("score")
-
-        # Process readiness
-        for item in readiness:
-            day = item.get("day")
-            if day in daily_data:
-                daily_data[day]["Readiness_Score"] = item.get("score")
-                daily_data[day]["Temperature_Deviation"] = item.get("temperature_deviation")
-
-                # Extract HRV balance from contributors
-                contributors = item.get("contributors", {})
-                daily_data[day]["HRV_Balance"] = contributors.get("hrv_balance")
-
-                # Resting heart rate from readiness
-                daily_data[day]["Resting_Heart_Rate"] = item.get("resting_heart_rate")
-
-        # Process activity
-        for item in activity:
-            day = item.get("day")
-            if day in daily_data:
-                daily_data[day]["Steps"] = item.get("steps")
-                daily_data[day]["Activity_Score"] = item.get("score")
+        # Initialize empty data for all dates in range — the dict doubles as the
+        # valid-day index, so out-of-range days are dropped by a single .get()
+        daily_data: dict[str, dict] = {d: {} for d in date_range(start_date, end_date)}
+        days_requested = len(daily_data)
+
+        # Fetch all endpoints concurrently — they are independent, so wall time
+        # is the slowest call rather than the sum of all four
+        with ThreadPoolExecutor(max_workers=len(ENDPOINTS)) as ex:
+            futures = {
+                endpoint: ex.submit(self._fetch_range, endpoint, start_date, end_date)
+                for endpoint in ENDPOINTS
+            }
+        results = {endpoint: f.result() for endpoint, f in futures.items()}
+        sleep_details = results["sleep"]
+
+        # Merge the per-day summary endpoints (daily_sleep, readiness, activity)
+        for endpoint, fields in FIELD_MAP:
+            for item in results[endpoint]:
+                rec = daily_data.get(item.get("day"))
+                if rec is None:
+                    continue
+                for src, dst in fields:
+                    value = _lookup(item, src)
+                    if value is not None:
+                        rec[dst] = value
 
         # Process detailed sleep data
         # Multiple sleep sessions can exist per day — use the longest one as primary sleep.
         # All OTHER sessions are summed as nap minutes.
-        # First pass: group all sessions by day
-        sessions_by_day: dict[str, list[dict]] = {}
+        # Single pass: track running primary session and nap total per day
+        acc: dict[str, list] = {}  # day → [primary, primary_duration, nap_seconds, daily record]
         for item in sleep_details:
             day = item.get("day")
-            if not day:
+            rec = daily_data.get(day)
+            if rec is None:
                 continue
-            sessions_by_day.setdefault(day, []).append(item)
-
-        # Second pass: pick longest session as primary, sum rest as naps
-        sleep_by_day: dict[str, dict] = {}
-        for day, sessions in sessions_by_day.items():
-            # Sort sessions by duration descending to pick longest first
-            sessions_sorted = sorted(
-                sessions,
-                key=lambda s: (s.get("total_sleep_duration", 0) or 0),
-                reverse=True
-            )
-            primary = sessions_sorted[0]
-            primary_duration = primary.get("total_sleep_duration", 0) or 0
-
-            sleep_by_day[day] = {
-                "_duration": primary_duration,
-                "Total_Sleep_Hours": round(primary_duration / 3600, 1) if primary_duration else None,
-                "Deep_Sleep_Minutes": self._seconds_to_minutes(primary.get("deep_sleep_duration")),
-                "REM_Sleep_Minutes": self._seconds_to_minutes(primary.get("rem_sleep_duration")),
-                "Sleep_Efficiency": primary.get("efficiency"),
-            }
-            if primary.get("lowest_heart_rate"):
-                sleep_by_day[day]["_lowest_hr"] = primary.get("lowest_heart_rate")
-
-            # Sum all non-primary sessions as nap minutes
-            nap_seconds = sum(
-                (s.get("total_sleep_duration", 0) or 0)
-                for s in sessions_sorted[1:]
+            duration = item.get("total_sleep_duration", 0) or 0
+            entry = acc.get(day)
+            if entry is None:
+                acc[day] = [item, duration, 0, rec]
+            elif duration > entry[1]:
+                entry[2] += entry[1]  # previous primary becomes a nap
+                entry[0], entry[1] = item, duration
+            else:
+                entry[2] += duration
+
+        # Materialize into daily_data
+        for primary, primary_duration, nap_seconds, rec in acc.values():
+            sleep_fields = (
+                ("Total_Sleep_Hours", round(primary_duration / 3600, 1) if primary_duration else None),
+                ("Deep_Sleep_Minutes", self._seconds_to_minutes(primary.get("deep_sleep_duration"))),
+                ("REM_Sleep_Minutes", self._seconds_to_minutes(primary.get("rem_sleep_duration"))),
+                ("Sleep_Efficiency", primary.get("efficiency")),
+                ("Nap_Minutes", round(nap_seconds / 60) if nap_seconds > 0 else 0),
             )
-            sleep_by_day[day]["Nap_Minutes"] = round(nap_seconds / 60) if nap_seconds > 0 else 0
-
-        for day, sleep_data in sleep_by_day.items():
-            if day in daily_data:
-                for field in ("Total_Sleep_Hours", "Deep_Sleep_Minutes",
-                              "REM_Sleep_Minutes", "Sleep_Efficiency", "Nap_Minutes"):
-                    if sleep_data.get(field) is not None:
-                        daily_data[day][field] = sleep_data[field]
+            for field, value in sleep_fields:
+                if value is not None:
+                    rec[field] = value
 
-                # Use lowest HR from sleep if readiness didn't provide resting HR
-                if not daily_data[day].get("Resting_Heart_Rate") and sleep_data.get("_lowest_hr"):
-                    daily_data[day]["Resting_Heart_Rate"] = sleep_data["_lowest_hr"]
+            # Use lowest HR from sleep if readiness didn't provide resting HR
+            lowest_hr = primary.get("lowest_heart_rate")
+            if not rec.get("Resting_Heart_Rate") and lowest_hr:
+                rec["Resting_Heart_Rate"] = lowest_hr
 
         # Remove days with no data at all
         result = {day: data for day, data in daily_data.items() if data}
 
-        log.info("fetch_all", f"SUCCESS — Got data for {len(result)} days out of {len(all_dates)} requested")
+        log.info("fetch_all", f"SUCCESS — Got data for {len(result)} days out of {days_requested} requested")
         return result
 
     @staticmethod
@@ -4,13 +4,27 @@ Uses gspread with service account authentication.
 Implements upsert logic: merge, don't overwrite blindly.
 """
 
-import json
+import bisect
+import functools
+import gzip
+import hashlib
+import os
+import random
+import re
+import tempfile
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 import gspread
+import orjson
+from google.auth.exceptions import TransportError
 from google.oauth2.service_account import Credentials
+from gspread.urls import SPREADSHEETS_API_V4_BASE_URL
+from gspread.utils import rowcol_to_a1
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout as RequestsTimeout
 
 from backend.config import (
     GOOGLE_SHEET_ID,
@@ -25,6 +39,14 @@ from backend.config import (
     GOALS_HEADERS,
     AI_SUMMARIES_HEADERS,
     DAILY_LOG_COLUMNS,
+    COL_CALORIES,
+    COL_NUTRITION_LOGGED,
+    COL_DATA_COMPLETE,
+    COL_SLEEP_SCORE,
+    OURA_COLUMNS,
+    NUTRITION_COLUMNS,
+    CACHE_DIR,
+    PROJECT_ROOT,
 )
 from backend.utils.logger import get_logger
 
@@ -36,43 +58,139 @@ SCOPES = [
 ]
 
 # Retry config for Google Sheets API
-MAX_RETRIES = 3
-RETRY_BASE_DELAY = 2  # seconds
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1  # seconds — doubles each attempt
+RETRY_MAX_DELAY = 32  # seconds
+RETRY_JITTER = 1.0  # seconds of random spread so concurrent workers don't retry in lockstep
+# HTTP statuses worth retrying; other API errors fail at once
+RETRYABLE_STATUS = frozenset((408, 429, 500, 502, 503, 504))
+# Network-level failures worth retrying; anything else (bad tab name, auth refresh, bugs) fails at once
+_TRANSPORT_ERRORS = (RequestsConnectionError, RequestsTimeout, TransportError)
+
+# Read cache — spreadsheet revision is re-checked at most this often (seconds)
+REVISION_TTL = 30
+# Cached read files older than this are pruned (seconds)
+CACHE_MAX_AGE = 7 * 24 * 3600
+# In-process read results are reused for this long without any API call (seconds)
+READ_CACHE_TTL = 10
+# Row indexes are rebuilt after this long to pick up manual edits to the sheet (seconds)
+INDEX_TTL = 300
+
+# Cell values that count as "missing" for derived fields
+_EMPTY = frozenset((None, "", 0, "0"))
+# Incoming values that never overwrite an existing cell (merge rule)
+_NO_VALUE = frozenset((None, ""))
+
+# Column name → row index each source may write (Date excluded — it is the key)
+_ALL_COLUMN_INDEX = {k: i for k, i in DAILY_LOG_COLUMNS.items() if k != "Date"}
+_SOURCE_COLUMN_INDEX = {
+    "oura": {k: DAILY_LOG_COLUMNS[k] for k in OURA_COLUMNS},
+    "nutrition": {k: DAILY_LOG_COLUMNS[k] for k in NUTRITION_COLUMNS},
+}
+
+# Sheets API quotas are 60 read and 60 write requests/minute/user, counted
+# separately — each gets its own budget, a little under the limit
+RATE_LIMIT_REQUESTS = 55
+RATE_LIMIT_WINDOW = 60.0  # seconds
+# Value ranges per values.batchUpdate request (Google recommends <= 100 per batch)
+MAX_RANGES_PER_BATCH = 100
+
+
+class RateLimiter:
+    """
+    Sliding-window limiter over recent request timestamps.
+    Only blocks when the per-window budget is actually close to exhausted.
+    """
+
+    def __init__(self, capacity: int = RATE_LIMIT_REQUESTS, per: float = RATE_LIMIT_WINDOW):
+        self.capacity = capacity
+        self.per = per
+        self._stamps: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int = 1):
+        """Record `n` requests, sleeping first if they would exceed the budget."""
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._stamps and now - self._stamps[0] >= self.per:
+                    self._stamps.popleft()
+                if len(self._stamps) + n <= self.capacity:
+                    self._stamps.extend([now] * n)
+                    return
+                wait = self.per - (now - self._stamps[0])
+                log.info("throttle", f"Request budget exhausted — waiting {wait:.1f}s")
+                time.sleep(wait)
+
+
+# Shared by every SheetsClient — the quota is per service account, not per client
+_limiters = {"read": RateLimiter(), "write": RateLimiter()}
 
 
 class SheetsClient:
     """Google Sheets client with upsert logic and retry handling."""
 
+    # Column-A key → row number index per tab. Shared by every instance in the
+    # process (bot + scheduler each hold a client) so a row insert by one client
+    # invalidates the index for all of them.
+    _date_row_cache: dict[str, dict[str, int]] = {}
+    # Sorted column-A keys per tab, kept alongside _date_row_cache for bisect lookups
+    _sorted_keys_cache: dict[str, list[str]] = {}
+    # When each tab's row index was built (monotonic seconds)
+    _index_built_at: dict[str, float] = {}
+    # Short-lived in-process read results: cache key → (monotonic time, orjson payload).
+    # Stored serialized so every hit hands out fresh objects callers may mutate.
+    # Cleared by every write, so the read burst that follows a write refetches once.
+    _read_cache: dict[bytes, tuple[float, bytes]] = {}
+    # Last known spreadsheet revision (Drive modifiedTime) and when it was checked
+    _revision_state: dict = {"value": None, "checked": 0.0}
+    # Wall-clock time of this process's last write — on-disk entries older than it are
+    # not trusted, since Drive's modifiedTime can lag behind our own writes
+    _last_write = 0.0
+    # Authorized gspread client shared by all instances (created on first connect)
+    _gc: Optional[gspread.Client] = None
+    # Serializes Daily Log read-modify-writes across threads (bot handlers and
+    # scheduler jobs share this process), so no upsert writes over another's changes
+    _daily_log_lock = threading.RLock()
+
     def __init__(self):
-        self.gc: Optional[gspread.Client] = None
+        self.gc: Optional[gspread.Client] = SheetsClient._gc
         self.spreadsheet: Optional[gspread.Spreadsheet] = None
         self._connected = False
+        self._ws_cache: dict[str, gspread.Worksheet] = {}
 
     def connect(self):
         """Authenticate and open the spreadsheet."""
         log.info("connect", "Connecting to Google Sheets...")
         try:
-            creds = self._get_credentials()
-            self.gc = gspread.authorize(creds)
+            if SheetsClient._gc is None:
+                SheetsClient._gc = gspread.authorize(self._get_credentials())
+            self.gc = SheetsClient._gc
             self.spreadsheet = self.gc.open_by_key(GOOGLE_SHEET_ID)
+            self._load_worksheets()
+            self._warm_daily_index()
             self._connected = True
             log.info("connect", f"SUCCESS — Connected to sheet: {self.spreadsheet.title}")
         except Exception as e:
             log.error("connect", f"FAILED — {type(e).__name__}: {e}")
             raise
 
-    def _get_credentials(self) -> Credentials:
-        """Get Google credentials from JSON file or env var."""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _get_credentials() -> Credentials:
+        """
+        Get Google credentials from JSON file or env var.
+        Built once per process — parsing the service-account key is the expensive part.
+        """
         if GOOGLE_SERVICE_ACCOUNT_JSON:
             # Railway deployment: JSON content in env var
-            info = json.loads(GOOGLE_SERVICE_ACCOUNT_JSON)
+            info = orjson.loads(GOOGLE_SERVICE_ACCOUNT_JSON)
             return Credentials.from_service_account_info(info, scopes=SCOPES)
         else:
             # Local development: key file
             key_path = Path(GOOGLE_SERVICE_ACCOUNT_KEY_FILE)
             if not key_path.is_absolute():
                 # Resolve relative to project root
-                from backend.config import PROJECT_ROOT
                 key_path = PROJECT_ROOT / key_path
             return Credentials.from_service_account_file(str(key_path), scopes=SCOPES)
 
@@ -81,35 +199,246 @@ class SheetsClient:
         if not self._connected:
             self.connect()
 
-    def _retry(self, func, *args, **kwargs):
-        """Execute a function with retry logic and exponential backoff."""
+    # ─── Worksheet & Row Index Cache ─────────────────────────────────
+
+    def _load_worksheets(self):
+        """Fetch all worksheet handles in one metadata call and cache them by title."""
+        self._ws_cache = {ws.title: ws for ws in self._retry(self.spreadsheet.worksheets)}
+
+    def _warm_daily_index(self):
+        """
+        Build the Daily Log row index once per process at connect time.
+        Headers are static (DAILY_LOG_HEADERS), so every later read is a single values call.
+        """
+        ws = self._ws_cache.get(DAILY_LOG_TAB)
+        if ws is not None and ws.title not in self._date_row_cache:
+            self._row_index(ws)
+
+    def _worksheet(self, tab_name: str) -> gspread.Worksheet:
+        """Get a cached worksheet handle (falls back to a lookup for tabs created later)."""
+        ws = self._ws_cache.get(tab_name)
+        if ws is None:
+            ws = self._retry(self.spreadsheet.worksheet, tab_name)
+            self._ws_cache[tab_name] = ws
+        return ws
+
+    def _row_index(self, ws: gspread.Worksheet) -> dict[str, int]:
+        """Column-A key → 1-indexed row number for a tab (one col_values call, then cached)."""
+        index = self._date_row_cache.get(ws.title)
+        if index is not None and time.monotonic() - self._index_built_at.get(ws.title, 0.0) >= INDEX_TTL:
+            index = None
+        if index is None:
+            col_a = self._retry(ws.col_values, 1)
+            index = {key: i for i, key in enumerate(col_a[1:], start=2) if key}  # Skip header
+            self._set_index(ws.title, index)
+        return index
+
+    def _set_index(self, tab_name: str, index: dict[str, int]):
+        """Store a freshly built row index and its sorted key list."""
+        self._date_row_cache[tab_name] = index
+        self._sorted_keys_cache[tab_name] = sorted(index)
+        self._index_built_at[tab_name] = time.monotonic()
+
+    def _index_inserted_row(self, tab_name: str, key: str, row_num: int):
+        """Update the cached index in place after inserting `key` at `row_num` (rows below shift down)."""
+        index = self._date_row_cache.get(tab_name)
+        keys = self._sorted_keys_cache.get(tab_name)
+        if index is None or keys is None:
+            return
+        for k, r in index.items():
+            if r >= row_num:
+                index[k] = r + 1
+        index[key] = row_num
+        bisect.insort(keys, key)
+
+    def _read_row(self, ws: gspread.Worksheet, key: str) -> tuple[Optional[int], Optional[list]]:
+        """
+        Look up a row by its column-A key via the cached index and read its values
+        with one bounded range read (no find, no full-row scan).
+        Rebuilds the index once if the row found no longer holds `key` (stale index).
+        Returns (row_num, values) or (None, None).
+        """
+        for _ in range(2):
+            row_num = self._row_index(ws).get(key)
+            if not row_num:
+                return None, None
+            # Unformatted numbers so they compare equal to incoming values (no-op detection)
+            result = self._retry(
+                ws.get,
+                _row_range(row_num, ws.col_count),
+                value_render_option="UNFORMATTED_VALUE",
+                date_time_render_option="FORMATTED_STRING",
+            )
+            values = list(result[0]) if result else []
+            if values and values[0] == key:
+                return row_num, values
+            self._invalidate_index(ws.title)
+        return None, None
+
+    def _fetch_tabs(self, tab_names: list[str]) -> dict[str, list[dict]]:
+        """
+        Read several tabs in a single values.batchGet request and build record
+        dicts locally (first row = headers). Numbers come back unformatted;
+        dates come back as their displayed strings.
+        """
+        self._ensure_connected()
+        return self._cached_read("fetch_tabs", tab_names, lambda: self._fetch_tabs_uncached(tab_names))
+
+    def _fetch_tabs_uncached(self, tab_names: list[str]) -> dict[str, list[dict]]:
+        """_fetch_tabs without the on-disk cache."""
+        response = self._retry(
+            self.spreadsheet.values_batch_get,
+            [f"'{tab}'" for tab in tab_names],
+            params={
+                "valueRenderOption": "UNFORMATTED_VALUE",
+                "dateTimeRenderOption": "FORMATTED_STRING",
+            },
+        )
+        result = {}
+        for tab, value_range in zip(tab_names, response.get("valueRanges", [])):
+            values = value_range.get("values", [])
+            result[tab] = _to_records(values)
+        return result
+
+    # ─── Read Cache ──────────────────────────────────────────────────
+
+    def _revision(self) -> Optional[str]:
+        """Spreadsheet modifiedTime (one cheap Drive call, reused for REVISION_TTL seconds)."""
+        state = self._revision_state
+        now = time.monotonic()
+        if state["value"] is None or now - state["checked"] >= REVISION_TTL:
+            try:
+                state["value"] = self._retry(self.spreadsheet.get_lastUpdateTime)
+                state["checked"] = now
+            except Exception as e:
+                log.warning("cache", f"Revision check failed, bypassing cache: {type(e).__name__}: {e}")
+                return None
+        return state["value"]
+
+    def _cached_read(self, name: str, args, loader):
+        """
+        Memoize a read: first in process for READ_CACHE_TTL seconds (no API call at all),
+        then on disk keyed by (name, args, spreadsheet revision).
+        Falls through to `loader()` when the revision is unknown or the cache is unusable.
+        Every call returns its own copy of the result.
+        """
+        memory_key = orjson.dumps([name, args])
+        hit = self._read_cache.get(memory_key)
+        if hit is not None and time.monotonic() - hit[0] < READ_CACHE_TTL:
+            return orjson.loads(hit[1])
+        result = self._cached_read_disk(name, args, loader)
+        self._read_cache[memory_key] = (time.monotonic(), orjson.dumps(result))
+        return result
+
+    def _cached_read_disk(self, name: str, args, loader):
+        """On-disk layer of _cached_read (gzipped JSON, written then renamed into place)."""
+        revision = self._revision()
+        if revision is None:
+            return loader()
+
+        key = orjson.dumps([name, args, revision, GOOGLE_SHEET_ID])
+        path = CACHE_DIR / f"{hashlib.sha1(key).hexdigest()}.json.gz"
+        try:
+            if path.stat().st_mtime >= SheetsClient._last_write:
+                with gzip.open(path, "rb") as f:
+                    return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except (OSError, EOFError, orjson.JSONDecodeError) as e:
+            log.warning("cache", f"Unreadable cache entry {path.name}: {type(e).__name__}: {e}")
+
+        result = loader()
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _prune_cache()
+            fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(orjson.dumps(result))
+            os.replace(tmp, path)
+        except OSError as e:
+            log.warning("cache", f"Could not write cache entry: {e}")
+        return result
+
+    @classmethod
+    def _mark_written(cls):
+        """Invalidate cached reads after a write (older disk entries distrusted + forced revision re-check)."""
+        cls._last_write = time.time()
+        cls._revision_state["checked"] = 0.0
+        cls._read_cache.clear()
+
+    def _invalidate_index(self, tab_name: str):
+        """Drop the cached row index for a tab after a write that shifts or adds rows."""
+        self._date_row_cache.pop(tab_name, None)
+        self._sorted_keys_cache.pop(tab_name, None)
+        self._index_built_at.pop(tab_name, None)
+
+    def _retry(self, func, *args, quota: str = "read", **kwargs):
+        """
+        Execute a function with truncated exponential backoff + jitter (honors Retry-After).
+        Only transient failures are retried — network errors (_TRANSPORT_ERRORS) and
+        API errors whose status is in RETRYABLE_STATUS; anything else is raised at once.
+        quota: "read" or "write" — which per-minute request budget the call draws from.
+        """
+        limiter = _limiters[quota]
         for attempt in range(1, MAX_RETRIES + 1):
             try:
+                limiter.acquire()
                 return func(*args, **kwargs)
-            except gspread.exceptions.APIError as e:
-                if e.response.status_code == 429:
-                    delay = RETRY_BASE_DELAY ** attempt
-                    log.warning("retry", f"Rate limited (429). Retry {attempt}/{MAX_RETRIES} in {delay}s")
-                    time.sleep(delay)
-                elif attempt == MAX_RETRIES:
-                    log.error("retry", f"All {MAX_RETRIES} retries exhausted: {e}")
-                    raise
-                else:
-                    delay = RETRY_BASE_DELAY ** attempt
-                    log.warning("retry", f"API error (attempt {attempt}/{MAX_RETRIES}): {e}. Retrying in {delay}s")
-                    time.sleep(delay)
             except Exception as e:
+                status = _status_code(e)
+                if not isinstance(e, _TRANSPORT_ERRORS) and status not in RETRYABLE_STATUS:
+                    raise  # e.g. 400 bad range / 403 no access / missing tab — retrying cannot help
                 if attempt == MAX_RETRIES:
                     log.error("retry", f"All {MAX_RETRIES} retries exhausted: {type(e).__name__}: {e}")
                     raise
-                delay = RETRY_BASE_DELAY ** attempt
-                log.warning("retry", f"Error (attempt {attempt}/{MAX_RETRIES}): {e}. Retrying in {delay}s")
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                    delay += random.uniform(0, RETRY_JITTER)
+                reason = "Rate limited (429)" if status == 429 else f"{type(e).__name__}: {e}"
+                log.warning("retry", f"{reason}. Retry {attempt}/{MAX_RETRIES} in {delay:.1f}s")
                 time.sleep(delay)
 
+    def _batch(self, requests: list[dict]):
+        """Send several structural/cell requests as one atomic spreadsheets.batchUpdate."""
+        response = self._retry(self.spreadsheet.batch_update, {"requests": requests}, quota="write")
+        self._mark_written()
+        return response
+
+    def _update_rows_by_filter(self, ws: gspread.Worksheet, rows: list[tuple[int, list]]):
+        """
+        Overwrite several (possibly non-contiguous) rows in one
+        values.batchUpdateByDataFilter request. `rows` holds (1-indexed row, values) pairs.
+        """
+        data = [
+            {
+                "dataFilter": {"gridRange": {
+                    "sheetId": ws.id,
+                    "startRowIndex": row_num - 1,
+                    "endRowIndex": row_num,
+                    "startColumnIndex": 0,
+                    "endColumnIndex": len(values),
+                }},
+                "majorDimension": "ROWS",
+                "values": [values],
+            }
+            for row_num, values in rows
+        ]
+        url = f"{SPREADSHEETS_API_V4_BASE_URL}/{self.spreadsheet.id}/values:batchUpdateByDataFilter"
+        self._retry(
+            self.gc.http_client.request, "post", url,
+            json={"valueInputOption": "RAW", "data": data},
+            quota="write",
+        )
+        self._mark_written()
+
     # ─── Tab Setup ───────────────────────────────────────────────────
 
     def setup_tabs(self):
-        """Create all required tabs with headers if they don't exist."""
+        """
+        Create all required tabs with headers if they don't exist.
+        One metadata call + one header read + a single batchUpdate for every change.
+        """
         self._ensure_connected()
         log.info("setup_tabs", "Setting up Google Sheet tabs...")
 
@@ -120,57 +449,77 @@ class SheetsClient:
             (AI_SUMMARIES_TAB, AI_SUMMARIES_HEADERS),
         ]
 
-        existing_tabs = [ws.title for ws in self.spreadsheet.worksheets()]
-
+        self._load_worksheets()
+        existing_tabs = list(self._ws_cache)
+
+        # Header rows of all existing tabs in one values.batchGet
+        present = [tab for tab, _ in tabs_config if tab in self._ws_cache]
+        current_headers = {}
+        if present:
+            response = self._retry(
+                self.spreadsheet.values_batch_get, [f"'{tab}'!1:1" for tab in present]
+            )
+            for tab, value_range in zip(present, response.get("valueRanges", [])):
+                values = value_range.get("values", [])
+                current_headers[tab] = values[0] if values else []
+
+        requests = []
+        next_id = max((ws.id for ws in self._ws_cache.values()), default=0) + 1
         for tab_name, headers in tabs_config:
-            if tab_name in existing_tabs:
+            ws = self._ws_cache.get(tab_name)
+            if ws is not None:
                 log.info("setup_tabs", f"Tab '{tab_name}' already exists — checking headers")
-                ws = self.spreadsheet.worksheet(tab_name)
-                existing_headers = ws.row_values(1)
-                if existing_headers != headers:
-                    log.info("setup_tabs", f"Updating headers for '{tab_name}'")
-                    self._retry(ws.update, "A1", [headers])
+                if current_headers.get(tab_name) == list(headers):
+                    continue
+                log.info("setup_tabs", f"Updating headers for '{tab_name}'")
+                sheet_id = ws.id
+                if ws.col_count < len(headers):
+                    requests.append({"updateSheetProperties": {
+                        "properties": {"sheetId": sheet_id, "gridProperties": {"columnCount": len(headers)}},
+                        "fields": "gridProperties.columnCount",
+                    }})
             else:
                 log.info("setup_tabs", f"Creating tab '{tab_name}'")
-                ws = self._retry(self.spreadsheet.add_worksheet,
-                                 title=tab_name, rows=1000, cols=len(headers))
-                self._retry(ws.update, "A1", [headers])
+                sheet_id = next_id
+                next_id += 1
+                requests.append({"addSheet": {"properties": {
+                    "sheetId": sheet_id,
+                    "title": tab_name,
+                    "gridProperties": {"rowCount": 1000, "columnCount": len(headers)},
+                }}})
+            requests.append(_header_request(sheet_id, headers))
 
         # Remove default "Sheet1" if it exists and other tabs are present
         if "Sheet1" in existing_tabs and len(existing_tabs) > 1:
-            try:
-                sheet1 = self.spreadsheet.worksheet("Sheet1")
-                self.spreadsheet.del_worksheet(sheet1)
-                log.info("setup_tabs", "Removed default 'Sheet1' tab")
-            except Exception:
-                pass  # Not critical
-
-        log.info("setup_tabs", "SUCCESS — All tabs ready")
+            requests.append({"deleteSheet": {"sheetId": self._ws_cache["Sheet1"].id}})
+            log.info("setup_tabs", "Removing default 'Sheet1' tab")
+
+        # Nothing changed (the usual case) → keep worksheet handles and warm row indexes
+        if requests:
+            self._batch(requests)
+            self._load_worksheets()
+            self._date_row_cache.clear()
+            self._sorted_keys_cache.clear()
+            self._index_built_at.clear()
+        log.info("setup_tabs", f"SUCCESS — All tabs ready ({len(requests)} changes in 1 request)")
 
     # ─── Daily Log Operations ────────────────────────────────────────
 
     def get_daily_log_worksheet(self) -> gspread.Worksheet:
         """Get the Daily Log worksheet."""
         self._ensure_connected()
-        return self.spreadsheet.worksheet(DAILY_LOG_TAB)
+        return self._worksheet(DAILY_LOG_TAB)
 
     def get_all_daily_log_data(self) -> list[dict]:
         """Read all rows from Daily Log as list of dicts."""
-        self._ensure_connected()
-        ws = self.get_daily_log_worksheet()
-        records = self._retry(ws.get_all_records)
-        return records
+        return self._fetch_tabs([DAILY_LOG_TAB])[DAILY_LOG_TAB]
 
     def find_row_by_date(self, ws: gspread.Worksheet, date_str: str) -> Optional[int]:
         """
         Find the row number (1-indexed) for a given date in the Daily Log.
-        Returns None if date not found.
+        Returns None if date not found. Served from the cached row index.
         """
-        try:
-            cell = ws.find(date_str, in_column=1)
-            return cell.row if cell else None
-        except gspread.exceptions.CellNotFound:
-            return None
+        return self._row_index(ws).get(date_str)
 
     def upsert_daily_row(self, date_str: str, data: dict, source: str = "unknown"):
         """
@@ -190,134 +539,309 @@ class SheetsClient:
         log.info("upsert", f"START — Upserting {date_str} from {source}")
 
         # Validate source writes to correct columns
-        from backend.config import OURA_COLUMNS, NUTRITION_COLUMNS
-        allowed_columns = OURA_COLUMNS if source == "oura" else NUTRITION_COLUMNS
-        if source in ("oura", "nutrition"):
-            invalid = [k for k in data.keys() if k not in allowed_columns and k != "Date"]
-            if invalid:
-                log.error("upsert", f"Source '{source}' tried to write to invalid columns: {invalid}")
-                return
-
-        # Find existing row
-        row_num = self._retry(self.find_row_by_date, ws, date_str)
-
-        if row_num:
-            # Row exists — read current values and merge
-            existing_row = self._retry(ws.row_values, row_num)
-            # Pad to full width if needed
-            while len(existing_row) < len(DAILY_LOG_HEADERS):
-                existing_row.append("")
-
-            # Build updated row with merge logic
-            updated_row = list(existing_row)
-            for col_name, value in data.items():
-                if col_name == "Date":
-                    continue
-                col_idx = DAILY_LOG_COLUMNS.get(col_name)
-                if col_idx is not None and value is not None and value != "":
-                    updated_row[col_idx] = value
-
-            # Compute derived fields
-            updated_row = self._compute_derived_fields(updated_row)
-
-            # Write back
-            cell_range = f"A{row_num}"
-            self._retry(ws.update, cell_range, [updated_row])
-            log.info("upsert", f"SUCCESS — Updated existing row {row_num} for {date_str}")
-        else:
-            # New row — build from scratch
-            new_row = [""] * len(DAILY_LOG_HEADERS)
-            new_row[0] = date_str  # Date column
-
-            for col_name, value in data.items():
-                if col_name == "Date":
-                    continue
-                col_idx = DAILY_LOG_COLUMNS.get(col_name)
-                if col_idx is not None and value is not None and value != "":
-                    new_row[col_idx] = value
+        invalid = self._invalid_columns(data, source)
+        if invalid:
+            log.error("upsert", f"Source '{source}' tried to write to invalid columns: {invalid}")
+            return
+
+        # Read-modify-write under the Daily Log lock (see _daily_log_lock)
+        with self._daily_log_lock:
+            # Find existing row
+            row_num, existing_row = self._read_row(ws, date_str)
+
+            if row_num:
+                # Row exists — merge into current values
+                # Pad to full width if needed
+                while len(existing_row) < len(DAILY_LOG_HEADERS):
+                    existing_row.append("")
+
+                # Build updated row with merge logic
+                updated_row = self._merge_row(existing_row, data, source)
+
+                # Compute derived fields
+                updated_row = self._compute_derived_fields(updated_row)
+
+                # Skip the write entirely if nothing changed (idempotent re-syncs)
+                diff = [i for i, (old, new) in enumerate(zip(existing_row, updated_row)) if old != new]
+                if not diff:
+                    log.info("upsert", f"SUCCESS — No changes for {date_str} (row {row_num}), write skipped")
+                    return
+
+                # Write back only the bounding column span of the changed cells
+                lo, hi = diff[0], diff[-1]
+                cell_range = f"{rowcol_to_a1(row_num, lo + 1)}:{rowcol_to_a1(row_num, hi + 1)}"
+                self._retry(ws.update, cell_range, [updated_row[lo:hi + 1]], quota="write")
+                self._mark_written()
+                log.info("upsert", f"SUCCESS — Updated existing row {row_num} for {date_str} ({len(diff)} cells)")
+            else:
+                # New row — build from scratch
+                new_row = [""] * len(DAILY_LOG_HEADERS)
+                new_row[0] = date_str  # Date column
+                new_row = self._merge_row(new_row, data, source)
 
-            # Compute derived fields
-            new_row = self._compute_derived_fields(new_row)
+                # Compute derived fields
+                new_row = self._compute_derived_fields(new_row)
 
-            # Find the right position to insert (keep sorted by date)
-            insert_row = self._find_insert_position(ws, date_str)
-            self._retry(ws.insert_row, new_row, index=insert_row)
-            log.info("upsert", f"SUCCESS — Created new row at position {insert_row} for {date_str}")
+                # Append or insert so the tab stays sorted by date
+                insert_row = self._insert_sorted(ws, date_str, new_row)
+                log.info("upsert", f"SUCCESS — Created new row at position {insert_row} for {date_str}")
 
-    def upsert_daily_rows_batch(self, rows_data: list[tuple[str, dict]], source: str = "unknown"):
+    def upsert_daily_rows_batch(self, rows_data: Iterable[tuple[str, dict]], source: str = "unknown"):
         """
-        Batch upsert multiple rows efficiently.
+        Batch upsert multiple rows with a fixed number of API calls.
+        Reads the whole Daily Log once, merges every row locally (same rules as
+        upsert_daily_row), then writes all changes in one batch update
+        (split every MAX_RANGES_PER_BATCH ranges for very large imports).
+
         Args:
-            rows_data: List of (date_str, data_dict) tuples
+            rows_data: (date_str, data_dict) tuples — any iterable, consumed once
             source: "oura" or "nutrition"
         """
-        self._ensure_connected()
-        log.info("upsert_batch", f"START — Batch upserting {len(rows_data)} rows from {source}")
+        return self._upsert_rows_batch(rows_data, source)[0]
 
-        success_count = 0
+    def upsert_daily_rows_batch_snapshot(self, rows_data: Iterable[tuple[str, dict]], source: str,
+                                         start_date: str, end_date: str) -> tuple[int, Optional[list[dict]]]:
+        """
+        upsert_daily_rows_batch, plus the Daily Log records between start_date and
+        end_date as they stand after the write (date-sorted) — the same rows
+        get_daily_data_for_range would return, without reading them back.
+        The snapshot is None if the write failed.
+        """
+        success_count, rows = self._upsert_rows_batch(rows_data, source)
+        if rows is None:
+            return success_count, None
+        records = _to_records([DAILY_LOG_HEADERS] + rows)
+        in_range = [r for r in records if start_date <= r.get("Date", "") <= end_date]
+        in_range.sort(key=lambda r: r["Date"])
+        return success_count, in_range
+
+    def _upsert_rows_batch(self, rows_data: Iterable[tuple[str, dict]],
+                           source: str) -> tuple[int, Optional[list[list]]]:
+        """Shared body of the batch upserts: (rows accepted, every Daily Log row after the write or None on failure)."""
+        self._ensure_connected()
+        ws = self.get_daily_log_worksheet()
+        log.info("upsert_batch", f"START — Batch upserting rows from {source}")
+        # The write is built from a full-sheet snapshot — no other upsert may land in between
+        with self._daily_log_lock:
+            return self._upsert_rows_batch_locked(ws, rows_data, source)
+
+    def _upsert_rows_batch_locked(self, ws: gspread.Worksheet, rows_data: Iterable[tuple[str, dict]],
+                                  source: str) -> tuple[int, Optional[list[list]]]:
+        """_upsert_rows_batch body; the caller holds _daily_log_lock."""
+        width = len(DAILY_LOG_HEADERS)
+        # Raw numbers (so they round-trip unchanged) but dates as displayed strings
+        values = self._retry(
+            ws.get_all_values,
+            value_render_option="UNFORMATTED_VALUE",
+            date_time_render_option="FORMATTED_STRING",
+        )
+        rows = [list(r) + [""] * (width - len(r)) for r in values[1:]]  # Skip header
+        date_index = {r[0]: i for i, r in enumerate(rows) if r[0]}
+        self._set_index(ws.title, {d: i + 2 for d, i in date_index.items()})
+
+        col_map = _SOURCE_COLUMN_INDEX.get(source, _ALL_COLUMN_INDEX)
+
+        # Pass 1: fold every incoming update into one {column index: value} map per date,
+        # applying the merge rule (null/empty never overwrites) up front.
+        # Only the cell map is kept, so rows_data can be a generator.
+        incoming: dict[str, dict[int, object]] = {}
+        success_count = received = 0
         for date_str, data in rows_data:
-            try:
-                self.upsert_daily_row(date_str, data, source)
-                success_count += 1
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
-            except Exception as e:
-                log.error("upsert_batch", f"Failed to upsert {date_str}: {e}")
-
-        log.info("upsert_batch", f"SUCCESS — Upserted {success_count}/{len(rows_data)} rows")
-        return success_count
+            received += 1
+            invalid = self._invalid_columns(data, source)
+            if invalid:
+                log.error("upsert_batch", f"Source '{source}' tried to write to invalid columns for {date_str}: {invalid}")
+                continue
+            cells = incoming.setdefault(date_str, {})
+            for col_name, value in data.items():
+                col_idx = col_map.get(col_name)
+                if col_idx is not None and value not in _NO_VALUE:
+                    cells[col_idx] = value
+            success_count += 1
+
+        # Pass 2: touch each target row exactly once
+        changed: list[int] = []
+        new_rows: dict[str, list] = {}
+        for date_str, cells in incoming.items():
+            i = date_index.get(date_str)
+            if i is not None:
+                row = rows[i]
+                before = list(row)
+            else:
+                row = [""] * width
+                row[0] = date_str
+                new_rows[date_str] = row
+            for col_idx, value in cells.items():
+                row[col_idx] = value
+            self._compute_derived_fields(row)
+            if i is not None and row != before:
+                changed.append(i)  # Unchanged rows are not written back
+
+        # Changed rows are rewritten in place, at their pre-insert positions...
+        requests = [_row_request(ws.id, i + 1, rows[i]) for i in sorted(changed)]
+        # ...then new dates are inserted in front of the first row dated after them.
+        # Groups go bottom-up so each insert leaves the positions above it valid.
+        groups = _insert_groups(rows, new_rows)
+        row_count = ws.row_count
+        for insert_at, group in reversed(groups):
+            start = insert_at + 1  # 0-indexed sheet row; row 0 is the header
+            if start < row_count:
+                requests.append({"insertDimension": {
+                    "range": {"sheetId": ws.id, "dimension": "ROWS",
+                              "startIndex": start, "endIndex": start + len(group)},
+                    "inheritFromBefore": False,
+                }})
+            else:
+                requests.append({"appendDimension": {
+                    "sheetId": ws.id, "dimension": "ROWS", "length": len(group),
+                }})
+            requests.append(_rows_request(ws.id, start, group))
 
-    def _compute_derived_fields(self, row: list) -> list:
+        try:
+            # Large imports touch many rows — keep each request to MAX_RANGES_PER_BATCH
+            # parts (order is preserved, so later chunks still see the positions they expect)
+            for i in range(0, len(requests), MAX_RANGES_PER_BATCH):
+                self._batch(requests[i:i + MAX_RANGES_PER_BATCH])
+            if new_rows:
+                self._invalidate_index(ws.title)
+        except Exception as e:
+            log.error("upsert_batch", f"FAILED — Batch write: {type(e).__name__}: {e}")
+            return 0, None
+
+        log.info(
+            "upsert_batch",
+            f"SUCCESS — Upserted {success_count}/{received} rows "
+            f"({len(new_rows)} new in {len(groups)} insert(s), {len(changed)} changed, "
+            f"{-(-len(requests) // MAX_RANGES_PER_BATCH)} request(s))"
+        )
+        return success_count, rows + list(new_rows.values())
+
+    @staticmethod
+    def _invalid_columns(data: dict, source: str) -> list[str]:
+        """Return columns in `data` that `source` is not allowed to write."""
+        allowed = _SOURCE_COLUMN_INDEX.get(source)
+        if allowed is None:
+            return []
+        return [k for k in data if k not in allowed and k != "Date"]
+
+    @staticmethod
+    def _merge_row(row: list, data: dict, source: str = "unknown") -> list:
+        """Merge incoming values into a copy of `row` — null/empty values keep the existing cell."""
+        col_map = _SOURCE_COLUMN_INDEX.get(source, _ALL_COLUMN_INDEX)
+        merged = list(row)
+        for col_name, value in data.items():
+            col_idx = col_map.get(col_name)
+            if col_idx is not None and value not in _NO_VALUE:
+                merged[col_idx] = value
+        return merged
+
+    @staticmethod
+    def _compute_derived_fields(row: list) -> list:
         """Compute Nutrition_Logged and Data_Complete fields."""
-        calories_idx = DAILY_LOG_COLUMNS["Calories"]
-        nutrition_logged_idx = DAILY_LOG_COLUMNS["Nutrition_Logged"]
-        data_complete_idx = DAILY_LOG_COLUMNS["Data_Complete"]
-        sleep_score_idx = DAILY_LOG_COLUMNS["Sleep_Score"]
-
         # Nutrition_Logged: TRUE if Calories is not null/empty
-        has_nutrition = row[calories_idx] not in (None, "", 0, "0")
-        row[nutrition_logged_idx] = "TRUE" if has_nutrition else "FALSE"
+        has_nutrition = row[COL_CALORIES] not in _EMPTY
+        row[COL_NUTRITION_LOGGED] = "TRUE" if has_nutrition else "FALSE"
 
         # Data_Complete: TRUE if both Oura + nutrition present
-        has_oura = row[sleep_score_idx] not in (None, "", 0, "0")
-        row[data_complete_idx] = "TRUE" if (has_nutrition and has_oura) else "FALSE"
+        has_oura = row[COL_SLEEP_SCORE] not in _EMPTY
+        row[COL_DATA_COMPLETE] = "TRUE" if (has_nutrition and has_oura) else "FALSE"
 
         return row
 
     def _find_insert_position(self, ws: gspread.Worksheet, date_str: str) -> int:
         """
-        Find the correct position to insert a new row to keep dates sorted.
+        Find the correct position to insert a new row to keep column A sorted.
+        Binary search over the cached sorted keys — no API call once the index is warm.
         Returns 1-indexed row number.
         """
-        all_dates = ws.col_values(1)  # Column A (dates)
-        if len(all_dates) <= 1:  # Only header or empty
+        index = self._row_index(ws)
+        if not index:  # Only header or empty
             return 2  # First data row
 
-        # Find position where new date should go (ascending order)
-        for i, existing_date in enumerate(all_dates[1:], start=2):  # Skip header
-            if existing_date and date_str < existing_date:
-                return i
+        keys = self._sorted_keys_cache[ws.title]
+        pos = bisect.bisect_right(keys, date_str)
+        if pos < len(keys):
+            # First existing row whose date sorts after the new one (ascending order)
+            return index[keys[pos]]
 
         # Append at the end
-        return len(all_dates) + 1
+        return max(index.values()) + 1
+
+    def _insert_sorted(self, ws: gspread.Worksheet, key: str, row_values: list) -> Optional[int]:
+        """
+        Write a new row keeping column A sorted. Keys that sort last (the normal,
+        chronological case) are appended; only true backfills pay for insert_row's
+        server-side row shift. Returns the 1-indexed row written, if known.
+        """
+        row_num = self._find_insert_position(ws, key)
+        keys = self._sorted_keys_cache.get(ws.title) or []
+        if keys and key < keys[-1]:
+            # Row shift + row content in one batchUpdate (insert_row would take two requests)
+            self._batch([
+                {"insertDimension": {
+                    "range": {"sheetId": ws.id, "dimension": "ROWS",
+                              "startIndex": row_num - 1, "endIndex": row_num},
+                    "inheritFromBefore": False,
+                }},
+                _row_request(ws.id, row_num - 1, row_values),
+            ])
+            self._index_inserted_row(ws.title, key, row_num)
+            return row_num
+
+        response = self._retry(ws.append_row, row_values, table_range="A1", quota="write")
+        self._mark_written()
+        row_num = _appended_row(response)
+        if row_num is None:
+            self._invalidate_index(ws.title)
+        else:
+            self._index_inserted_row(ws.title, key, row_num)
+        return row_num
 
     # ─── Read Operations ─────────────────────────────────────────────
 
     def get_daily_data_for_range(self, start_date: str, end_date: str) -> list[dict]:
-        """Get daily log data for a date range."""
+        """
+        Get daily log data for a date range.
+        With a warm row index only the matching rows are fetched; a cold index
+        falls back to reading the whole tab.
+        """
         self._ensure_connected()
+        if DAILY_LOG_TAB not in self._date_row_cache:
+            all_records = self._fetch_tabs([DAILY_LOG_TAB])[DAILY_LOG_TAB]
+            return [r for r in all_records if start_date <= r.get("Date", "") <= end_date]
+        return self._cached_read(
+            "daily_range", [start_date, end_date],
+            lambda: self._read_date_range(start_date, end_date),
+        )
+
+    def _read_date_range(self, start_date: str, end_date: str) -> list[dict]:
+        """Fetch only the Daily Log rows between start_date and end_date (bisect over the cached index)."""
         ws = self.get_daily_log_worksheet()
-        all_records = self._retry(ws.get_all_records)
-        return [r for r in all_records if start_date <= r.get("Date", "") <= end_date]
+        index = self._row_index(ws)
+        keys = self._sorted_keys_cache[ws.title]
+        in_range = keys[bisect.bisect_left(keys, start_date):bisect.bisect_right(keys, end_date)]
+        if not in_range:
+            return []
+        rows = [index[k] for k in in_range]
+        first, last = min(rows), max(rows)
+        width = len(DAILY_LOG_HEADERS)
+        values = self._retry(
+            ws.get,
+            f"A{first}:{rowcol_to_a1(last, width)}",
+            value_render_option="UNFORMATTED_VALUE",
+            date_time_render_option="FORMATTED_STRING",
+        )
+        records = _to_records([DAILY_LOG_HEADERS] + [list(r) for r in values])
+        # Re-check dates so a stale index can only narrow, never widen, the result
+        return [r for r in records if start_date <= r.get("Date", "") <= end_date]
 
     def get_daily_data_for_date(self, date_str: str) -> Optional[dict]:
         """Get a single day's data."""
         self._ensure_connected()
         ws = self.get_daily_log_worksheet()
-        row_num = self._retry(self.find_row_by_date, ws, date_str)
+        row_num, values = self._read_row(ws, date_str)
         if not row_num:
             return None
-        values = self._retry(ws.row_values, row_num)
         if len(values) < len(DAILY_LOG_HEADERS):
             values.extend([""] * (len(DAILY_LOG_HEADERS) - len(values)))
         return dict(zip(DAILY_LOG_HEADERS, values))
@@ -326,9 +850,7 @@ class SheetsClient:
 
     def get_goals(self) -> list[dict]:
         """Read all rows from Goals tab."""
-        self._ensure_connected()
-        ws = self.spreadsheet.worksheet(GOALS_TAB)
-        return self._retry(ws.get_all_records)
+        return self._fetch_tabs([GOALS_TAB])[GOALS_TAB]
 
     def update_goals(self, goals_data: list[dict]):
         """
@@ -336,20 +858,20 @@ class SheetsClient:
         Expects a list of dicts with keys matching GOALS_HEADERS.
         """
         self._ensure_connected()
-        ws = self.spreadsheet.worksheet(GOALS_TAB)
+        ws = self._worksheet(GOALS_TAB)
         log.info("update_goals", "START — Updating goals tab")
 
-        # Clear existing data (keep header)
-        ws.clear()
-        ws.update("A1", [GOALS_HEADERS])
-
-        # Write all goal rows
-        if goals_data:
-            rows = []
-            for g in goals_data:
-                row = [g.get(h, "") for h in GOALS_HEADERS]
-                rows.append(row)
-            ws.update(f"A2", rows)
+        # Headers + all rows in one write (no destructive clear first), then clear
+        # the old rows below the new block — only when the old block was longer.
+        # (ws.row_count is the grid size, not the data length.)
+        old_len = len(self.get_goals()) + 1  # Usually served from the read cache
+        payload = [GOALS_HEADERS] + [[g.get(h, "") for h in GOALS_HEADERS] for g in goals_data]
+        width = len(GOALS_HEADERS)
+        self._retry(ws.update, f"A1:{rowcol_to_a1(len(payload), width)}", payload, quota="write")
+        if old_len > len(payload):
+            leftover = f"A{len(payload) + 1}:{rowcol_to_a1(old_len, width)}"
+            self._retry(ws.batch_clear, [leftover], quota="write")
+        self._mark_written()
 
         log.info("update_goals", f"SUCCESS — Updated {len(goals_data)} goal rows")
 
@@ -358,7 +880,7 @@ class SheetsClient:
     def get_weekly_summary_worksheet(self) -> gspread.Worksheet:
         """Get the Weekly Summary worksheet."""
         self._ensure_connected()
-        return self.spreadsheet.worksheet(WEEKLY_SUMMARY_TAB)
+        return self._worksheet(WEEKLY_SUMMARY_TAB)
 
     def upsert_weekly_summary(self, summary: dict):
         """
@@ -370,40 +892,56 @@ class SheetsClient:
 
         log.info("upsert_weekly", f"START — Upserting weekly summary for {week_start}")
 
-        from backend.config import WEEKLY_SUMMARY_HEADERS as WS_HEADERS
-
         # Find existing row by Week_Start (column A)
-        row_num = None
-        try:
-            cell = ws.find(week_start, in_column=1)
-            row_num = cell.row if cell else None
-        except gspread.exceptions.CellNotFound:
-            row_num = None
+        row_num = self._row_index(ws).get(week_start)
 
         # Build the row values in header order
-        row_values = [summary.get(h, "") for h in WS_HEADERS]
+        row_values = [summary.get(h, "") for h in WEEKLY_SUMMARY_HEADERS]
 
         if row_num:
-            self._retry(ws.update, f"A{row_num}", [row_values])
+            self._retry(ws.update, f"A{row_num}", [row_values], quota="write")
+            self._mark_written()
             log.info("upsert_weekly", f"SUCCESS — Updated existing row {row_num} for {week_start}")
         else:
-            # Find insert position (sorted by Week_Start ascending)
-            all_starts = ws.col_values(1)
-            insert_at = len(all_starts) + 1  # Append by default
-            for i, existing in enumerate(all_starts[1:], start=2):  # Skip header
-                if existing and week_start < existing:
-                    insert_at = i
-                    break
-            self._retry(ws.insert_row, row_values, index=insert_at)
+            # Append or insert so the tab stays sorted by Week_Start ascending
+            insert_at = self._insert_sorted(ws, week_start, row_values)
             log.info("upsert_weekly", f"SUCCESS — Inserted new row at {insert_at} for {week_start}")
 
-    def get_recent_weekly_summaries(self, count: int = 4) -> list[dict]:
+    def upsert_weekly_summaries(self, summaries: list[dict]):
         """
-        Get the most recent N weekly summaries, sorted by Week_Start descending.
+        Upsert several weekly summary rows: every existing week is rewritten in a
+        single batchUpdateByDataFilter request; new weeks are appended/inserted in order.
         """
+        if not summaries:
+            return
         self._ensure_connected()
         ws = self.get_weekly_summary_worksheet()
-        records = self._retry(ws.get_all_records)
+        log.info("upsert_weekly", f"START — Upserting {len(summaries)} weekly summaries")
+
+        index = self._row_index(ws)
+        existing, new = [], []
+        for summary in summaries:
+            week_start = summary.get("Week_Start", "")
+            row_values = [summary.get(h, "") for h in WEEKLY_SUMMARY_HEADERS]
+            row_num = index.get(week_start)
+            if row_num:
+                existing.append((row_num, row_values))
+            else:
+                new.append((week_start, row_values))
+
+        # Rewrite existing rows first — inserts below would shift their row numbers
+        if existing:
+            self._update_rows_by_filter(ws, existing)
+        for week_start, row_values in sorted(new, key=lambda item: item[0]):
+            self._insert_sorted(ws, week_start, row_values)
+
+        log.info("upsert_weekly", f"SUCCESS — {len(existing)} updated in 1 request, {len(new)} inserted")
+
+    def get_recent_weekly_summaries(self, count: int = 4) -> list[dict]:
+        """
+        Get the most recent N weekly summaries, sorted by Week_Start descending.
+        """
+        records = self._fetch_tabs([WEEKLY_SUMMARY_TAB])[WEEKLY_SUMMARY_TAB]
         if not records:
             return []
         # Sort by Week_Start descending and take the latest N
@@ -418,34 +956,28 @@ class SheetsClient:
         Overwrites if a row for the same date exists.
         """
         self._ensure_connected()
-        ws = self.spreadsheet.worksheet(AI_SUMMARIES_TAB)
+        ws = self._worksheet(AI_SUMMARIES_TAB)
 
         log.info("upsert_ai", f"START — Storing AI summary for {date_str}")
 
-        from backend.config import AI_SUMMARIES_HEADERS
-
         # Find existing row by Date (column A)
-        row_num = None
-        try:
-            cell = ws.find(date_str, in_column=1)
-            row_num = cell.row if cell else None
-        except gspread.exceptions.CellNotFound:
-            row_num = None
+        row_num = self._row_index(ws).get(date_str)
 
         row_values = [date_str, summary_text, week_number]
 
         if row_num:
-            self._retry(ws.update, f"A{row_num}", [row_values])
+            self._retry(ws.update, f"A{row_num}", [row_values], quota="write")
+            self._mark_written()
             log.info("upsert_ai", f"SUCCESS — Updated existing AI summary for {date_str}")
         else:
-            self._retry(ws.append_row, row_values)
+            self._retry(ws.append_row, row_values, quota="write")
+            self._mark_written()
+            self._invalidate_index(ws.title)
             log.info("upsert_ai", f"SUCCESS — Appended new AI summary for {date_str}")
 
     def get_ai_summaries(self, count: int = 10) -> list[dict]:
         """Get the most recent N AI summaries."""
-        self._ensure_connected()
-        ws = self.spreadsheet.worksheet(AI_SUMMARIES_TAB)
-        records = self._retry(ws.get_all_records)
+        records = self._fetch_tabs([AI_SUMMARIES_TAB])[AI_SUMMARIES_TAB]
         if not records:
             return []
         sorted_records = sorted(records, key=lambda r: r.get("Date", ""), reverse=True)
@@ -465,3 +997,106 @@ class SheetsClient:
         except Exception as e:
             log.error("test", f"Connection FAILED — {type(e).__name__}: {e}")
             return False
+
+
+# ─── Helpers ─────────────────────────────────────────────────────────
+
+def _prune_cache():
+    """Delete cached read files older than CACHE_MAX_AGE (including pre-JSON *.pkl.gz entries)."""
+    cutoff = time.time() - CACHE_MAX_AGE
+    for path in CACHE_DIR.glob("*.gz"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def _cell(value) -> dict:
+    """CellData for a raw value (strings are stored as text, like RAW value input)."""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+def _row_request(sheet_id: int, row_index: int, values: list) -> dict:
+    """batchUpdate request that writes `values` into one row (0-indexed) starting at column A."""
+    return _rows_request(sheet_id, row_index, [values])
+
+
+def _rows_request(sheet_id: int, row_index: int, rows: list[list]) -> dict:
+    """batchUpdate request that writes consecutive rows starting at `row_index` (0-indexed), column A."""
+    return {"updateCells": {
+        "start": {"sheetId": sheet_id, "rowIndex": row_index, "columnIndex": 0},
+        "rows": [{"values": [_cell(v) for v in values]} for values in rows],
+        "fields": "userEnteredValue",
+    }}
+
+
+def _insert_groups(rows: list[list], new_rows: dict[str, list]) -> list[tuple[int, list[list]]]:
+    """
+    Group new Daily Log rows by insertion point: (index into `rows` of the first
+    dated row that sorts after them — len(rows) to append, new rows date-sorted).
+    Blank-date rows are never used as anchors, so they stay where they are.
+    """
+    dated = [(r[0], i) for i, r in enumerate(rows) if r[0]]
+    keys = [d for d, _ in dated]
+    groups: list[tuple[int, list[list]]] = []
+    for date_str in sorted(new_rows):
+        pos = bisect.bisect_right(keys, date_str)
+        insert_at = dated[pos][1] if pos < len(dated) else len(rows)
+        if groups and groups[-1][0] == insert_at:
+            groups[-1][1].append(new_rows[date_str])
+        else:
+            groups.append((insert_at, [new_rows[date_str]]))
+    return groups
+
+
+def _header_request(sheet_id: int, headers: list[str]) -> dict:
+    """batchUpdate request that writes `headers` into row 1 of a sheet."""
+    return _row_request(sheet_id, 0, headers)
+
+
+def _status_code(e: Exception) -> Optional[int]:
+    """HTTP status of a gspread APIError; None for every other exception."""
+    if isinstance(e, gspread.exceptions.APIError):
+        return getattr(e.response, "status_code", None)
+    return None
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    """Read the Retry-After header (seconds) from an API error response, if present."""
+    try:
+        value = e.response.headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (AttributeError, ValueError):
+        return None
+
+
+def _appended_row(response: dict) -> Optional[int]:
+    """Row number of an append_row response's updatedRange (e.g. "'Daily Log'!A25:W25" → 25)."""
+    updated = (response or {}).get("updates", {}).get("updatedRange", "")
+    match = re.search(r"![A-Z]+(\d+)", updated)
+    return int(match.group(1)) if match else None
+
+
+def _row_range(row_num: int, width: int) -> str:
+    """A1 range covering columns 1..width of a single row (e.g. "A5:Y5")."""
+    return f"A{row_num}:{rowcol_to_a1(row_num, width)}"
+
+
+def _to_records(values: list[list]) -> list[dict]:
+    """Convert a 2D values block (first row = headers) into record dicts, skipping blank rows."""
+    if not values:
+        return []
+    headers = values[0]
+    width = len(headers)
+    return [
+        dict(zip(headers, list(row) + [""] * (width - len(row))))
+        for row in values[1:]
+        if any(cell != "" for cell in row)
+    ]
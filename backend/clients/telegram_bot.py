@@ -3,26 +3,36 @@ Telegram bot — commands, file upload handling, manual input, and alerts.
 Security: only responds to the configured TELEGRAM_USER_ID.
 """
 
-import os
-import tempfile
+import asyncio
+import io
+import re
+import time
 from datetime import datetime
 
 from telegram import Update
 from telegram.ext import (
     Application,
+    ApplicationBuilder,
     CommandHandler,
     MessageHandler,
     ContextTypes,
     filters,
 )
+from telegram.request import HTTPXRequest
 
 from backend.config import (
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_USER_ID,
+    TELEGRAM_WEBHOOK_URL,
+    TELEGRAM_WEBHOOK_SECRET,
+    WEBHOOK_PORT,
     TIMEZONE,
 )
+from backend.clients.oura_client import OuraClient
 from backend.clients.sheets_client import SheetsClient
-from backend.services.nutrition_service import NutritionService
+from backend.services.nutrition_service import NutritionService, check_import_size
+from backend.services.summary_service import SummaryService
+from backend.services.sync_service import SyncService
 from backend.utils.logger import get_logger
 from backend.utils.date_utils import (
     today_sofia,
@@ -33,10 +43,92 @@ from backend.utils.date_utils import (
 
 log = get_logger("TELEGRAM")
 
+# Bot API connection settings — one pooled HTTP/2 connection multiplexes
+# concurrent sendMessage/getFile calls; getUpdates gets its own connection
+CONNECTION_POOL_SIZE = 16
+POOL_TIMEOUT = 5.0  # seconds
+# getUpdates long-poll: Telegram holds the request open until an update arrives
+# or POLL_TIMEOUT passes, so the socket idles instead of re-polling every few seconds
+POLL_TIMEOUT = 30  # seconds (Telegram's practical max)
+GET_UPDATES_READ_TIMEOUT = POLL_TIMEOUT + 5.0  # seconds — must outlast the long poll
+# Webhook mode (TELEGRAM_WEBHOOK_URL set): Telegram POSTs each update here instead
+WEBHOOK_PATH = "telegram/webhook"
+
 # ─── Shared State ────────────────────────────────────────────────
 # These are initialized in start_bot() so the bot can share the sheets client
 _sheets_client: SheetsClient = None
 _nutrition_service: NutritionService = None
+_summary_service: SummaryService = None
+
+# Daily Log reads behind /status, /today, /week — (kind, *dates) → (fetched_at, data)
+READ_CACHE_TTL = 60  # seconds
+_daily_cache: dict[tuple, tuple[float, object]] = {}
+
+# Max chars per outgoing message chunk (Telegram limit is 4096; leave headroom)
+MESSAGE_CHUNK_LIMIT = 4000
+
+# Cell values that count as "not logged"
+_EMPTY_VALUES = frozenset((None, "", 0, "0"))
+
+# Manual entries start with a YYYY-MM-DD date
+_DATE_PREFIX_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# ─── Reply Templates ─────────────────────────────────────────────
+# Built once at import; dynamic slots are filled with str.format()
+
+_START_TEXT = (
+    "👋 *Health Dashboard Bot*\n\n"
+    "I track your health data from Oura Ring and MacroFactor.\n\n"
+    "📤 *Send a MacroFactor .xlsx export* to import nutrition data\n"
+    "📝 *Send a manual entry:*\n"
+    "`YYYY-MM-DD weight protein carbs fats calories`\n"
+    "Use `-` to skip a field\n\n"
+    "📋 *Commands:*\n"
+    "/status — Today's data completeness\n"
+    "/today — Full stats for today\n"
+    "/week — This week's summary\n"
+    "/goals — Current macro targets\n"
+    "/sync — Pull latest Oura data\n"
+    "/summary — AI health summary\n"
+    "/help — All commands"
+)
+
+_HELP_TEXT = (
+    "📋 *Available Commands*\n\n"
+    "/start — Welcome & quick instructions\n"
+    "/status — Today's data completeness\n"
+    "/today — Full stats for today\n"
+    "/week — This week's summary so far\n"
+    "/goals — Current macro/calorie targets\n"
+    "/sync — Pull latest Oura data now\n"
+    "/summary — AI-powered health summary\n"
+    "/help — This help message\n\n"
+    "📤 *File Upload:* Send a MacroFactor `.xlsx` export\n"
+    "📝 *Manual Entry:*\n"
+    "`YYYY-MM-DD weight protein carbs fats calories`\n"
+    "Example: `2026-02-09 73 180 200 70 2100`\n"
+    "Use `-` to skip: `2026-02-09 73 - - - -` (weight only)"
+)
+
+_STATUS_NO_DATA = (
+    "📅 *{date}*\n\n"
+    "❌ No data logged yet today.\n\n"
+    "Oura data syncs automatically at 10am, 6pm, midnight.\n"
+    "Send a MacroFactor export to add nutrition."
+)
+_STATUS_TEXT = (
+    "📅 *{date}*\n\n"
+    "{oura} Oura Data (sleep, readiness, activity)\n"
+    "{nutrition} Nutrition (calories & macros)\n"
+    "{weight} Weight\n\n"
+    "{status}"
+)
+_TODAY_NO_DATA = "📅 *{date}*\n\nNo data yet. Oura syncs at 10am/6pm/midnight."
+_WEEK_NO_DATA = "📊 *Week of {monday}*\n\nNo data logged this week yet."
+_GOALS_EMPTY = (
+    "🎯 *No goals set yet.*\n\n"
+    "Upload a MacroFactor Program Settings export to set targets."
+)
 
 
 def _get_sheets() -> SheetsClient:
@@ -56,6 +148,39 @@ def _get_nutrition() -> NutritionService:
     return _nutrition_service
 
 
+def _get_summary() -> SummaryService:
+    """Get or create the shared SummaryService (keeps its Claude client and connection pool)."""
+    global _summary_service
+    if _summary_service is None:
+        _summary_service = SummaryService(_get_sheets())
+    return _summary_service
+
+
+async def _cached(key: tuple, fetch_fn, *args):
+    """
+    Return a cached Daily Log read if younger than READ_CACHE_TTL, else fetch and store it.
+    The (blocking) Sheets call runs in a worker thread so the event loop keeps serving updates.
+    """
+    hit = _daily_cache.get(key)
+    now = time.monotonic()
+    if hit is not None and now - hit[0] < READ_CACHE_TTL:
+        return hit[1]
+    data = await asyncio.to_thread(fetch_fn, *args)
+    _daily_cache[key] = (now, data)
+    return data
+
+
+def _invalidate_daily_cache(date_str: str | None = None):
+    """Drop cached reads touching `date_str` (all of them when no date is given)."""
+    if date_str is None:
+        _daily_cache.clear()
+        return
+    for key in list(_daily_cache):
+        kind, *dates = key
+        if (kind == "day" and dates[0] == date_str) or (kind == "range" and dates[0] <= date_str <= dates[1]):
+            del _daily_cache[key]
+
+
 # ─── Security ────────────────────────────────────────────────────
 
 def _is_authorized(user_id: int) -> bool:
@@ -81,23 +206,7 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     log.info("command", "/start")
-    await update.message.reply_text(
-        "👋 *Health Dashboard Bot*\n\n"
-        "I track your health data from Oura Ring and MacroFactor.\n\n"
-        "📤 *Send a MacroFactor .xlsx export* to import nutrition data\n"
-        "📝 *Send a manual entry:*\n"
-        "`YYYY-MM-DD weight protein carbs fats calories`\n"
-        "Use `-` to skip a field\n\n"
-        "📋 *Commands:*\n"
-        "/status — Today's data completeness\n"
-        "/today — Full stats for today\n"
-        "/week — This week's summary\n"
-        "/goals — Current macro targets\n"
-        "/sync — Pull latest Oura data\n"
-        "/summary — AI health summary\n"
-        "/help — All commands",
-        parse_mode="Markdown",
-    )
+    await update.message.reply_text(_START_TEXT, parse_mode="Markdown")
 
 
 async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -106,23 +215,7 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     log.info("command", "/help")
-    await update.message.reply_text(
-        "📋 *Available Commands*\n\n"
-        "/start — Welcome & quick instructions\n"
-        "/status — Today's data completeness\n"
-        "/today — Full stats for today\n"
-        "/week — This week's summary so far\n"
-        "/goals — Current macro/calorie targets\n"
-        "/sync — Pull latest Oura data now\n"
-        "/summary — AI-powered health summary\n"
-        "/help — This help message\n\n"
-        "📤 *File Upload:* Send a MacroFactor `.xlsx` export\n"
-        "📝 *Manual Entry:*\n"
-        "`YYYY-MM-DD weight protein carbs fats calories`\n"
-        "Example: `2026-02-09 73 180 200 70 2100`\n"
-        "Use `-` to skip: `2026-02-09 73 - - - -` (weight only)",
-        parse_mode="Markdown",
-    )
+    await update.message.reply_text(_HELP_TEXT, parse_mode="Markdown")
 
 
 async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -134,22 +227,16 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         sheets = _get_sheets()
         today = today_sofia()
-        data = sheets.get_daily_data_for_date(today)
+        data = await _cached(("day", today), sheets.get_daily_data_for_date, today)
 
         if not data:
-            await update.message.reply_text(
-                f"📅 *{today}*\n\n"
-                "❌ No data logged yet today.\n\n"
-                "Oura data syncs automatically at 10am, 6pm, midnight.\n"
-                "Send a MacroFactor export to add nutrition.",
-                parse_mode="Markdown",
-            )
+            await update.message.reply_text(_STATUS_NO_DATA.format(date=today), parse_mode="Markdown")
             return
 
         # Check what's present
-        has_oura = data.get("Sleep_Score") not in (None, "", 0, "0", "")
-        has_nutrition = data.get("Calories") not in (None, "", 0, "0", "")
-        has_weight = data.get("Weight_kg") not in (None, "", 0, "0", "")
+        has_oura = data.get("Sleep_Score") not in _EMPTY_VALUES
+        has_nutrition = data.get("Calories") not in _EMPTY_VALUES
+        has_weight = data.get("Weight_kg") not in _EMPTY_VALUES
 
         oura_icon = "✅" if has_oura else "❌"
         nutrition_icon = "✅" if has_nutrition else "❌"
@@ -166,11 +253,13 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
         status = "✅ All data logged!" if not missing else f"⚠️ Missing: {', '.join(missing)}"
 
         await update.message.reply_text(
-            f"📅 *{today}*\n\n"
-            f"{oura_icon} Oura Data (sleep, readiness, activity)\n"
-            f"{nutrition_icon} Nutrition (calories & macros)\n"
-            f"{weight_icon} Weight\n\n"
-            f"{status}",
+            _STATUS_TEXT.format(
+                date=today,
+                oura=oura_icon,
+                nutrition=nutrition_icon,
+                weight=weight_icon,
+                status=status,
+            ),
             parse_mode="Markdown",
         )
     except Exception as e:
@@ -187,13 +276,10 @@ async def cmd_today(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         sheets = _get_sheets()
         today = today_sofia()
-        data = sheets.get_daily_data_for_date(today)
+        data = await _cached(("day", today), sheets.get_daily_data_for_date, today)
 
         if not data:
-            await update.message.reply_text(
-                f"📅 *{today}*\n\nNo data yet. Oura syncs at 10am/6pm/midnight.",
-                parse_mode="Markdown",
-            )
+            await update.message.reply_text(_TODAY_NO_DATA.format(date=today), parse_mode="Markdown")
             return
 
         msg = _format_daily_stats(today, data)
@@ -216,13 +302,10 @@ async def cmd_week(update: Update, context: ContextTypes.DEFAULT_TYPE):
         monday, sunday = get_week_bounds(today)
         week_dates = date_range(monday, today)  # Only up to today
 
-        data = sheets.get_daily_data_for_range(monday, sunday)
+        data = await _cached(("range", monday, sunday), sheets.get_daily_data_for_range, monday, sunday)
 
         if not data:
-            await update.message.reply_text(
-                f"📊 *Week of {monday}*\n\nNo data logged this week yet.",
-                parse_mode="Markdown",
-            )
+            await update.message.reply_text(_WEEK_NO_DATA.format(monday=monday), parse_mode="Markdown")
             return
 
         msg = _format_weekly_summary(monday, sunday, data, len(week_dates))
@@ -241,14 +324,10 @@ async def cmd_goals(update: Update, context: ContextTypes.DEFAULT_TYPE):
     log.info("command", "/goals")
     try:
         sheets = _get_sheets()
-        goals = sheets.get_goals()
+        goals = await asyncio.to_thread(sheets.get_goals)
 
         if not goals:
-            await update.message.reply_text(
-                "🎯 *No goals set yet.*\n\n"
-                "Upload a MacroFactor Program Settings export to set targets.",
-                parse_mode="Markdown",
-            )
+            await update.message.reply_text(_GOALS_EMPTY, parse_mode="Markdown")
             return
 
         lines = ["🎯 *Current Macro Targets*\n"]
@@ -280,14 +359,12 @@ async def cmd_sync(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         await update.message.reply_text("⏳ Syncing Oura data...")
 
-        from backend.clients.oura_client import OuraClient
-        from backend.services.sync_service import SyncService
-
         sheets = _get_sheets()
         oura = OuraClient()
         sync_svc = SyncService(sheets, oura)
 
-        result = sync_svc.sync_oura(lookback_days=7)
+        result = await asyncio.to_thread(sync_svc.sync_oura, lookback_days=7)
+        _invalidate_daily_cache()
 
         if result["errors"]:
             error_msg = "; ".join(result["errors"])
@@ -313,22 +390,16 @@ async def cmd_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         await update.message.reply_text("⏳ Generating AI summary... this may take a moment.")
 
-        from backend.services.summary_service import SummaryService
-        sheets = _get_sheets()
-        summary_svc = SummaryService(sheets)
+        summary_svc = _get_summary()
 
         result = await summary_svc.generate_ai_summary()
 
         if result.get("success"):
-            # Split long messages if needed (Telegram max is 4096 chars)
+            # Split long messages on paragraph boundaries (Telegram max is 4096 chars)
             text = f"📊 *Weekly Health Summary*\n\n{result['summary_text']}"
-            if len(text) > 4096:
-                # Send in chunks
-                for i in range(0, len(text), 4096):
-                    chunk = text[i:i + 4096]
-                    await update.message.reply_text(chunk, parse_mode="Markdown")
-            else:
-                await update.message.reply_text(text, parse_mode="Markdown")
+            for chunk in _md_chunks(text):
+                # Sequential on purpose — chunks must arrive in order
+                await update.message.reply_text(chunk, parse_mode="Markdown")
         else:
             error = result.get("error", "Unknown error")
             await update.message.reply_text(
@@ -364,22 +435,29 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    # Download to temp file
-    tmp_path = None
+    # Reject empty/oversized files before downloading them (the size is re-checked after download)
+    if document.file_size is not None:
+        try:
+            check_import_size(document.file_size)
+        except ValueError as e:
+            await update.message.reply_text(f"⚠️ {e}")
+            return
+
     try:
         await update.message.reply_text("📥 Processing file...")
 
-        # Download
+        # Download straight into memory — no temp file round-trip
         file = await context.bot.get_file(document.file_id)
-        tmp_fd, tmp_path = tempfile.mkstemp(suffix=".xlsx")
-        os.close(tmp_fd)
-        await file.download_to_drive(tmp_path)
+        buf = io.BytesIO()
+        await file.download_to_memory(buf)
+        buf.seek(0)
 
-        log.info("file_upload", f"Downloaded to {tmp_path}")
+        log.info("file_upload", f"Downloaded {buf.getbuffer().nbytes} bytes into memory")
 
         # Parse and upsert
         nutrition = _get_nutrition()
-        result = nutrition.import_macrofactor_file(tmp_path)
+        result = await asyncio.to_thread(nutrition.import_macrofactor_fileobj, buf, name=file_name)
+        _invalidate_daily_cache()
 
         await update.message.reply_text(result["message"], parse_mode="Markdown")
 
@@ -388,15 +466,6 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         log.error("file_upload", f"Error processing {file_name}: {type(e).__name__}: {e}")
         await update.message.reply_text(error_msg)
 
-    finally:
-        # Clean up temp file
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.unlink(tmp_path)
-                log.info("file_upload", f"Cleaned up temp file: {tmp_path}")
-            except OSError:
-                pass
-
 
 # ─── Manual Text Input Handler ───────────────────────────────────
 
@@ -410,7 +479,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Check if it looks like a date-based manual entry (starts with YYYY-MM-DD)
-    if len(text) >= 10 and text[4] == "-" and text[7] == "-":
+    if _DATE_PREFIX_RE.match(text):
         await _handle_manual_entry(update, text)
     else:
         # Unknown text
@@ -436,7 +505,8 @@ async def _handle_manual_entry(update: Update, text: str):
         return
 
     nutrition = _get_nutrition()
-    result = nutrition.import_manual_entry(
+    result = await asyncio.to_thread(
+        nutrition.import_manual_entry,
         date_str=parsed["date"],
         weight=parsed.get("weight"),
         protein=parsed.get("protein"),
@@ -444,6 +514,7 @@ async def _handle_manual_entry(update: Update, text: str):
         fats=parsed.get("fats"),
         calories=parsed.get("calories"),
     )
+    _invalidate_daily_cache(parsed["date"])
 
     # Build response with warnings
     response = result["message"]
@@ -500,7 +571,7 @@ def _format_daily_stats(date_str: str, data: dict) -> str:
 
     body_parts = []
     if steps is not None:
-        body_parts.append(f"🚶 Steps: *{steps:,}*")
+        body_parts.append(f"🚶 Steps: *{format(steps, ',d')}*")
     if rhr is not None:
         body_parts.append(f"❤️ RHR: *{rhr}* bpm")
     if hrv is not None:
@@ -549,22 +620,49 @@ def _format_daily_stats(date_str: str, data: dict) -> str:
     return "\n".join(lines)
 
 
+# Fields averaged in the /week message → round to int?
+WEEKLY_AVG_FIELDS = (
+    ("Sleep_Score", True),
+    ("Readiness_Score", True),
+    ("Activity_Score", True),
+    ("Total_Sleep_Hours", False),
+    ("Nap_Minutes", True),
+    ("Steps", True),
+    ("Calories", True),
+    ("Protein_g", True),
+    ("Carbs_g", True),
+    ("Fats_g", True),
+)
+
+
 def _format_weekly_summary(monday: str, sunday: str, data: list[dict], days_elapsed: int) -> str:
     """Format weekly summary into a Telegram message."""
     lines = [f"📊 *Week of {monday} → {sunday}*\n"]
 
-    # Calculate averages
-    def avg(field, as_int=False):
-        vals = [_safe_float(d.get(field)) for d in data if _safe_float(d.get(field)) is not None]
-        if not vals:
-            return None
-        result = sum(vals) / len(vals)
-        return round(result) if as_int else round(result, 1)
+    # Calculate averages — one pass over the days, each cell coerced once
+    sums = dict.fromkeys((f for f, _ in WEEKLY_AVG_FIELDS), 0.0)
+    counts = dict.fromkeys(sums, 0)
+    weight_vals = []
+    for d in data:
+        for field in sums:
+            v = _safe_float(d.get(field))
+            if v is not None:
+                sums[field] += v
+                counts[field] += 1
+        w = _safe_float(d.get("Weight_kg"))
+        if w is not None:
+            weight_vals.append(w)
+
+    averages = {}
+    for field, as_int in WEEKLY_AVG_FIELDS:
+        if counts[field]:
+            result = sums[field] / counts[field]
+            averages[field] = round(result) if as_int else round(result, 1)
 
     # Scores
-    sleep_avg = avg("Sleep_Score", as_int=True)
-    readiness_avg = avg("Readiness_Score", as_int=True)
-    activity_avg = avg("Activity_Score", as_int=True)
+    sleep_avg = averages.get("Sleep_Score")
+    readiness_avg = averages.get("Readiness_Score")
+    activity_avg = averages.get("Activity_Score")
 
     if sleep_avg is not None:
         lines.append(f"{_score_emoji(sleep_avg)} Avg Sleep Score: *{sleep_avg}*")
@@ -574,20 +672,19 @@ def _format_weekly_summary(monday: str, sunday: str, data: list[dict], days_elap
         lines.append(f"{_score_emoji(activity_avg)} Avg Activity: *{activity_avg}*")
 
     # Sleep
-    sleep_avg_hrs = avg("Total_Sleep_Hours")
-    nap_avg = avg("Nap_Minutes", as_int=True)
+    sleep_avg_hrs = averages.get("Total_Sleep_Hours")
+    nap_avg = averages.get("Nap_Minutes")
     if sleep_avg_hrs is not None:
         lines.append(f"\n😴 Avg Sleep: *{sleep_avg_hrs}h*")
     if nap_avg is not None and nap_avg > 0:
         lines.append(f"💤 Avg Nap: *{nap_avg}min*")
 
     # Steps
-    steps_avg = avg("Steps", as_int=True)
+    steps_avg = averages.get("Steps")
     if steps_avg is not None:
-        lines.append(f"🚶 Avg Steps: *{steps_avg:,}*")
+        lines.append(f"🚶 Avg Steps: *{format(steps_avg, ',d')}*")
 
     # Weight
-    weight_vals = [_safe_float(d.get("Weight_kg")) for d in data if _safe_float(d.get("Weight_kg")) is not None]
     if weight_vals:
         lines.append(f"\n⚖️ Weight: *{weight_vals[-1]}kg*")
         if len(weight_vals) > 1:
@@ -596,10 +693,10 @@ def _format_weekly_summary(monday: str, sunday: str, data: list[dict], days_elap
             lines.append(f"   Week change: {sign}{change}kg")
 
     # Nutrition
-    cal_avg = avg("Calories", as_int=True)
-    protein_avg = avg("Protein_g", as_int=True)
-    carbs_avg = avg("Carbs_g", as_int=True)
-    fats_avg = avg("Fats_g", as_int=True)
+    cal_avg = averages.get("Calories")
+    protein_avg = averages.get("Protein_g")
+    carbs_avg = averages.get("Carbs_g")
+    fats_avg = averages.get("Fats_g")
 
     if cal_avg is not None:
         lines.append(f"\n🔥 Avg Calories: *{cal_avg}*")
@@ -622,23 +719,50 @@ def _format_weekly_summary(monday: str, sunday: str, data: list[dict], days_elap
     return "\n".join(lines)
 
 
+def _md_chunks(text: str, limit: int = MESSAGE_CHUNK_LIMIT):
+    """
+    Split text into messages of at most `limit` chars, breaking on paragraph
+    (then line) boundaries so Markdown entities are never cut in half.
+    """
+    buf = ""
+    for block in text.split("\n\n"):
+        pieces = [block] if len(block) <= limit else block.split("\n")
+        for i, piece in enumerate(pieces):
+            sep = "\n" if i else "\n\n"
+            candidate = f"{buf}{sep}{piece}" if buf else piece
+            if len(candidate) <= limit:
+                buf = candidate
+                continue
+            if buf:
+                yield buf
+            # A single line longer than the limit can only be hard-split
+            while len(piece) > limit:
+                yield piece[:limit]
+                piece = piece[limit:]
+            buf = piece
+    if buf:
+        yield buf
+
+
+# Score bands: <60, 60–79, 80+
+_SCORE_EMOJI = ("🔴", "🟡", "🟢")
+
+
 def _score_emoji(score: int) -> str:
     """Return color-coded emoji for health scores."""
-    if score >= 80:
-        return "🟢"
-    elif score >= 60:
-        return "🟡"
-    else:
-        return "🔴"
+    return _SCORE_EMOJI[(score >= 60) + (score >= 80)]
 
 
 def _safe_int(value) -> int | None:
     """Safely convert a value to int, returning None for empty/invalid."""
     if value is None or value == "":
         return None
+    # UNFORMATTED_VALUE reads already return numbers — skip the string round-trip
+    if type(value) is int:
+        return value
     try:
         return int(float(value))
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, OverflowError):  # "nan" / "inf" cells included
         return None
 
 
@@ -646,6 +770,8 @@ def _safe_float(value) -> float | None:
     """Safely convert a value to float, returning None for empty/invalid."""
     if value is None or value == "":
         return None
+    if isinstance(value, float):
+        return value
     try:
         return float(value)
     except (ValueError, TypeError):
@@ -654,13 +780,43 @@ def _safe_float(value) -> float | None:
 
 # ─── Bot Runner ──────────────────────────────────────────────────
 
-def create_application() -> Application:
-    """Create and configure the Telegram bot application."""
+def application_builder() -> ApplicationBuilder:
+    """Application builder with the token and pooled HTTP/2 request settings applied."""
+    return (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .request(HTTPXRequest(
+            connection_pool_size=CONNECTION_POOL_SIZE,
+            http_version="2",
+            pool_timeout=POOL_TIMEOUT,
+        ))
+        .get_updates_request(HTTPXRequest(
+            connection_pool_size=1,
+            read_timeout=GET_UPDATES_READ_TIMEOUT,
+        ))
+    )
+
+
+def create_application(post_init=None, post_shutdown=None) -> Application:
+    """
+    Create and configure the Telegram bot application.
+    post_init / post_shutdown: optional async hooks (e.g. to run the scheduler alongside the bot).
+    """
     if not TELEGRAM_BOT_TOKEN:
         raise ValueError("TELEGRAM_BOT_TOKEN not set in environment")
 
-    app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    builder = application_builder()
+    if post_init is not None:
+        builder = builder.post_init(post_init)
+    if post_shutdown is not None:
+        builder = builder.post_shutdown(post_shutdown)
+    app = builder.build()
+    register_handlers(app)
+    return app
+
 
+def register_handlers(app: Application):
+    """Register all command, file and text handlers on an application."""
     # Register command handlers
     app.add_handler(CommandHandler("start", cmd_start))
     app.add_handler(CommandHandler("help", cmd_help))
@@ -668,28 +824,51 @@ def create_application() -> Application:
     app.add_handler(CommandHandler("today", cmd_today))
     app.add_handler(CommandHandler("week", cmd_week))
     app.add_handler(CommandHandler("goals", cmd_goals))
-    app.add_handler(CommandHandler("summary", cmd_summary))
-    app.add_handler(CommandHandler("sync", cmd_sync))
+    # Slow handlers run as background tasks so they don't hold up other updates
+    app.add_handler(CommandHandler("summary", cmd_summary, block=False))
+    app.add_handler(CommandHandler("sync", cmd_sync, block=False))
 
     # File upload handler
-    app.add_handler(MessageHandler(filters.Document.ALL, handle_document))
+    app.add_handler(MessageHandler(filters.Document.ALL, handle_document, block=False))
 
     # Text message handler (must be last — catches all remaining text)
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
 
-    return app
+
+def run_application(app: Application):
+    """
+    Run the application until stopped.
+    With TELEGRAM_WEBHOOK_URL set, Telegram pushes updates to a built-in webhook
+    server; otherwise the bot long-polls getUpdates.
+    """
+    if TELEGRAM_WEBHOOK_URL:
+        log.info("start", f"Receiving updates via webhook on port {WEBHOOK_PORT}")
+        app.run_webhook(
+            listen="0.0.0.0",
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=f"{TELEGRAM_WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+            secret_token=TELEGRAM_WEBHOOK_SECRET or None,
+            allowed_updates=Update.ALL_TYPES,
+            drop_pending_updates=True,  # Don't process old messages on restart
+        )
+    else:
+        app.run_polling(
+            allowed_updates=Update.ALL_TYPES,
+            drop_pending_updates=True,  # Don't process old messages on restart
+            timeout=POLL_TIMEOUT,
+            poll_interval=0.0,
+            bootstrap_retries=-1,  # Keep retrying startup calls instead of exiting on a network blip
+        )
 
 
 def start_bot():
-    """Start the Telegram bot with polling. Blocks until stopped."""
+    """Start the Telegram bot (webhook or polling). Blocks until stopped."""
     log.info("start", "Starting Telegram bot...")
     log.info("start", f"Bot username: @{TELEGRAM_USER_ID}")
     log.info("start", f"Authorized user ID: {TELEGRAM_USER_ID}")
 
     app = create_application()
 
-    log.info("start", "Bot is running — polling for messages...")
-    app.run_polling(
-        allowed_updates=Update.ALL_TYPES,
-        drop_pending_updates=True,  # Don't process old messages on restart
-    )
+    log.info("start", "Bot is running — waiting for messages...")
+    run_application(app)
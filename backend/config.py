@@ -24,6 +24,10 @@ CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-5-20250929")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_BOT_USERNAME = os.getenv("TELEGRAM_BOT_USERNAME", "alex_health_tracker_bot")
 TELEGRAM_USER_ID = int(os.getenv("TELEGRAM_USER_ID", "0"))
+# Webhook mode: public HTTPS base URL of the backend service (empty = long polling)
+TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "")
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
+WEBHOOK_PORT = int(os.getenv("PORT", "8080"))
 
 # ─── Google Sheets ───────────────────────────────────────────────
 GOOGLE_SHEET_ID = os.getenv("GOOGLE_SHEET_ID")
@@ -39,6 +43,8 @@ TIMEZONE = os.getenv("TIMEZONE", "Europe/Sofia")
 SYNC_LOOKBACK_DAYS = int(os.getenv("SYNC_LOOKBACK_DAYS", "7"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 DASHBOARD_URL = os.getenv("DASHBOARD_URL", "")
+# On-disk cache for Sheets reads (keyed by spreadsheet revision)
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(Path.home() / ".cache" / "health-dashboard")))
 
 # ─── Google Sheet Tab Names ─────────────────────────────────────
 DAILY_LOG_TAB = "Daily Log"
@@ -74,8 +80,13 @@ DAILY_LOG_COLUMNS = {
     "Nap_Minutes": 22,        # W
 }
 
+# Named column indices for hot paths — COL_DATE, COL_WEIGHT_KG, ..., COL_NAP_MINUTES
+for _name, _idx in DAILY_LOG_COLUMNS.items():
+    globals()[f"COL_{_name.upper()}"] = _idx
+del _name, _idx
+
 # Headers for the Daily Log tab (in order)
-DAILY_LOG_HEADERS = list(DAILY_LOG_COLUMNS.keys())
+DAILY_LOG_HEADERS = tuple(DAILY_LOG_COLUMNS)
 
 # Oura columns (J-T + W, indices 9-19 + 22) — only Oura sync writes here
 OURA_COLUMNS = [
@@ -116,11 +127,13 @@ AI_SUMMARIES_HEADERS = ["Date", "Summary_Text", "Week_Number"]
 
 def validate_config():
     """Validate that all required environment variables are set."""
-    required = {
-        "OURA_API_TOKEN": OURA_API_TOKEN,
-        "GOOGLE_SHEET_ID": GOOGLE_SHEET_ID,
-    }
-    missing = [k for k, v in required.items() if not v]
+    missing = [
+        name for name, value in (
+            ("OURA_API_TOKEN", OURA_API_TOKEN),
+            ("GOOGLE_SHEET_ID", GOOGLE_SHEET_ID),
+        )
+        if not value
+    ]
     if missing:
         print(f"❌ Missing required environment variables: {', '.join(missing)}")
         print("   Check your .env file or Railway environment variables.")
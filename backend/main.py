@@ -8,7 +8,7 @@ Usage:
     python -m backend.main setup-sheets    # Create tabs and headers
     python -m backend.main sync            # Run Oura sync (last 7 days)
     python -m backend.main sync-40         # Run Oura sync (last 40 days)
-    python -m backend.main import <file>   # Import MacroFactor .xlsx file
+    python -m backend.main import <file>   # Import MacroFactor .xlsx file (--no-cache to force a re-parse)
     python -m backend.main bot             # Start Telegram bot (polling)
     python -m backend.main run             # Start bot + scheduler (production)
     python -m backend.main alerts          # Run alert checks manually
@@ -26,10 +26,11 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from backend.config import validate_config, LOG_LEVEL
 from backend.utils.logger import setup_logging, get_logger
 
-# Initialize logging first
-setup_logging(LOG_LEVEL)
 log = get_logger("MAIN")
 
+# Connection tests report missing credentials themselves — no up-front config check
+NO_CONFIG_COMMANDS = frozenset(("test-sheets", "test-oura", "test-all"))
+
 
 def cmd_test_sheets():
     """Test Google Sheets connection."""
@@ -86,20 +87,26 @@ def cmd_sync():
     return not result['errors']
 
 
-def cmd_import(file_path: str):
+def cmd_import(file_path: str, use_cache: bool = True):
     """Import a MacroFactor .xlsx file."""
     from backend.clients.sheets_client import SheetsClient
-    from backend.services.nutrition_service import NutritionService
+    from backend.services.nutrition_service import NutritionService, check_import_size
 
     if not Path(file_path).exists():
         print(f"❌ File not found: {file_path}")
         return False
+    # Reject empty/oversized files before connecting to Sheets or parsing
+    try:
+        check_import_size(Path(file_path).stat().st_size)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
 
     sheets = SheetsClient()
     sheets.connect()
     nutrition = NutritionService(sheets)
 
-    result = nutrition.import_macrofactor_file(file_path)
+    result = nutrition.import_macrofactor_file(file_path, use_cache=use_cache)
     print(f"\n{result['message']}")
     return result['success']
 
@@ -137,14 +144,7 @@ def cmd_bot():
 
 def cmd_run():
     """Start both the Telegram bot AND the scheduler (production entry point)."""
-    from telegram import Update
-    from telegram.ext import (
-        Application,
-        CommandHandler,
-        MessageHandler,
-        filters,
-    )
-    from backend.config import TELEGRAM_BOT_TOKEN
+    from telegram.ext import Application
     from backend.scheduler import HealthScheduler
     from backend.clients import telegram_bot as tg
 
@@ -161,36 +161,14 @@ def cmd_run():
         scheduler.stop()
         log.info("run", "Scheduler stopped")
 
-    # Build the application with post_init/post_shutdown hooks
-    app = (
-        Application.builder()
-        .token(TELEGRAM_BOT_TOKEN)
-        .post_init(post_init)
-        .post_shutdown(post_shutdown)
-        .build()
-    )
-
-    # Register the same handlers as create_application()
-    app.add_handler(CommandHandler("start", tg.cmd_start))
-    app.add_handler(CommandHandler("help", tg.cmd_help))
-    app.add_handler(CommandHandler("status", tg.cmd_status))
-    app.add_handler(CommandHandler("today", tg.cmd_today))
-    app.add_handler(CommandHandler("week", tg.cmd_week))
-    app.add_handler(CommandHandler("goals", tg.cmd_goals))
-    app.add_handler(CommandHandler("summary", tg.cmd_summary))
-    app.add_handler(CommandHandler("sync", tg.cmd_sync))
-    app.add_handler(MessageHandler(filters.Document.ALL, tg.handle_document))
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, tg.handle_text))
+    app = tg.create_application(post_init=post_init, post_shutdown=post_shutdown)
 
     print("\n🚀 Starting Health Dashboard (bot + scheduler)...")
-    print("   Telegram bot: polling for messages")
+    print(f"   Telegram bot: {'webhook' if tg.TELEGRAM_WEBHOOK_URL else 'polling for messages'}")
     print("   Scheduler: cron jobs active (10:00, 18:00, 00:00 Sofia)")
     print("   Press Ctrl+C to stop.\n")
 
-    app.run_polling(
-        allowed_updates=Update.ALL_TYPES,
-        drop_pending_updates=True,
-    )
+    tg.run_application(app)
     return True
 
 
@@ -275,6 +253,19 @@ def cmd_test_all():
     return sheets_ok and oura_ok
 
 
+def _install_uvloop():
+    """
+    Use uvloop for every event loop this process creates (the bot's polling loop,
+    asyncio.run in ai-summary). Optional — the stdlib loop is used when it's absent.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+    log.info("main", "Using uvloop event loop")
+
+
 def main():
     """Main CLI entry point."""
     if len(sys.argv) < 2:
@@ -283,8 +274,13 @@ def main():
 
     command = sys.argv[1].lower()
 
-    # Validate config before running any command
-    validate_config()
+    # Logging is configured here (not at import) so importing this module has no side effects
+    setup_logging(LOG_LEVEL)
+    _install_uvloop()
+
+    # Validate config before running any command that needs it
+    if command not in NO_CONFIG_COMMANDS:
+        validate_config()
 
     commands = {
         "test-sheets": cmd_test_sheets,
@@ -302,9 +298,9 @@ def main():
 
     if command == "import":
         if len(sys.argv) < 3:
-            print("Usage: python -m backend.main import <file_path>")
+            print("Usage: python -m backend.main import <file_path> [--no-cache]")
             sys.exit(1)
-        success = cmd_import(sys.argv[2])
+        success = cmd_import(sys.argv[2], use_cache="--no-cache" not in sys.argv[3:])
     elif command in commands:
         success = commands[command]()
     else:
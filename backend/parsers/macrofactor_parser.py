@@ -6,8 +6,13 @@ Handles three export formats:
   - Format C: Program Settings (goals/targets)
 """
 
-from typing import Optional
+from collections import defaultdict
+from itertools import islice
+from typing import BinaryIO, Optional
+
 from openpyxl import load_workbook
+from python_calamine import CalamineWorkbook
+
 from backend.utils.logger import get_logger
 from backend.utils.date_utils import normalize_date
 
@@ -21,23 +26,109 @@ CARBS_MAX = 1000
 FATS_MAX = 500
 FAT_PERCENT_MIN, FAT_PERCENT_MAX = 1.0, 60.0
 
+# Field → (low, high, warning template) for _validate_entry; unlisted fields are not range-checked
+VALIDATION_RANGES = {
+    "Weight_kg": (WEIGHT_MIN, WEIGHT_MAX, "Weight {value}kg outside range ({low}-{high})"),
+    "Calories": (CALORIES_MIN, CALORIES_MAX, "Calories {value} outside range ({low}-{high})"),
+    "Protein_g": (float("-inf"), PROTEIN_MAX, "Protein {value}g exceeds {high}g"),
+    "Fat_Percent": (FAT_PERCENT_MIN, FAT_PERCENT_MAX, "Fat% {value} outside range ({low}-{high})"),
+}
+
+# Column mappings per sheet: (header substring, field name).
+# A field maps to the first header containing its substring.
+QUICK_EXPORT_COLUMNS = (
+    ("date", "Date"),
+    ("expenditure", "Expenditure"),
+    ("trend weight", "Trend_Weight_kg"),
+    ("weight", "Weight_kg"),
+    ("steps", "Steps_MF"),  # MacroFactor steps (we prefer Oura, but store for reference)
+    ("calories", "Calories"),
+    ("protein", "Protein_g"),
+    ("fat", "Fats_g"),
+    ("carbs", "Carbs_g"),
+)
+DETAILED_MACROS_COLUMNS = (
+    ("date", "Date"),
+    ("calories", "Calories"),
+    ("protein", "Protein_g"),
+    ("fat", "Fats_g"),
+    ("carbs", "Carbs_g"),
+)
+DETAILED_WEIGHT_COLUMNS = (
+    ("date", "Date"),
+    ("weight", "Weight_kg"),
+    ("fat percent", "Fat_Percent"),
+)
+PROGRAM_SETTINGS_COLUMNS = (
+    ("program update date", "Update_Date"),
+    ("program weekday", "Weekday"),
+    ("calories", "Target_Calories"),
+    ("fat", "Target_Fats_g"),
+    ("protein", "Target_Protein_g"),
+    ("carbs", "Target_Carbs_g"),
+    ("expenditure", "Expenditure"),
+    ("weight", "Target_Weight_kg"),
+)
+
+# Numeric fields read from each daily sheet: (field, is_int).
+# Ints are truncated, floats rounded to one decimal.
+QUICK_EXPORT_FIELDS = (
+    ("Expenditure", True),
+    ("Trend_Weight_kg", False),
+    ("Weight_kg", False),
+    ("Calories", True),
+    ("Protein_g", False),
+    ("Fats_g", False),
+    ("Carbs_g", False),
+)
+DETAILED_MACROS_FIELDS = (
+    ("Calories", True),
+    ("Protein_g", False),
+    ("Fats_g", False),
+    ("Carbs_g", False),
+)
+DETAILED_WEIGHT_FIELDS = (
+    ("Weight_kg", False),
+    ("Fat_Percent", False),
+)
+
+# Cell values treated as "no data"
+_BLANK = frozenset((None, "", "N/A"))
+
+# Program Settings weekday (MacroFactor index 0–6 or name) → index into WEEKDAY_NAMES
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+WEEKDAY_TO_IDX = {
+    **{i: i for i in range(7)},
+    **{name.lower(): i for i, name in enumerate(WEEKDAY_NAMES)},
+}
+
 
 class MacroFactorParser:
     """Parse MacroFactor .xlsx exports into standardized data structures."""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str | BinaryIO, name: Optional[str] = None):
+        """
+        Args:
+            file_path: Path to the .xlsx file, or a binary file object (e.g. BytesIO).
+            name: Display name for logs (defaults to the path).
+        """
         self.file_path = file_path
+        self.name = name or str(file_path)
         self.workbook = None
+        self.sheet_names: list[str] = []
+        self._names_lower: dict[str, str] = {}  # lowercased sheet name → actual name
+        self.engine = None  # "calamine", or "openpyxl" when calamine can't read the file
         self.format_type = None
 
     def load(self):
         """Load the workbook and detect format."""
-        log.info("load", f"Loading file: {self.file_path}")
+        log.info("load", f"Loading file: {self.name}")
         try:
-            self.workbook = load_workbook(self.file_path, read_only=True, data_only=True)
-            sheet_names = self.workbook.sheetnames
-            log.info("load", f"Sheets found: {sheet_names}")
+            self._open_workbook()
+            sheet_names = self.sheet_names
+            log.info("load", f"Sheets found: {sheet_names} (engine: {self.engine})")
 
+            self._names_lower = {name.lower().strip(): name for name in sheet_names}
             self.format_type = self._detect_format(sheet_names)
             log.info("load", f"Detected format: {self.format_type}")
             return self
@@ -45,9 +136,29 @@ class MacroFactorParser:
             log.error("load", f"Failed to load file: {type(e).__name__}: {e}")
             raise ValueError(f"Could not open file: {e}")
 
+    def _open_workbook(self):
+        """
+        Open with the Rust-backed calamine reader (parses XLSX far faster than
+        openpyxl's pure-Python XML); fall back to openpyxl for files it rejects.
+        """
+        try:
+            if isinstance(self.file_path, str):
+                self.workbook = CalamineWorkbook.from_path(self.file_path)
+            else:
+                self.workbook = CalamineWorkbook.from_filelike(self.file_path)
+            self.sheet_names = self.workbook.sheet_names
+            self.engine = "calamine"
+        except Exception as e:
+            log.warning("load", f"calamine could not read file ({type(e).__name__}: {e}) — falling back to openpyxl")
+            if not isinstance(self.file_path, str):
+                self.file_path.seek(0)
+            self.workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+            self.sheet_names = self.workbook.sheetnames
+            self.engine = "openpyxl"
+
     def _detect_format(self, sheet_names: list[str]) -> str:
         """Detect which MacroFactor export format this file is."""
-        names_lower = [s.lower().strip() for s in sheet_names]
+        names_lower = self._names_lower or {s.lower().strip() for s in sheet_names}
 
         if any("quick export" in n for n in names_lower):
             return "quick_export"
@@ -97,20 +208,11 @@ class MacroFactorParser:
         daily_data = {}
 
         headers = self._read_headers(ws)
-        col_map = self._map_columns(headers, {
-            "date": "Date",
-            "expenditure": "Expenditure",
-            "trend weight": "Trend_Weight_kg",
-            "weight": "Weight_kg",
-            "steps": "Steps_MF",  # MacroFactor steps (we prefer Oura, but store for reference)
-            "calories": "Calories",
-            "protein": "Protein_g",
-            "fat": "Fats_g",
-            "carbs": "Carbs_g",
-        })
+        col_map = self._map_columns(headers, QUICK_EXPORT_COLUMNS)
+        extractors = self._extractors(col_map, QUICK_EXPORT_FIELDS)
 
         row_count = 0
-        for row in ws.iter_rows(min_row=2, values_only=True):
+        for row in self._iter_rows(ws, skip=1):
             if not row or not row[0]:
                 continue
 
@@ -119,13 +221,7 @@ class MacroFactorParser:
                 continue
 
             entry = {}
-            self._safe_set(entry, "Expenditure", row, col_map, int_type=True)
-            self._safe_set(entry, "Trend_Weight_kg", row, col_map, float_type=True)
-            self._safe_set(entry, "Weight_kg", row, col_map, float_type=True)
-            self._safe_set(entry, "Calories", row, col_map, int_type=True)
-            self._safe_set(entry, "Protein_g", row, col_map, float_type=True)
-            self._safe_set(entry, "Fats_g", row, col_map, float_type=True)
-            self._safe_set(entry, "Carbs_g", row, col_map, float_type=True)
+            self._extract(entry, row, extractors)
 
             # Validate
             entry = self._validate_entry(entry, date)
@@ -134,8 +230,7 @@ class MacroFactorParser:
                 daily_data[date] = entry
                 row_count += 1
 
-        dates = sorted(daily_data.keys())
-        date_range_str = f"{dates[0]}–{dates[-1]}" if dates else "none"
+        date_range_str = f"{min(daily_data)}–{max(daily_data)}" if daily_data else "none"
         summary = f"Quick Export: {row_count} days parsed ({date_range_str})"
         log.info("parse", f"SUCCESS — {summary}")
 
@@ -155,55 +250,13 @@ class MacroFactorParser:
         Sheet 2: Scale Weight — Date | Weight (kg) | Fat Percent
         """
         log.info("parse", "Parsing Detailed Export format")
-        daily_data = {}
-
-        # Parse Calories & Macros sheet
-        ws_macros = self._get_sheet_by_pattern("calories")
-        if ws_macros:
-            headers = self._read_headers(ws_macros)
-            col_map = self._map_columns(headers, {
-                "date": "Date",
-                "calories": "Calories",
-                "protein": "Protein_g",
-                "fat": "Fats_g",
-                "carbs": "Carbs_g",
-            })
-
-            for row in ws_macros.iter_rows(min_row=2, values_only=True):
-                if not row or not row[0]:
-                    continue
-                date = normalize_date(row[col_map.get("Date", 0)] if "Date" in col_map else row[0])
-                if not date:
-                    continue
-
-                entry = daily_data.get(date, {})
-                self._safe_set(entry, "Calories", row, col_map, int_type=True)
-                self._safe_set(entry, "Protein_g", row, col_map, float_type=True)
-                self._safe_set(entry, "Fats_g", row, col_map, float_type=True)
-                self._safe_set(entry, "Carbs_g", row, col_map, float_type=True)
-                daily_data[date] = entry
 
-        # Parse Scale Weight sheet
-        ws_weight = self._get_sheet_by_pattern("scale weight")
-        if ws_weight:
-            headers = self._read_headers(ws_weight)
-            col_map = self._map_columns(headers, {
-                "date": "Date",
-                "weight": "Weight_kg",
-                "fat percent": "Fat_Percent",
-            })
-
-            for row in ws_weight.iter_rows(min_row=2, values_only=True):
-                if not row or not row[0]:
-                    continue
-                date = normalize_date(row[col_map.get("Date", 0)] if "Date" in col_map else row[0])
-                if not date:
-                    continue
-
-                entry = daily_data.get(date, {})
-                self._safe_set(entry, "Weight_kg", row, col_map, float_type=True)
-                self._safe_set(entry, "Fat_Percent", row, col_map, float_type=True)
-                daily_data[date] = entry
+        # Each sheet parses into its own dict; weight fields are then merged into the macros days
+        daily_data = self._parse_daily_sheet("calories", DETAILED_MACROS_COLUMNS, DETAILED_MACROS_FIELDS)
+        for date, weight_entry in self._parse_daily_sheet(
+            "scale weight", DETAILED_WEIGHT_COLUMNS, DETAILED_WEIGHT_FIELDS
+        ).items():
+            daily_data[date].update(weight_entry)
 
         # Validate all entries
         validated = {}
@@ -212,10 +265,13 @@ class MacroFactorParser:
             if validated_entry:
                 validated[date] = validated_entry
 
-        dates = sorted(validated.keys())
-        date_range_str = f"{dates[0]}–{dates[-1]}" if dates else "none"
-        weight_count = sum(1 for d in validated.values() if d.get("Weight_kg"))
-        nutrition_count = sum(1 for d in validated.values() if d.get("Calories"))
+        date_range_str = f"{min(validated)}–{max(validated)}" if validated else "none"
+        weight_count = nutrition_count = 0
+        for d in validated.values():
+            if d.get("Weight_kg"):
+                weight_count += 1
+            if d.get("Calories"):
+                nutrition_count += 1
         summary = f"Detailed Export: {len(validated)} days ({date_range_str}), {nutrition_count} nutrition, {weight_count} weight entries"
         log.info("parse", f"SUCCESS — {summary}")
 
@@ -226,6 +282,26 @@ class MacroFactorParser:
             "summary": summary,
         }
 
+    def _parse_daily_sheet(self, pattern: str, columns: tuple, fields: tuple) -> defaultdict[str, dict]:
+        """Read one dated sheet into {date: {field: value}} (unvalidated); empty if the sheet is missing."""
+        daily_data = defaultdict(dict)
+        ws = self._get_sheet_by_pattern(pattern)
+        if not ws:
+            return daily_data
+        headers = self._read_headers(ws)
+        col_map = self._map_columns(headers, columns)
+        extractors = self._extractors(col_map, fields)
+
+        for row in self._iter_rows(ws, skip=1):
+            if not row or not row[0]:
+                continue
+            date = normalize_date(row[col_map.get("Date", 0)] if "Date" in col_map else row[0])
+            if not date:
+                continue
+
+            self._extract(daily_data[date], row, extractors)
+        return daily_data
+
     # ─── Format C: Program Settings ─────────────────────────────────
 
     def _parse_program_settings(self) -> dict:
@@ -238,20 +314,11 @@ class MacroFactorParser:
         ws = self._get_sheet_by_pattern("program settings")
         headers = self._read_headers(ws)
 
-        col_map = self._map_columns(headers, {
-            "program update date": "Update_Date",
-            "program weekday": "Weekday",
-            "calories": "Target_Calories",
-            "fat": "Target_Fats_g",
-            "protein": "Target_Protein_g",
-            "carbs": "Target_Carbs_g",
-            "expenditure": "Expenditure",
-            "weight": "Target_Weight_kg",
-        })
+        col_map = self._map_columns(headers, PROGRAM_SETTINGS_COLUMNS)
 
         # Collect all entries, keyed by (weekday, update_date)
         entries = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
+        for row in self._iter_rows(ws, skip=1):
             if not row or not row[0]:
                 continue
 
@@ -280,44 +347,35 @@ class MacroFactorParser:
 
             entries.append(entry)
 
-        # Get the most recent program update for each weekday
-        # Map weekday names to standard names
-        weekday_map = {
-            0: "Monday", 1: "Tuesday", 2: "Wednesday", 3: "Thursday",
-            4: "Friday", 5: "Saturday", 6: "Sunday",
-            "monday": "Monday", "tuesday": "Tuesday", "wednesday": "Wednesday",
-            "thursday": "Thursday", "friday": "Friday", "saturday": "Saturday",
-            "sunday": "Sunday",
-        }
-
-        latest_by_weekday = {}
+        # Get the most recent program update for each weekday (index 0 = Monday)
+        latest: list[Optional[dict]] = [None] * 7
         for entry in entries:
             weekday = entry["weekday"]
-            # Normalize weekday
             if isinstance(weekday, (int, float)):
-                weekday_name = weekday_map.get(int(weekday), f"Day_{int(weekday)}")
+                idx = WEEKDAY_TO_IDX.get(int(weekday))
             else:
-                weekday_name = weekday_map.get(str(weekday).lower().strip(), str(weekday))
+                idx = WEEKDAY_TO_IDX.get(str(weekday).lower().strip())
+            if idx is None:
+                continue  # Unrecognized weekday — never part of the goals output
 
-            if weekday_name not in latest_by_weekday or entry["update_date"] > latest_by_weekday[weekday_name]["update_date"]:
-                latest_by_weekday[weekday_name] = entry
-                latest_by_weekday[weekday_name]["weekday_name"] = weekday_name
+            current = latest[idx]
+            if current is None or entry["update_date"] > current["update_date"]:
+                latest[idx] = entry
 
         # Convert to goals format
-        goals_data = []
-        weekday_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        for day_name in weekday_order:
-            if day_name in latest_by_weekday:
-                e = latest_by_weekday[day_name]
-                goals_data.append({
-                    "Weekday": day_name,
-                    "Target_Calories": e.get("Target_Calories", ""),
-                    "Target_Protein_g": e.get("Target_Protein_g", ""),
-                    "Target_Carbs_g": e.get("Target_Carbs_g", ""),
-                    "Target_Fats_g": e.get("Target_Fats_g", ""),
-                    "Target_Weight_kg": e.get("Target_Weight_kg", ""),
-                    "Last_Updated": e.get("update_date", ""),
-                })
+        goals_data = [
+            {
+                "Weekday": WEEKDAY_NAMES[i],
+                "Target_Calories": e.get("Target_Calories", ""),
+                "Target_Protein_g": e.get("Target_Protein_g", ""),
+                "Target_Carbs_g": e.get("Target_Carbs_g", ""),
+                "Target_Fats_g": e.get("Target_Fats_g", ""),
+                "Target_Weight_kg": e.get("Target_Weight_kg", ""),
+                "Last_Updated": e.get("update_date", ""),
+            }
+            for i, e in enumerate(latest)
+            if e is not None
+        ]
 
         # Build summary
         if goals_data:
@@ -344,54 +402,66 @@ class MacroFactorParser:
     def _get_sheet_by_pattern(self, pattern: str):
         """Find a sheet whose name contains the pattern (case-insensitive)."""
         pattern_lower = pattern.lower()
-        for name in self.workbook.sheetnames:
-            if pattern_lower in name.lower():
-                return self.workbook[name]
-        return None
+        name = next((n for lower, n in self._names_lower.items() if pattern_lower in lower), None)
+        if name is None:
+            return None
+        if self.engine == "calamine":
+            return self.workbook.get_sheet_by_name(name)
+        return self.workbook[name]
 
-    @staticmethod
-    def _read_headers(ws) -> list[str]:
+    def _iter_rows(self, ws, skip: int = 0):
+        """
+        Yield each row as a sequence of cell values, skipping the first `skip` rows.
+        calamine reports empty cells as "" — they are mapped to None to match openpyxl.
+        """
+        if self.engine == "calamine":
+            for row in islice(ws.iter_rows(), skip, None):
+                yield [None if v == "" else v for v in row]
+        else:
+            yield from ws.iter_rows(min_row=skip + 1, values_only=True)
+
+    def _read_headers(self, ws) -> list[str]:
         """Read the first row as lowercase header strings."""
         headers = []
-        for cell in next(ws.iter_rows(min_row=1, max_row=1, values_only=True)):
+        for cell in next(self._iter_rows(ws), ()):
             headers.append(str(cell).lower().strip() if cell else "")
         return headers
 
     @staticmethod
-    def _map_columns(headers: list[str], mapping: dict[str, str]) -> dict[str, int]:
+    def _map_columns(headers: list[str], mapping: tuple[tuple[str, str], ...]) -> dict[str, int]:
         """
-        Map expected column patterns to their indices.
-        mapping: {pattern_substring: field_name}
+        Map expected column patterns to their indices in one pass over the headers.
+        mapping: ((pattern_substring, field_name), ...)
         Returns: {field_name: column_index}
         """
         col_map = {}
-        for pattern, field_name in mapping.items():
-            for i, header in enumerate(headers):
-                if pattern in header:
+        for i, header in enumerate(headers):
+            for pattern, field_name in mapping:
+                if field_name not in col_map and pattern in header:
                     col_map[field_name] = i
-                    break
+            if len(col_map) == len(mapping):
+                break
         return col_map
 
     @staticmethod
-    def _safe_set(entry: dict, field: str, row: tuple, col_map: dict,
-                  int_type: bool = False, float_type: bool = False):
-        """Safely extract a value from a row and set it in the entry dict."""
-        idx = col_map.get(field)
-        if idx is None or idx >= len(row):
-            return
-        value = row[idx]
-        if value is None or value == "" or value == "N/A":
-            return
+    def _extractors(col_map: dict[str, int], fields: tuple[tuple[str, bool], ...]) -> tuple:
+        """Resolve (field, is_int) specs to (field, column_index, is_int) once per sheet, dropping unmapped fields."""
+        return tuple((field, col_map[field], is_int) for field, is_int in fields if field in col_map)
 
-        try:
-            if int_type:
-                entry[field] = int(float(value))
-            elif float_type:
-                entry[field] = round(float(value), 1)
-            else:
-                entry[field] = value
-        except (ValueError, TypeError):
-            pass
+    @staticmethod
+    def _extract(entry: dict, row, extractors: tuple):
+        """Convert and set every non-blank numeric cell of a row into the entry dict."""
+        width = len(row)
+        for field, idx, is_int in extractors:
+            if idx >= width:
+                continue
+            value = row[idx]
+            if value in _BLANK:
+                continue
+            try:
+                entry[field] = int(float(value)) if is_int else round(float(value), 1)
+            except (ValueError, TypeError):
+                pass
 
     @staticmethod
     def _validate_entry(entry: dict, date: str) -> Optional[dict]:
@@ -403,36 +473,22 @@ class MacroFactorParser:
         for field, value in entry.items():
             if value is None:
                 continue
-
-            # Weight validation
-            if field == "Weight_kg" and isinstance(value, (int, float)):
-                if not (WEIGHT_MIN <= value <= WEIGHT_MAX):
-                    log.warning("validate", f"{date}: Weight {value}kg outside range ({WEIGHT_MIN}-{WEIGHT_MAX})")
-                    continue
-
-            # Calories validation
-            if field == "Calories" and isinstance(value, (int, float)):
-                if not (CALORIES_MIN <= value <= CALORIES_MAX):
-                    log.warning("validate", f"{date}: Calories {value} outside range ({CALORIES_MIN}-{CALORIES_MAX})")
-                    continue
-
-            # Protein validation
-            if field == "Protein_g" and isinstance(value, (int, float)):
-                if value > PROTEIN_MAX:
-                    log.warning("validate", f"{date}: Protein {value}g exceeds {PROTEIN_MAX}g")
-                    continue
-
-            # Fat Percent validation
-            if field == "Fat_Percent" and isinstance(value, (int, float)):
-                if not (FAT_PERCENT_MIN <= value <= FAT_PERCENT_MAX):
-                    log.warning("validate", f"{date}: Fat% {value} outside range ({FAT_PERCENT_MIN}-{FAT_PERCENT_MAX})")
-                    continue
-
+            rng = VALIDATION_RANGES.get(field)
+            if rng is not None and isinstance(value, (int, float)) and not (rng[0] <= value <= rng[1]):
+                log.warning("validate", "%s: %s", date, rng[2].format(value=value, low=rng[0], high=rng[1]))
+                continue
             validated[field] = value
 
         return validated if validated else None
 
     def close(self):
-        """Close the workbook."""
+        """Close the workbook (releases the underlying file handle)."""
         if self.workbook:
             self.workbook.close()
+            self.workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
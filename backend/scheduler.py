@@ -10,24 +10,51 @@ Schedule (Europe/Sofia):
 """
 
 import asyncio
+import random
+from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import pytz
+from telegram.error import BadRequest, NetworkError, RetryAfter
 
+from backend.clients.oura_client import OuraClient
+from backend.clients.sheets_client import SheetsClient
 from backend.config import TIMEZONE, TELEGRAM_USER_ID
+from backend.services.alert_service import AlertService, ALERT_LOOKBACK_DAYS
+from backend.services.summary_service import SummaryService
+from backend.services.sync_service import SyncService
+from backend.utils.date_utils import lookback_dates
 from backend.utils.logger import get_logger
 
 log = get_logger("SCHEDULER")
 
-SOFIA_TZ = pytz.timezone(TIMEZONE)
+SOFIA_TZ = ZoneInfo(TIMEZONE)
 
-# Delay between sequential jobs (seconds) — avoids Google Sheets rate limiting
-JOB_DELAY = 5
+# Applied to every job: runs missed while the process was down collapse into
+# one late run (within 30 min) instead of firing back-to-back on wake-up
+JOB_DEFAULTS = {"coalesce": True, "misfire_grace_time": 1800, "max_instances": 1}
+
+# Telegram send retries for flood control / transient network errors
+NOTIFY_MAX_RETRIES = 4
+NOTIFY_RETRY_MAX_DELAY = 30  # seconds
+
+# Between alerts combined into one Telegram message
+ALERT_SEPARATOR = "\n\n———\n\n"
 
 
 class HealthScheduler:
-    """Manages all scheduled health-data jobs."""
+    """
+    Manages all scheduled health-data jobs.
+
+    Jobs run their steps back-to-back: SheetsClient paces every request against
+    the per-minute read/write quotas, so no fixed delay is needed between steps.
+    """
+
+    # Triggers are stateless, so one instance per schedule is shared by every setup_jobs() call
+    MORNING_TRIGGER = CronTrigger(hour=10, minute=0, timezone=SOFIA_TZ)
+    EVENING_TRIGGER = CronTrigger(hour=18, minute=0, timezone=SOFIA_TZ)
+    MIDNIGHT_TRIGGER = CronTrigger(hour=0, minute=0, timezone=SOFIA_TZ)
+    WEEKLY_AI_TRIGGER = CronTrigger(day_of_week="sun", hour=10, minute=0, timezone=SOFIA_TZ)
 
     def __init__(self, bot=None):
         """
@@ -42,24 +69,47 @@ class HealthScheduler:
     # ─── Shared Resources ────────────────────────────────────────────
 
     def _get_sheets(self):
-        """Lazy-load a shared SheetsClient."""
+        """
+        Shared SheetsClient, connected by start() before any job can run.
+        Only connects here if that failed (e.g. Sheets was unreachable at startup).
+        """
         if self._sheets is None:
-            from backend.clients.sheets_client import SheetsClient
             self._sheets = SheetsClient()
             self._sheets.connect()
         return self._sheets
 
     async def _send_notification(self, message: str, parse_mode: str = "Markdown"):
-        """Send a Telegram notification to the user."""
-        if self.bot and TELEGRAM_USER_ID:
+        """
+        Send a Telegram notification to the user.
+        Flood control (honoring retry_after) and network errors are retried with backoff.
+        """
+        if not (self.bot and TELEGRAM_USER_ID):
+            return
+        for attempt in range(1, NOTIFY_MAX_RETRIES + 1):
             try:
                 await self.bot.send_message(
                     chat_id=TELEGRAM_USER_ID,
                     text=message,
                     parse_mode=parse_mode,
                 )
+                return
+            except BadRequest as e:
+                # Subclass of NetworkError, but resending the same message cannot help
+                log.error("notification", f"Failed to send Telegram notification: {e}")
+                return
+            except (RetryAfter, NetworkError) as e:
+                if attempt == NOTIFY_MAX_RETRIES:
+                    log.error("notification", f"Failed to send Telegram notification after {attempt} attempts: {e}")
+                    return
+                if isinstance(e, RetryAfter):
+                    delay = float(e.retry_after)
+                else:
+                    delay = min(NOTIFY_RETRY_MAX_DELAY, 2 ** (attempt - 1)) + random.random()
+                log.warning("notification", f"{type(e).__name__}: {e}. Retry {attempt}/{NOTIFY_MAX_RETRIES} in {delay:.1f}s")
+                await asyncio.sleep(delay)
             except Exception as e:
                 log.error("notification", f"Failed to send Telegram notification: {e}")
+                return
 
     # ─── Scheduled Jobs ──────────────────────────────────────────────
 
@@ -67,12 +117,8 @@ class HealthScheduler:
         """10:00 — sync_oura → check_alerts → update_weekly_summary"""
         log.info("job", "START — Morning sync (10:00)")
         try:
-            await self._run_oura_sync()
-            await asyncio.sleep(JOB_DELAY)
-
-            await self._run_alerts(check_nutrition=False)
-            await asyncio.sleep(JOB_DELAY)
-
+            snapshot = await self._run_oura_sync()
+            await self._run_alerts(check_nutrition=False, preloaded=snapshot)
             await self._run_weekly_summary()
 
             log.info("job", "SUCCESS — Morning sync complete")
@@ -84,10 +130,8 @@ class HealthScheduler:
         """18:00 — sync_oura → check_alerts (include missing nutrition check)"""
         log.info("job", "START — Evening sync (18:00)")
         try:
-            await self._run_oura_sync()
-            await asyncio.sleep(JOB_DELAY)
-
-            await self._run_alerts(check_nutrition=True)
+            snapshot = await self._run_oura_sync()
+            await self._run_alerts(check_nutrition=True, preloaded=snapshot)
 
             log.info("job", "SUCCESS — Evening sync complete")
         except Exception as e:
@@ -99,8 +143,6 @@ class HealthScheduler:
         log.info("job", "START — Midnight sync (00:00)")
         try:
             await self._run_oura_sync()
-            await asyncio.sleep(JOB_DELAY)
-
             await self._run_weekly_summary()
 
             log.info("job", "SUCCESS — Midnight sync complete")
@@ -112,7 +154,6 @@ class HealthScheduler:
         """Sunday 10:00 — generate and send AI weekly summary"""
         log.info("job", "START — Weekly AI summary (Sunday)")
         try:
-            from backend.services.summary_service import SummaryService
             sheets = self._get_sheets()
             summary_svc = SummaryService(sheets)
 
@@ -134,41 +175,44 @@ class HealthScheduler:
 
     # ─── Job Helpers ─────────────────────────────────────────────────
 
-    async def _run_oura_sync(self):
-        """Execute Oura → Google Sheets sync (7-day lookback)."""
-        from backend.clients.oura_client import OuraClient
-        from backend.services.sync_service import SyncService
-
+    async def _run_oura_sync(self) -> list[dict] | None:
+        """
+        Execute Oura → Google Sheets sync (7-day lookback).
+        Returns the post-write Daily Log rows when they cover the alert window, else None.
+        """
         sheets = self._get_sheets()
         oura = OuraClient()
         sync = SyncService(sheets, oura)
 
-        result = sync.sync_oura()  # Uses default 7-day lookback
+        # Blocking I/O runs in a worker thread so the bot keeps answering meanwhile
+        result = await asyncio.to_thread(sync.sync_oura)  # Uses default 7-day lookback
 
         if result["errors"]:
             raise RuntimeError(f"Oura sync errors: {result['errors']}")
 
         log.info("oura_sync", f"Synced {result['days_updated']} days ({result['start_date']} → {result['end_date']})")
 
-    async def _run_alerts(self, check_nutrition: bool = False):
-        """Execute alert checks and send triggered alerts via Telegram."""
-        from backend.services.alert_service import AlertService
+        if result["start_date"] <= lookback_dates(ALERT_LOOKBACK_DAYS)[0]:
+            return result["post_state"]
+        return None
 
+    async def _run_alerts(self, check_nutrition: bool = False, preloaded: list[dict] | None = None):
+        """Execute alert checks and send triggered alerts via Telegram."""
         sheets = self._get_sheets()
         alert_svc = AlertService(sheets)
-        alerts = alert_svc.check_alerts(check_nutrition=check_nutrition)
+        alerts = await asyncio.to_thread(
+            alert_svc.check_alerts, check_nutrition=check_nutrition, preloaded=preloaded,
+        )
 
-        for alert in alerts:
-            await self._send_notification(alert["message"])
-            await asyncio.sleep(1)  # Small delay between alert messages
+        # Alerts from one check go out as a single message: one send, no pacing needed
+        if alerts:
+            await self._send_notification(ALERT_SEPARATOR.join(a["message"] for a in alerts))
 
     async def _run_weekly_summary(self):
         """Execute weekly summary recalculation."""
-        from backend.services.summary_service import SummaryService
-
         sheets = self._get_sheets()
         summary_svc = SummaryService(sheets)
-        summary_svc.update_all_weekly_summaries()
+        await asyncio.to_thread(summary_svc.update_all_weekly_summaries)
 
     # ─── Lifecycle ───────────────────────────────────────────────────
 
@@ -177,37 +221,41 @@ class HealthScheduler:
         # 10:00 — Morning sync
         self.scheduler.add_job(
             self.job_morning_sync,
-            CronTrigger(hour=10, minute=0, timezone=SOFIA_TZ),
+            self.MORNING_TRIGGER,
             id="morning_sync",
             name="Morning Sync (10:00)",
             replace_existing=True,
+            **JOB_DEFAULTS,
         )
 
         # 18:00 — Evening sync
         self.scheduler.add_job(
             self.job_evening_sync,
-            CronTrigger(hour=18, minute=0, timezone=SOFIA_TZ),
+            self.EVENING_TRIGGER,
             id="evening_sync",
             name="Evening Sync (18:00)",
             replace_existing=True,
+            **JOB_DEFAULTS,
         )
 
         # 00:00 — Midnight sync
         self.scheduler.add_job(
             self.job_midnight_sync,
-            CronTrigger(hour=0, minute=0, timezone=SOFIA_TZ),
+            self.MIDNIGHT_TRIGGER,
             id="midnight_sync",
             name="Midnight Sync (00:00)",
             replace_existing=True,
+            **JOB_DEFAULTS,
         )
 
         # Sunday 10:00 — AI Weekly Summary
         self.scheduler.add_job(
             self.job_weekly_ai_summary,
-            CronTrigger(day_of_week="sun", hour=10, minute=0, timezone=SOFIA_TZ),
+            self.WEEKLY_AI_TRIGGER,
             id="weekly_ai_summary",
             name="Weekly AI Summary (Sun 10:00)",
             replace_existing=True,
+            **JOB_DEFAULTS,
         )
 
         log.info("setup", "Scheduled 4 jobs:")
@@ -217,6 +265,11 @@ class HealthScheduler:
 
     def start(self):
         """Start the scheduler."""
+        # Connect once up front so jobs never pay the OAuth/metadata round-trips
+        try:
+            self._get_sheets()
+        except Exception as e:
+            log.warning("start", f"Sheets not reachable yet, jobs will connect on first run: {e}")
         self.setup_jobs()
         self.scheduler.start()
         log.info("start", "Scheduler started")
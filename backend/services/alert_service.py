@@ -10,18 +10,35 @@ Alert Rules:
 Deduplication: tracks sent alerts per day to avoid repeats.
 """
 
-import json
+import os
+import tempfile
+import threading
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
 
+import orjson
+
 from backend.clients.sheets_client import SheetsClient
 from backend.utils.logger import get_logger
 from backend.utils.date_utils import today_sofia, lookback_dates, date_range
+from backend.utils.value_utils import TRUTHY, safe_float
 
 log = get_logger("ALERTS")
 
+# Days of Daily Log history the rules look at
+ALERT_LOOKBACK_DAYS = 7
+
 # Simple file-based cache to track which alerts were sent today
 ALERTS_CACHE_FILE = Path(__file__).resolve().parent.parent.parent / ".alerts_cache.json"
 
+# In-memory copy of ALERTS_CACHE_FILE — loaded once per process, written back on change
+_cache: dict | None = None
+_cache_lock = threading.RLock()
+
+# Sort key for Daily Log rows (every row in the window has a Date)
+_date_key = itemgetter("Date")
+
 
 class AlertService:
     """Evaluates health alert rules against recent Daily Log data."""
@@ -29,47 +46,44 @@ class AlertService:
     def __init__(self, sheets_client: SheetsClient):
         self.sheets = sheets_client
 
-    def check_alerts(self, check_nutrition: bool = False) -> list[dict]:
+    def check_alerts(self, check_nutrition: bool = False,
+                     preloaded: list[dict] | None = None) -> list[dict]:
         """
-        Evaluate all alert rules against the last 7 days of data.
+        Evaluate all alert rules against the last ALERT_LOOKBACK_DAYS days of data.
 
         Args:
             check_nutrition: Whether to include the missing-nutrition check
                              (intended for the 18:00 evening run).
+            preloaded: Daily Log rows covering at least the lookback window
+                       (e.g. SyncService's post-write snapshot) — skips the Sheets read.
 
         Returns:
             List of triggered alert dicts with keys: id, severity, title, message.
         """
         log.info("check", "START — Evaluating alert rules")
 
-        start_date, end_date = lookback_dates(7)
-        data = self.sheets.get_daily_data_for_range(start_date, end_date)
+        start_date, end_date = lookback_dates(ALERT_LOOKBACK_DAYS)
+        if preloaded is not None:
+            data = [r for r in preloaded if start_date <= r.get("Date", "") <= end_date]
+        else:
+            data = self.sheets.get_daily_data_for_range(start_date, end_date)
 
         if not data:
             log.info("check", "No data in last 7 days — skipping alerts")
             return []
 
         today = today_sofia()
-        triggered: list[dict] = []
-
-        # ── HRV Drop ────────────────────────────────────────────────
-        alert = self._check_hrv_drop(data, today)
-        if alert:
-            triggered.append(alert)
-
-        # ── Sleep Score Drop ─────────────────────────────────────────
-        alert = self._check_sleep_drop(data, today)
-        if alert:
-            triggered.append(alert)
+        # Sorted once here; the rules rely on date order (data may be a cached list — not sorted in place)
+        cols = _alert_columns(sorted(data, key=_date_key))
+        # Row index per date — today's row is located once, not by each rule
+        by_date = {d: i for i, d in enumerate(cols["date"])}
+        today_idx = by_date.get(today)
+        if today_idx is None:
+            log.info("check", f"No row for {today} yet (Oura not synced) — skipping HRV/sleep rules")
 
-        # ── Weight Spike ─────────────────────────────────────────────
-        alert = self._check_weight_spike(data)
-        if alert:
-            triggered.append(alert)
-
-        # ── Missing Nutrition (evening only) ─────────────────────────
-        if check_nutrition:
-            alert = self._check_missing_nutrition(data)
+        triggered: list[dict] = []
+        for rule in self._relevant_rules(today_idx, check_nutrition):
+            alert = rule(cols)
             if alert:
                 triggered.append(alert)
 
@@ -82,22 +96,35 @@ class AlertService:
         log.info("check", f"SUCCESS — {len(triggered)} alert(s) triggered")
         return triggered
 
+    def _relevant_rules(self, today_idx: int | None, check_nutrition: bool) -> list:
+        """
+        Rules worth running for this check, each called as rule(cols).
+        HRV/sleep compare today's values, so they are skipped when today has no row;
+        weight and nutrition look at history and always run.
+        """
+        rules = []
+        if today_idx is not None:
+            rules.append(partial(self._check_hrv_drop, today_idx=today_idx))
+            rules.append(partial(self._check_sleep_drop, today_idx=today_idx))
+        rules.append(self._check_weight_spike)
+        if check_nutrition:  # Evening only
+            rules.append(self._check_missing_nutrition)
+        return rules
+
     # ─── Individual Alert Rules ──────────────────────────────────────
+    # Each rule takes the parsed columns from _alert_columns() (one list per field,
+    # index-aligned with "date", in date order) so no rule re-parses or re-sorts.
 
-    def _check_hrv_drop(self, data: list[dict], today: str) -> dict | None:
+    def _check_hrv_drop(self, cols: dict[str, list], today_idx: int) -> dict | None:
         """HRV Drop: Today's HRV < 85% of 7-day average."""
-        hrv_values = []
-        today_hrv = None
-
-        for row in data:
-            hrv = _safe_float(row.get("HRV_Balance"))
-            if hrv is not None:
-                hrv_values.append(hrv)
-                if row.get("Date") == today:
-                    today_hrv = hrv
-
-        # Need today's value and at least 3 days of history
-        if today_hrv is None or len(hrv_values) < 3:
+        # Need today's value...
+        today_hrv = cols["hrv"][today_idx]
+        if today_hrv is None:
+            return None
+
+        # ...and at least 3 days of history
+        hrv_values = [hrv for hrv in cols["hrv"] if hrv is not None]
+        if len(hrv_values) < 3:
             return None
 
         avg_hrv = sum(hrv_values) / len(hrv_values)
@@ -117,62 +144,53 @@ class AlertService:
             }
         return None
 
-    def _check_sleep_drop(self, data: list[dict], today: str) -> dict | None:
+    def _check_sleep_drop(self, cols: dict[str, list], today_idx: int) -> dict | None:
         """Sleep Score Drop: Sleep score < 60."""
-        for row in data:
-            if row.get("Date") == today:
-                score = _safe_int(row.get("Sleep_Score"))
-                if score is not None and score < 60:
-                    return {
-                        "id": "sleep_drop",
-                        "severity": "🔴",
-                        "title": "Low Sleep Score",
-                        "message": (
-                            f"🔴 *Low Sleep Score*\n\n"
-                            f"Today's sleep score: *{score}* (below 60 threshold)."
-                        ),
-                    }
+        score = cols["sleep_score"][today_idx]
+        if score is not None and score < 60:
+            return {
+                "id": "sleep_drop",
+                "severity": "🔴",
+                "title": "Low Sleep Score",
+                "message": (
+                    f"🔴 *Low Sleep Score*\n\n"
+                    f"Today's sleep score: *{score}* (below 60 threshold)."
+                ),
+            }
         return None
 
-    def _check_weight_spike(self, data: list[dict]) -> dict | None:
+    def _check_weight_spike(self, cols: dict[str, list]) -> dict | None:
         """Weight Spike: Weight change > 1.5kg vs previous day."""
-        # Collect all days with weight, sorted by date
-        weight_entries = []
-        for row in sorted(data, key=lambda r: r.get("Date", "")):
-            w = _safe_float(row.get("Weight_kg"))
-            if w is not None:
-                weight_entries.append({"date": row.get("Date"), "weight": w})
+        # All days with weight, in date order
+        weight_entries = [(date, w) for date, w in zip(cols["date"], cols["weight"]) if w is not None]
 
         if len(weight_entries) < 2:
             return None
 
-        latest = weight_entries[-1]
-        previous = weight_entries[-2]
-        change = abs(latest["weight"] - previous["weight"])
+        prev_date, prev_weight = weight_entries[-2]
+        latest_date, latest_weight = weight_entries[-1]
+        change = abs(latest_weight - prev_weight)
 
         if change > 1.5:
-            direction = "⬆️" if latest["weight"] > previous["weight"] else "⬇️"
-            sign = "+" if latest["weight"] > previous["weight"] else "-"
+            direction = "⬆️" if latest_weight > prev_weight else "⬇️"
+            sign = "+" if latest_weight > prev_weight else "-"
             return {
                 "id": "weight_spike",
                 "severity": "🟡",
                 "title": "Weight Spike",
                 "message": (
                     f"🟡 *Weight Spike Alert*\n\n"
-                    f"{direction} {latest['date']}: *{latest['weight']}kg* "
-                    f"({sign}{change:.1f}kg from {previous['date']}: {previous['weight']}kg)"
+                    f"{direction} {latest_date}: *{latest_weight}kg* "
+                    f"({sign}{change:.1f}kg from {prev_date}: {prev_weight}kg)"
                 ),
             }
         return None
 
-    def _check_missing_nutrition(self, data: list[dict]) -> dict | None:
+    def _check_missing_nutrition(self, cols: dict[str, list]) -> dict | None:
         """No Nutrition Logged: 2+ consecutive days without nutrition data."""
-        sorted_data = sorted(data, key=lambda r: r.get("Date", ""), reverse=True)
-
         consecutive_missing = 0
-        for row in sorted_data:
-            logged = row.get("Nutrition_Logged", "FALSE")
-            if logged in ("TRUE", "true", True):
+        for logged in reversed(cols["nutrition_logged"]):  # Newest first
+            if logged:
                 break
             consecutive_missing += 1
 
@@ -193,8 +211,7 @@ class AlertService:
 
     def _filter_already_sent(self, alerts: list[dict], today: str) -> list[dict]:
         """Remove alerts that were already sent today."""
-        cache = _load_cache()
-        sent_today = cache.get(today, [])
+        sent_today = _get_cache().get(today, [])
         return [a for a in alerts if a["id"] not in sent_today]
 
     def _mark_sent(self, alerts: list[dict], today: str):
@@ -202,31 +219,37 @@ class AlertService:
         if not alerts:
             return
 
-        cache = _load_cache()
-        if today not in cache:
-            cache[today] = []
-
-        for a in alerts:
-            if a["id"] not in cache[today]:
-                cache[today].append(a["id"])
+        with _cache_lock:
+            cache = _get_cache()
+            sent_today = cache.setdefault(today, [])
+            for a in alerts:
+                if a["id"] not in sent_today:
+                    sent_today.append(a["id"])
 
-        # Prune old entries — keep only last 7 days
-        start_date, _ = lookback_dates(7)
-        valid_dates = set(date_range(start_date, today))
-        cache = {k: v for k, v in cache.items() if k in valid_dates}
+            # Prune old entries — keep only last 7 days
+            start_date, _ = lookback_dates(7)
+            valid_dates = set(date_range(start_date, today))
+            for k in [k for k in cache if k not in valid_dates]:
+                del cache[k]
 
-        _save_cache(cache)
+            _save_cache(cache)
 
 
 # ─── Helpers ─────────────────────────────────────────────────────────
 
-def _safe_float(value) -> float | None:
-    if value is None or value == "":
-        return None
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
+def _alert_columns(data: list[dict]) -> dict[str, list]:
+    """
+    Parse the fields the alert rules need in one pass over the rows.
+    Returns one list per field, all index-aligned with "date".
+    """
+    cols = {"date": [], "hrv": [], "sleep_score": [], "weight": [], "nutrition_logged": []}
+    for row in data:
+        cols["date"].append(row.get("Date", ""))
+        cols["hrv"].append(safe_float(row.get("HRV_Balance")))
+        cols["sleep_score"].append(_safe_int(row.get("Sleep_Score")))
+        cols["weight"].append(safe_float(row.get("Weight_kg")))
+        cols["nutrition_logged"].append(row.get("Nutrition_Logged") in TRUTHY)
+    return cols
 
 
 def _safe_int(value) -> int | None:
@@ -238,11 +261,21 @@ def _safe_int(value) -> int | None:
         return None
 
 
+def _get_cache() -> dict:
+    """The alerts-sent cache, read from disk on first use and kept in memory after."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _load_cache()
+    return _cache
+
+
 def _load_cache() -> dict:
     """Load the alerts-sent cache from disk."""
     try:
         if ALERTS_CACHE_FILE.exists():
-            return json.loads(ALERTS_CACHE_FILE.read_text())
+            return orjson.loads(ALERTS_CACHE_FILE.read_bytes())
     except Exception:
         pass
     return {}
@@ -251,6 +284,10 @@ def _load_cache() -> dict:
 def _save_cache(cache: dict):
     """Save the alerts-sent cache to disk."""
     try:
-        ALERTS_CACHE_FILE.write_text(json.dumps(cache, indent=2))
+        # Write-then-rename so a crash mid-write never leaves a truncated file
+        fd, tmp = tempfile.mkstemp(dir=ALERTS_CACHE_FILE.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(cache))
+        os.replace(tmp, ALERTS_CACHE_FILE)
     except Exception as e:
         log.warning("cache", f"Could not save alerts cache: {e}")
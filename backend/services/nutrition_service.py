@@ -3,14 +3,50 @@ Nutrition service — handles MacroFactor import and manual text input.
 Upserts nutrition data to Google Sheets Daily Log (columns B–I only).
 """
 
-from typing import Optional
+import hashlib
+import io
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import orjson
 
 from backend.clients.sheets_client import SheetsClient
+from backend.config import CACHE_DIR
 from backend.parsers.macrofactor_parser import MacroFactorParser
 from backend.utils.logger import get_logger
 
 log = get_logger("NUTRITION")
 
+# Parsed MacroFactor files, keyed by content hash — re-sent files skip parsing
+PARSE_CACHE_DIR = CACHE_DIR / "macrofactor"
+# Bump when the parser's output changes so stale results are not reused
+PARSE_CACHE_VERSION = 1
+# Cached parse results older than this are pruned (seconds)
+PARSE_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# Accepted import file sizes — anything outside is rejected before parsing
+MIN_IMPORT_BYTES = 1024
+MAX_IMPORT_BYTES = 25 * 1024 * 1024
+# .xlsx files are zip archives
+XLSX_SIGNATURE = b"PK\x03\x04"
+
+# Locale-independent month names for confirmation messages
+MONTH_ABBR = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+              "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Manual text entry fields after the date, in input order: (field, is_int)
+MANUAL_FIELDS = (
+    ("weight", False),
+    ("protein", False),
+    ("carbs", False),
+    ("fats", False),
+    ("calories", True),
+)
+
 
 class NutritionService:
     """Handles nutrition data import from MacroFactor and manual input."""
@@ -18,12 +54,22 @@ class NutritionService:
     def __init__(self, sheets_client: SheetsClient):
         self.sheets = sheets_client
 
-    def import_macrofactor_file(self, file_path: str) -> dict:
+    def import_macrofactor_file(self, file_path: str, use_cache: bool = True) -> dict:
+        """Parse a MacroFactor .xlsx export from disk and upsert it. See _import_macrofactor()."""
+        return self._import_macrofactor(file_path, file_path, use_cache)
+
+    def import_macrofactor_fileobj(self, fileobj: BinaryIO, name: str = "upload.xlsx") -> dict:
+        """Parse an in-memory MacroFactor .xlsx export (e.g. a BytesIO) and upsert it."""
+        return self._import_macrofactor(fileobj, name)
+
+    def _import_macrofactor(self, source: str | BinaryIO, name: str, use_cache: bool = True) -> dict:
         """
         Parse a MacroFactor .xlsx export and upsert the data into Google Sheets.
 
         Args:
-            file_path: Path to the .xlsx file
+            source: Path to the .xlsx file, or a binary file object
+            name: File name for logs
+            use_cache: Reuse the parse result of an identical file imported before
 
         Returns:
             {
@@ -36,7 +82,7 @@ class NutritionService:
                 "goals_updated": bool,
             }
         """
-        log.info("import_file", f"START — Processing MacroFactor file: {file_path}")
+        log.info("import_file", f"START — Processing MacroFactor file: {name}")
 
         result = {
             "success": False,
@@ -49,9 +95,7 @@ class NutritionService:
         }
 
         try:
-            parser = MacroFactorParser(file_path)
-            parser.load()
-            parsed = parser.parse()
+            parsed = _parse_file(source, name, use_cache)
             result["format"] = parsed["format"]
 
             if parsed["format"] == "program_settings":
@@ -80,18 +124,16 @@ class NutritionService:
                     log.warning("import_file", result["message"])
                     return result
 
-                # Count nutrition and weight entries before upserting
-                nutrition_count = sum(
-                    1 for d in daily_data.values()
-                    if d.get("Calories") or d.get("Protein_g")
-                )
-                weight_count = sum(
-                    1 for d in daily_data.values()
-                    if d.get("Weight_kg")
-                )
+                # Date-sorted (date, data) pairs, counted in the same pass
+                rows = sorted(daily_data.items())
+                nutrition_count = weight_count = 0
+                for _, d in rows:
+                    if d.get("Calories") or d.get("Protein_g"):
+                        nutrition_count += 1
+                    if d.get("Weight_kg"):
+                        weight_count += 1
 
                 # Upsert to Google Sheets
-                rows = [(date_str, data) for date_str, data in sorted(daily_data.items())]
                 success_count = self.sheets.upsert_daily_rows_batch(rows, source="nutrition")
 
                 result["success"] = True
@@ -99,14 +141,12 @@ class NutritionService:
                 result["nutrition_count"] = nutrition_count
                 result["weight_count"] = weight_count
 
-                dates = sorted(daily_data.keys())
-                date_range = f"{dates[0]}–{dates[-1]}" if dates else "?"
+                date_range = f"{rows[0][0]}–{rows[-1][0]}" if rows else "?"  # rows are date-sorted
                 result["message"] = (
                     f"✅ Imported {success_count} days of data ({date_range}).\n"
                     f"Updated: {nutrition_count} nutrition entries, {weight_count} weight entries."
                 )
 
-            parser.close()
             log.info("import_file", f"SUCCESS — {result['message']}")
 
         except ValueError as e:
@@ -177,10 +217,9 @@ class NutritionService:
             if calories is not None:
                 parts.append(f"{calories}cal")
 
-            # Format the date nicely
-            from datetime import datetime
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-            nice_date = dt.strftime("%b %-d")
+            # Format the date nicely, e.g. "Feb 9"
+            year, month, day = date_str.split("-")
+            nice_date = f"{MONTH_ABBR[int(month) - 1]} {int(day)}"
 
             result["message"] = f"✅ {nice_date} — {' | '.join(parts)}"
             log.info("manual_entry", f"SUCCESS — {result['message']}")
@@ -211,29 +250,86 @@ class NutritionService:
             )
 
         date_str = parts[0]
-        # Validate date format
+        # Validate date format (fromisoformat alone also accepts compact forms like 20260209)
         try:
-            from datetime import datetime
-            datetime.strptime(date_str, "%Y-%m-%d")
+            if len(date_str) != 10 or date_str[4] != "-" or date_str[7] != "-":
+                raise ValueError
+            date.fromisoformat(date_str)
         except ValueError:
             raise ValueError(f"Invalid date format: '{date_str}'. Use YYYY-MM-DD.")
 
-        def parse_val(val, is_int=False):
-            if val == "-":
-                return None
-            try:
-                return int(float(val)) if is_int else float(val)
-            except ValueError:
-                return None
-
         result = {"date": date_str}
-        fields = ["weight", "protein", "carbs", "fats", "calories"]
-        is_int = [False, False, False, False, True]
-
-        for i, field in enumerate(fields):
-            if i + 1 < len(parts):
-                result[field] = parse_val(parts[i + 1], is_int=is_int[i])
-            else:
-                result[field] = None
+        values = parts[1:]
+        for i, (field, is_int) in enumerate(MANUAL_FIELDS):
+            result[field] = _parse_manual_value(values[i], is_int) if i < len(values) else None
 
         return result
+
+
+def _parse_manual_value(val: str, is_int: bool):
+    """One manual-entry token as a number; '-' (skip) or junk gives None."""
+    if val == "-":
+        return None
+    try:
+        return int(float(val)) if is_int else float(val)
+    except ValueError:
+        return None
+
+
+# ─── Parse Cache ─────────────────────────────────────────────────────
+
+def check_import_size(size: int):
+    """Raise ValueError if an import file is implausibly small or too large to parse safely."""
+    if size < MIN_IMPORT_BYTES:
+        raise ValueError(f"file is too small ({size} bytes) to be a MacroFactor export")
+    if size > MAX_IMPORT_BYTES:
+        raise ValueError(f"file is too large ({size / 1024 / 1024:.1f} MB, max {MAX_IMPORT_BYTES // 1024 // 1024} MB)")
+
+
+def _parse_file(source: str | BinaryIO, name: str, use_cache: bool) -> dict:
+    """Parse a MacroFactor file, reusing a cached result for identical file contents."""
+    if isinstance(source, str):
+        content = Path(source).read_bytes()
+    else:
+        content = source.read()
+    check_import_size(len(content))
+    if not content.startswith(XLSX_SIGNATURE):
+        raise ValueError("not an .xlsx file (missing zip signature)")
+    cache_path = PARSE_CACHE_DIR / f"{hashlib.sha1(content).hexdigest()}-v{PARSE_CACHE_VERSION}.json"
+
+    if use_cache:
+        try:
+            parsed = orjson.loads(cache_path.read_bytes())
+            log.info("import_file", f"CACHE HIT — {name} was parsed before ({parsed['summary']})")
+            return parsed
+        except FileNotFoundError:
+            pass
+        except (OSError, orjson.JSONDecodeError, KeyError) as e:
+            log.warning("import_file", f"Unreadable parse cache entry {cache_path.name}: {e}")
+
+    with MacroFactorParser(io.BytesIO(content), name=name) as parser:
+        parser.load()
+        parsed = parser.parse()
+
+    try:
+        PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _prune_parse_cache()
+        # Write-then-rename so a concurrent reader never sees a partial file
+        fd, tmp = tempfile.mkstemp(dir=PARSE_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(parsed))
+        os.replace(tmp, cache_path)
+    except (OSError, orjson.JSONEncodeError) as e:
+        log.warning("import_file", f"Could not write parse cache entry: {e}")
+    return parsed
+
+
+def _prune_parse_cache():
+    """Delete cached parse results older than PARSE_CACHE_MAX_AGE."""
+    cutoff = time.time() - PARSE_CACHE_MAX_AGE
+    for path in PARSE_CACHE_DIR.glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
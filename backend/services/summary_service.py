@@ -7,100 +7,131 @@ Responsibilities:
     - Store AI summaries in the AI Summaries tab
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import os
+import tempfile
+from datetime import date, timedelta
+
+import orjson
 
 from backend.clients.sheets_client import SheetsClient
-from backend.config import WEEKLY_SUMMARY_HEADERS
+from backend.config import CACHE_DIR, GOOGLE_SHEET_ID, WEEKLY_SUMMARY_HEADERS
 from backend.utils.logger import get_logger
 from backend.utils.date_utils import (
     today_sofia,
-    get_week_bounds,
+    today_sofia_date,
     get_iso_week,
     lookback_dates,
 )
+from backend.utils.value_utils import TRUTHY, safe_float
 
 log = get_logger("SUMMARY")
 
+# Weekly averages: (Weekly Summary column, Daily Log field, round to int)
+_FIELD_SPEC = (
+    ("Avg_Weight_kg", "Weight_kg", False),
+    ("Avg_Trend_Weight_kg", "Trend_Weight_kg", False),
+    ("Avg_Protein_g", "Protein_g", False),
+    ("Avg_Carbs_g", "Carbs_g", False),
+    ("Avg_Fats_g", "Fats_g", False),
+    ("Avg_Calories", "Calories", True),
+    ("Avg_Steps", "Steps", True),
+    ("Avg_Sleep_Hours", "Total_Sleep_Hours", False),
+    ("Avg_Sleep_Score", "Sleep_Score", True),
+    ("Avg_Deep_Sleep_Min", "Deep_Sleep_Minutes", True),
+    ("Avg_REM_Sleep_Min", "REM_Sleep_Minutes", True),
+    ("Avg_Readiness_Score", "Readiness_Score", True),
+    ("Avg_HRV_Balance", "HRV_Balance", False),
+    ("Avg_Resting_HR", "Resting_Heart_Rate", True),
+    ("Avg_Activity_Score", "Activity_Score", True),
+    ("Avg_Nap_Minutes", "Nap_Minutes", True),
+)
+
+# Daily Log fields averaged into the weekly summary
+AVG_FIELDS = tuple(src for _, src, _ in _FIELD_SPEC)
+
+# Input hash of each closed week's last written summary — unchanged weeks are not rewritten
+WEEKLY_CACHE_FILE = CACHE_DIR / "weekly_summaries.json"
+# Weeks older than this are dropped from the cache (days)
+WEEKLY_CACHE_MAX_AGE_DAYS = 90
+
 
 class SummaryService:
     """Calculates weekly summaries and generates AI health analyses."""
 
     def __init__(self, sheets_client: SheetsClient):
         self.sheets = sheets_client
+        self._claude = None  # Created on first AI summary, then reused
+
+    def _get_claude(self):
+        """Lazy-load the ClaudeClient so its HTTP connection pool is reused across summaries."""
+        if self._claude is None:
+            from backend.clients.claude_client import ClaudeClient
+            self._claude = ClaudeClient()
+        return self._claude
 
     # ─── Weekly Summary Calculation ──────────────────────────────────
 
-    def calculate_weekly_summary(self, week_start: str, week_end: str) -> dict:
+    def calculate_weekly_summary(self, week_start: str, week_end: str,
+                                 data: list[dict], prev_data: list[dict]) -> dict:
         """
         Calculate all weekly averages for a given Monday–Sunday range.
         Returns a dict matching WEEKLY_SUMMARY_HEADERS columns.
+        Makes no Sheets calls — the caller fetches the rows.
+
+        Args:
+            data: Daily Log rows for this week
+            prev_data: Daily Log rows for the week before (for weight change)
         """
         log.info("calc_weekly", f"START — Calculating summary for {week_start} → {week_end}")
 
-        data = self.sheets.get_daily_data_for_range(week_start, week_end)
-
         if not data:
             log.info("calc_weekly", f"No data for week {week_start}")
             return {}
 
+        # One pass: per-field sums/counts plus the logged-day counters
+        sums = dict.fromkeys(AVG_FIELDS, 0.0)
+        counts = dict.fromkeys(AVG_FIELDS, 0)
+        nutrition_days = complete_days = 0
+        for d in data:
+            for field in AVG_FIELDS:
+                v = safe_float(d.get(field))
+                if v is not None:
+                    sums[field] += v
+                    counts[field] += 1
+            if d.get("Nutrition_Logged") in TRUTHY:
+                nutrition_days += 1
+            if d.get("Data_Complete") in TRUTHY:
+                complete_days += 1
+
         def avg(field, as_int=False):
-            vals = [_safe_float(d.get(field)) for d in data if _safe_float(d.get(field)) is not None]
-            if not vals:
+            if not counts[field]:
                 return ""
-            result = sum(vals) / len(vals)
+            result = sums[field] / counts[field]
             return round(result) if as_int else round(result, 1)
 
-        # Count logged days
-        nutrition_days = sum(
-            1 for d in data if d.get("Nutrition_Logged") in ("TRUE", "true", True)
-        )
-        complete_days = sum(
-            1 for d in data if d.get("Data_Complete") in ("TRUE", "true", True)
-        )
-
-        # Weight change vs previous week
-        prev_monday, prev_sunday = _previous_week(week_start)
-        prev_data = self.sheets.get_daily_data_for_range(prev_monday, prev_sunday)
+        summary = {out_key: avg(src_key, as_int) for out_key, src_key, as_int in _FIELD_SPEC}
 
+        # Weight change vs previous week — this week's average comes from the pass above
         weight_change = ""
-        this_avg_weight = avg("Weight_kg")
-        if this_avg_weight != "" and prev_data:
-            prev_weights = [
-                _safe_float(d.get("Weight_kg"))
-                for d in prev_data
-                if _safe_float(d.get("Weight_kg")) is not None
-            ]
-            if prev_weights:
-                prev_avg = sum(prev_weights) / len(prev_weights)
+        this_avg_weight = summary["Avg_Weight_kg"]
+        if this_avg_weight != "":
+            prev_avg = _compute_weight_avg(prev_data)
+            if prev_avg is not None:
                 weight_change = round(this_avg_weight - prev_avg, 1)
 
         compliance = round(nutrition_days / 7 * 100)
 
-        summary = {
+        summary.update({
             "Week_Start": week_start,
             "Week_End": week_end,
             "Week_Number": get_iso_week(week_start),
-            "Avg_Weight_kg": this_avg_weight,
-            "Avg_Trend_Weight_kg": avg("Trend_Weight_kg"),
-            "Avg_Protein_g": avg("Protein_g"),
-            "Avg_Carbs_g": avg("Carbs_g"),
-            "Avg_Fats_g": avg("Fats_g"),
-            "Avg_Calories": avg("Calories", as_int=True),
-            "Avg_Steps": avg("Steps", as_int=True),
-            "Avg_Sleep_Hours": avg("Total_Sleep_Hours"),
-            "Avg_Sleep_Score": avg("Sleep_Score", as_int=True),
-            "Avg_Deep_Sleep_Min": avg("Deep_Sleep_Minutes", as_int=True),
-            "Avg_REM_Sleep_Min": avg("REM_Sleep_Minutes", as_int=True),
-            "Avg_Readiness_Score": avg("Readiness_Score", as_int=True),
-            "Avg_HRV_Balance": avg("HRV_Balance"),
-            "Avg_Resting_HR": avg("Resting_Heart_Rate", as_int=True),
-            "Avg_Activity_Score": avg("Activity_Score", as_int=True),
-            "Avg_Nap_Minutes": avg("Nap_Minutes", as_int=True),
             "Days_Logged_Nutrition": nutrition_days,
             "Days_Logged_Total": complete_days,
             "Weight_Change_kg": weight_change,
             "Compliance_Pct": compliance,
-        }
+        })
 
         log.info(
             "calc_weekly",
@@ -113,19 +144,37 @@ class SummaryService:
         """Recalculate summaries for the current week and previous week, upsert to Weekly Summary tab."""
         log.info("update_summaries", "START — Updating weekly summaries")
 
-        today = today_sofia()
-
-        # Current week
-        curr_monday, curr_sunday = get_week_bounds(today)
-        curr_summary = self.calculate_weekly_summary(curr_monday, curr_sunday)
-        if curr_summary:
-            self.sheets.upsert_weekly_summary(curr_summary)
-
-        # Previous week
-        prev_monday, prev_sunday = _previous_week(curr_monday)
-        prev_summary = self.calculate_weekly_summary(prev_monday, prev_sunday)
-        if prev_summary:
-            self.sheets.upsert_weekly_summary(prev_summary)
+        today = today_sofia_date()
+
+        # Week bounds as dates; turned into YYYY-MM-DD strings only once, here
+        monday = today - timedelta(days=today.weekday())
+        curr_monday, curr_sunday = _week_strings(monday)
+        prev_monday, prev_sunday = _week_strings(monday - timedelta(days=7))
+        oldest_monday, oldest_sunday = _week_strings(monday - timedelta(days=14))
+
+        # The three weeks are contiguous, so one range read covers them all
+        rows = self.sheets.get_daily_data_for_range(oldest_monday, curr_sunday)
+        curr_data = _rows_between(rows, curr_monday, curr_sunday)
+        prev_data = _rows_between(rows, prev_monday, prev_sunday)
+        oldest_data = _rows_between(rows, oldest_monday, oldest_sunday)
+
+        # Current week — still open, always recalculated
+        curr_summary = self.calculate_weekly_summary(curr_monday, curr_sunday, curr_data, prev_data)
+
+        # Previous week — closed, so skipped unless its input rows changed since the last write
+        cache = _load_weekly_cache(today)
+        prev_hash = _rows_hash(prev_data, oldest_data)
+        if cache.get(prev_monday) == prev_hash:
+            log.info("update_summaries", f"Week {prev_monday} unchanged since last write — skipping")
+            prev_summary = {}
+        else:
+            prev_summary = self.calculate_weekly_summary(prev_monday, prev_sunday, prev_data, oldest_data)
+
+        # Both weeks written together (one request when both rows already exist)
+        self.sheets.upsert_weekly_summaries([s for s in (curr_summary, prev_summary) if s])
+        if cache.get(prev_monday) != prev_hash:
+            cache[prev_monday] = prev_hash
+            _save_weekly_cache(cache)
 
         log.info("update_summaries", "SUCCESS — Weekly summaries updated")
 
@@ -144,23 +193,23 @@ class SummaryService:
         result = {"success": False, "summary_text": "", "error": ""}
 
         try:
-            from backend.clients.claude_client import ClaudeClient
-
             # Gather context
             today = today_sofia()
             start_7, _ = lookback_dates(7)
             start_30, _ = lookback_dates(30)
 
-            week_data = self.sheets.get_daily_data_for_range(start_7, today)
-            month_data = self.sheets.get_daily_data_for_range(start_30, today)
-            goals = self.sheets.get_goals()
-
-            # Previous 4 weeks of weekly summaries
-            prev_summaries = self.sheets.get_recent_weekly_summaries(4)
+            # Independent reads — run them concurrently in worker threads
+            week_data, month_data, goals, prev_summaries = await asyncio.gather(
+                asyncio.to_thread(self.sheets.get_daily_data_for_range, start_7, today),
+                asyncio.to_thread(self.sheets.get_daily_data_for_range, start_30, today),
+                asyncio.to_thread(self.sheets.get_goals),
+                # Previous 4 weeks of weekly summaries
+                asyncio.to_thread(self.sheets.get_recent_weekly_summaries, 4),
+            )
 
             # Call Claude
-            claude = ClaudeClient()
-            summary_text = claude.generate_weekly_summary(
+            claude = self._get_claude()
+            summary_text = await claude.generate_weekly_summary(
                 daily_data=week_data,
                 goals=goals,
                 prev_week_summaries=prev_summaries,
@@ -170,7 +219,7 @@ class SummaryService:
             if summary_text:
                 # Store in AI Summaries tab
                 week_number = get_iso_week(today)
-                self.sheets.upsert_ai_summary(today, summary_text, week_number)
+                await asyncio.to_thread(self.sheets.upsert_ai_summary, today, summary_text, week_number)
 
                 result["success"] = True
                 result["summary_text"] = summary_text
@@ -188,18 +237,54 @@ class SummaryService:
 
 # ─── Helpers ─────────────────────────────────────────────────────────
 
-def _previous_week(monday_str: str) -> tuple[str, str]:
-    """Get previous week's Monday and Sunday from a Monday date string."""
-    monday = datetime.strptime(monday_str, "%Y-%m-%d")
-    prev_monday = monday - timedelta(days=7)
-    prev_sunday = prev_monday + timedelta(days=6)
-    return prev_monday.strftime("%Y-%m-%d"), prev_sunday.strftime("%Y-%m-%d")
+def _week_strings(monday: date) -> tuple[str, str]:
+    """Monday and Sunday of the week starting at `monday`, as YYYY-MM-DD strings."""
+    return monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+
+
+def _rows_between(rows: list[dict], start_date: str, end_date: str) -> list[dict]:
+    """Daily Log rows whose Date falls within [start_date, end_date]."""
+    return [r for r in rows if start_date <= r.get("Date", "") <= end_date]
 
 
-def _safe_float(value) -> float | None:
-    if value is None or value == "":
-        return None
+def _rows_hash(*row_groups: list[dict]) -> str:
+    """Stable hash of Daily Log rows (key order independent), scoped to the spreadsheet."""
+    payload = orjson.dumps([GOOGLE_SHEET_ID, row_groups], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _load_weekly_cache(today: date) -> dict[str, str]:
+    """Week_Start → input hash, without weeks older than WEEKLY_CACHE_MAX_AGE_DAYS."""
+    try:
+        cache = orjson.loads(WEEKLY_CACHE_FILE.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (OSError, orjson.JSONDecodeError) as e:
+        log.warning("cache", f"Unreadable weekly summary cache: {e}")
+        return {}
+    cutoff = (today - timedelta(days=WEEKLY_CACHE_MAX_AGE_DAYS)).isoformat()
+    return {week: h for week, h in cache.items() if week >= cutoff}
+
+
+def _save_weekly_cache(cache: dict[str, str]):
+    """Write the weekly summary cache (write-then-rename)."""
     try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
+        WEEKLY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=WEEKLY_CACHE_FILE.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(cache))
+        os.replace(tmp, WEEKLY_CACHE_FILE)
+    except OSError as e:
+        log.warning("cache", f"Could not save weekly summary cache: {e}")
+
+
+def _compute_weight_avg(rows: list[dict]) -> float | None:
+    """Mean Weight_kg over the rows that have one, or None if none do."""
+    total = 0.0
+    count = 0
+    for d in rows:
+        v = safe_float(d.get("Weight_kg"))
+        if v is not None:
+            total += v
+            count += 1
+    return total / count if count else None
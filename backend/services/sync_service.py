@@ -27,14 +27,18 @@ class SyncService:
             lookback_days: Number of days to look back (default from config: 7)
 
         Returns:
-            Dict with sync results: {"days_fetched": int, "days_updated": int, "errors": list}
+            Dict with sync results: {"days_fetched": int, "days_updated": int, "errors": list,
+            "post_state": Daily Log rows for the synced range after the write, or None}
         """
         days = lookback_days or SYNC_LOOKBACK_DAYS
         start_date, end_date = lookback_dates(days)
 
         log.info("sync_oura", f"START — Syncing Oura data for {start_date} to {end_date} ({days} days)")
 
-        result = {"days_fetched": 0, "days_updated": 0, "errors": [], "start_date": start_date, "end_date": end_date}
+        result = {
+            "days_fetched": 0, "days_updated": 0, "errors": [],
+            "start_date": start_date, "end_date": end_date, "post_state": None,
+        }
 
         # Step 1: Fetch all Oura data
         try:
@@ -51,8 +55,10 @@ class SyncService:
             return result
 
         # Step 2: Upsert each day into Google Sheets
-        rows_to_upsert = [(date_str, data) for date_str, data in sorted(oura_data.items())]
-        success_count = self.sheets.upsert_daily_rows_batch(rows_to_upsert, source="oura")
+        # The write already holds the merged rows — keep them so callers need not re-read
+        success_count, result["post_state"] = self.sheets.upsert_daily_rows_batch_snapshot(
+            sorted(oura_data.items()), "oura", start_date, end_date,
+        )
         result["days_updated"] = success_count
 
         log.info(
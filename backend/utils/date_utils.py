@@ -3,12 +3,13 @@ Date and timezone utilities.
 All dates in Europe/Sofia timezone. Stored as YYYY-MM-DD strings.
 """
 
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Optional
+from zoneinfo import ZoneInfo
 
-import pytz
-
-SOFIA_TZ = pytz.timezone("Europe/Sofia")
+SOFIA_TZ = ZoneInfo("Europe/Sofia")
 
 
 def now_sofia() -> datetime:
@@ -18,6 +19,20 @@ def now_sofia() -> datetime:
 
 def today_sofia() -> str:
     """Get today's date string in Europe/Sofia timezone (YYYY-MM-DD)."""
+    return _today_for_minute(int(time.time() // 60))
+
+
+def today_sofia_date() -> date:
+    """today_sofia() as a date object, for date arithmetic without re-parsing strings."""
+    return date.fromisoformat(today_sofia())
+
+
+@lru_cache(maxsize=1)
+def _today_for_minute(minute_bucket: int) -> str:
+    """
+    today_sofia() memoized per wall-clock minute. Sofia's UTC offset is whole
+    hours, so local midnight always starts a new bucket — the date is never stale.
+    """
     return now_sofia().strftime("%Y-%m-%d")
 
 
@@ -26,24 +41,21 @@ def date_str(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d")
 
 
+@lru_cache(maxsize=1024)
 def parse_date(date_string: str) -> datetime:
-    """Parse a YYYY-MM-DD string into a timezone-aware datetime."""
-    naive = datetime.strptime(date_string, "%Y-%m-%d")
-    return SOFIA_TZ.localize(naive)
+    """Parse a YYYY-MM-DD string into a timezone-aware datetime (memoized — datetimes are immutable)."""
+    d = _iso_date(date_string)
+    return datetime(d.year, d.month, d.day, tzinfo=SOFIA_TZ)
 
 
 def date_range(start_date: str, end_date: str) -> list[str]:
     """
     Generate a list of YYYY-MM-DD date strings from start to end (inclusive).
     """
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-    dates = []
-    current = start
-    while current <= end:
-        dates.append(current.strftime("%Y-%m-%d"))
-        current += timedelta(days=1)
-    return dates
+    start = _iso_date(start_date).toordinal()
+    end = _iso_date(end_date).toordinal()
+    # Day ordinals + isoformat(): no per-day timedelta arithmetic or strftime
+    return [date.fromordinal(n).isoformat() for n in range(start, end + 1)]
 
 
 def lookback_dates(days: int = 7) -> tuple[str, str]:
@@ -52,26 +64,37 @@ def lookback_dates(days: int = 7) -> tuple[str, str]:
     Returns (start_date, end_date) as YYYY-MM-DD strings.
     End date is today (Sofia time), start date is `days` ago.
     """
-    today = now_sofia()
-    start = today - timedelta(days=days)
-    return date_str(start), date_str(today)
+    # Both ends come from one calendar-date capture, so the window only moves at midnight
+    today = today_sofia_date()
+    return (today - timedelta(days=days)).isoformat(), today.isoformat()
 
 
+@lru_cache(maxsize=1024)
 def get_week_bounds(date_string: str) -> tuple[str, str]:
     """
     Get the Monday–Sunday bounds for the week containing the given date.
-    Returns (monday_date, sunday_date) as YYYY-MM-DD strings.
+    Returns (monday_date, sunday_date) as YYYY-MM-DD strings. Memoized per date.
     """
-    dt = datetime.strptime(date_string, "%Y-%m-%d")
-    monday = dt - timedelta(days=dt.weekday())  # weekday() returns 0 for Monday
+    d = _iso_date(date_string)
+    monday = d - timedelta(days=d.weekday())  # weekday() returns 0 for Monday
     sunday = monday + timedelta(days=6)
-    return date_str(monday), date_str(sunday)
+    return monday.isoformat(), sunday.isoformat()
 
 
+@lru_cache(maxsize=1024)
 def get_iso_week(date_string: str) -> int:
-    """Get the ISO week number for a date string."""
-    dt = datetime.strptime(date_string, "%Y-%m-%d")
-    return dt.isocalendar()[1]
+    """Get the ISO week number for a date string. Memoized per date."""
+    return _iso_date(date_string).isocalendar()[1]
+
+
+def _iso_date(date_string: str) -> date:
+    """
+    Parse YYYY-MM-DD with date.fromisoformat (C fast path). Anything else goes
+    through strptime, so non-padded dates still parse and compact ones still fail.
+    """
+    if len(date_string) == 10 and date_string[4] == "-" and date_string[7] == "-":
+        return date.fromisoformat(date_string)
+    return datetime.strptime(date_string, "%Y-%m-%d").date()
 
 
 def normalize_date(value) -> Optional[str]:
@@ -80,6 +103,14 @@ def normalize_date(value) -> Optional[str]:
     Handles: datetime objects, date objects, strings.
     Returns None if conversion fails.
     """
+    try:
+        return _normalize_date_cached(value)
+    except TypeError:  # unhashable input — skip the cache
+        return _normalize_date(value)
+
+
+def _normalize_date(value) -> Optional[str]:
+    """Uncached normalize_date()."""
     if value is None:
         return None
     if isinstance(value, datetime):
@@ -88,10 +119,26 @@ def normalize_date(value) -> Optional[str]:
         return value.strftime("%Y-%m-%d")
     if isinstance(value, str):
         value = value.strip()
-        # Try common formats
-        for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%dT%H:%M:%S"):
+        # Fast path: already YYYY-MM-DD — validate and return as-is
+        if len(value) == 10 and value[4] == "-" and value[7] == "-":
+            try:
+                date.fromisoformat(value)
+                return value
+            except ValueError:
+                pass
+        # Only formats with the string's separator can match, so skip the others
+        for fmt in (_SLASH_FORMATS if "/" in value else _DASH_FORMATS):
             try:
                 return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
             except ValueError:
                 continue
     return None
+
+
+# Accepted string formats by separator, in priority order (US before EU for slashes)
+_DASH_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S")
+_SLASH_FORMATS = ("%m/%d/%Y", "%d/%m/%Y")
+
+
+# Import files repeat the same dates across sheets and rows (strings or datetimes, both hashable)
+_normalize_date_cached = lru_cache(maxsize=8192)(_normalize_date)
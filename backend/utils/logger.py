@@ -4,28 +4,40 @@ Format: [TIMESTAMP] [SOURCE] [ACTION] MESSAGE
 Logs to both stdout and execution.log file.
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
-
-import pytz
+from zoneinfo import ZoneInfo
 
 # Project root (two levels up from utils/)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 LOG_FILE = PROJECT_ROOT / "execution.log"
-TIMEZONE = pytz.timezone(os.getenv("TIMEZONE", "Europe/Sofia"))
+TIMEZONE = ZoneInfo(os.getenv("TIMEZONE", "Europe/Sofia"))
 
 
 class SofiaFormatter(logging.Formatter):
-    """Custom formatter that uses Europe/Sofia timezone."""
+    """
+    Custom formatter that uses Europe/Sofia timezone.
+    Timestamps have one-second resolution, so the last formatted second is reused.
+    """
+
+    # (whole second, datefmt, formatted string) of the last call
+    _last = (None, None, "")
 
     def formatTime(self, record, datefmt=None):
-        dt = datetime.fromtimestamp(record.created, tz=TIMEZONE)
-        if datefmt:
-            return dt.strftime(datefmt)
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+        second = int(record.created)
+        last = self._last
+        if last[0] == second and last[1] == datefmt:
+            return last[2]
+        dt = datetime.fromtimestamp(second, tz=TIMEZONE)
+        text = dt.strftime(datefmt or "%Y-%m-%d %H:%M:%S")
+        self._last = (second, datefmt, text)  # Single assignment — safe across threads
+        return text
 
 
 class HealthLogger:
@@ -34,27 +46,38 @@ class HealthLogger:
     def __init__(self, source: str):
         self.source = source
         self.logger = logging.getLogger(f"health_dashboard.{source}")
+        self._prefix = f"[{source.upper()}] ["  # Built once, not per call
 
     def _format_msg(self, action: str, message: str) -> str:
-        return f"[{self.source.upper()}] [{action}] {message}"
+        return f"{self._prefix}{action}] {message}"
 
-    def info(self, action: str, message: str):
-        self.logger.info(self._format_msg(action, message))
+    # Extra args are %-style and only interpolated when the level is enabled,
+    # e.g. log.debug("row", "%d: %s", i, value) costs nothing at INFO level.
 
-    def error(self, action: str, message: str):
-        self.logger.error(self._format_msg(action, message))
+    def info(self, action: str, message: str, *args):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(self._format_msg(action, message), *args)
 
-    def warning(self, action: str, message: str):
-        self.logger.warning(self._format_msg(action, message))
+    def error(self, action: str, message: str, *args):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(self._format_msg(action, message), *args)
 
-    def debug(self, action: str, message: str):
-        self.logger.debug(self._format_msg(action, message))
+    def warning(self, action: str, message: str, *args):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(self._format_msg(action, message), *args)
+
+    def debug(self, action: str, message: str, *args):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(self._format_msg(action, message), *args)
 
 
 def setup_logging(level: str = "INFO"):
     """
     Initialize logging for the entire application.
     Call this once at startup (in main.py).
+
+    Records are queued by the calling thread and written to stdout / execution.log
+    by a background listener thread, so log calls never block on I/O.
     """
     log_level = getattr(logging, level.upper(), logging.INFO)
     root_logger = logging.getLogger("health_dashboard")
@@ -64,6 +87,8 @@ def setup_logging(level: str = "INFO"):
     if root_logger.handlers:
         return
 
+    handlers = []
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
@@ -72,7 +97,7 @@ def setup_logging(level: str = "INFO"):
         datefmt="%Y-%m-%d %H:%M:%S"
     )
     console_handler.setFormatter(console_fmt)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler
     try:
@@ -83,10 +108,17 @@ def setup_logging(level: str = "INFO"):
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         file_handler.setFormatter(file_fmt)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except (PermissionError, OSError) as e:
         console_handler.stream.write(f"⚠️  Could not create log file: {e}\n")
 
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Drain queued records on interpreter exit
+    atexit.register(listener.stop)
+
 
 def get_logger(source: str) -> HealthLogger:
     """Get a structured logger for a specific module/source."""
@@ -0,0 +1,27 @@
+"""
+Cell value utilities.
+Coercion helpers for Daily Log values read from Google Sheets.
+"""
+
+from typing import Optional
+
+# Checkbox cell values that count as checked (True also matches 1)
+TRUTHY = frozenset(("TRUE", "true", True))
+
+
+def safe_float(value) -> Optional[float]:
+    """
+    Convert a cell value to float, returning None for empty/invalid.
+    Unformatted Sheets reads return numbers, so float/int skip the try block.
+    """
+    t = type(value)
+    if t is float:
+        return value
+    if t is int:
+        return float(value)
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
@@ -0,0 +1,114 @@
+"""
+Retry tests for ClaudeClient.generate_weekly_summary (the Anthropic API is mocked).
+"""
+
+import anthropic
+import httpx
+import pytest
+
+from backend.clients import claude_client
+from backend.clients.claude_client import ClaudeClient
+
+REQUEST = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+
+def _status_error(cls, status: int):
+    return cls(f"HTTP {status}", response=httpx.Response(status, request=REQUEST), body=None)
+
+
+class FakeStream:
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    async def __aenter__(self):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        async def _gen():
+            yield self.outcome
+        return _gen()
+
+    async def get_final_message(self):
+        usage = type("Usage", (), {"input_tokens": 10, "output_tokens": 5, "cache_read_input_tokens": 0})
+        return type("Message", (), {"usage": usage})
+
+
+class FakeMessages:
+    """messages.stream() replacement: each call consumes the next outcome (exception or text)."""
+
+    def __init__(self, outcomes: list):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def stream(self, **kwargs):
+        self.calls += 1
+        return FakeStream(self.outcomes.pop(0))
+
+
+@pytest.fixture(autouse=True)
+def _no_waiting(monkeypatch):
+    monkeypatch.setattr(claude_client, "ANTHROPIC_API_KEY", "test-key")
+    claude_client._response_cache.clear()
+
+    async def _sleep(_):
+        return None
+    monkeypatch.setattr(claude_client.asyncio, "sleep", _sleep)
+    yield
+    claude_client._response_cache.clear()
+
+
+def _client(outcomes: list) -> tuple[ClaudeClient, FakeMessages]:
+    client = ClaudeClient()
+    messages = FakeMessages(outcomes)
+    client.aclient = type("FakeAsyncAnthropic", (), {"messages": messages})()
+    return client, messages
+
+
+async def _generate(client: ClaudeClient) -> str:
+    return await client.generate_weekly_summary(
+        daily_data=[{"Date": "2026-02-09"}], goals=[], prev_week_summaries=[], month_data=[],
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [
+    _status_error(anthropic.RateLimitError, 429),
+    _status_error(anthropic.InternalServerError, 500),
+    anthropic.APIConnectionError(request=REQUEST),
+    anthropic.APITimeoutError(request=REQUEST),
+])
+async def test_transient_errors_are_retried(error):
+    client, messages = _client([error, "Summary"])
+
+    assert await _generate(client) == "Summary"
+    assert messages.calls == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [
+    _status_error(anthropic.AuthenticationError, 401),
+    _status_error(anthropic.PermissionDeniedError, 403),
+    _status_error(anthropic.BadRequestError, 400),
+])
+async def test_client_errors_are_raised_at_once(error):
+    client, messages = _client([error, "Summary"])
+
+    with pytest.raises(type(error)):
+        await _generate(client)
+    assert messages.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts():
+    errors = [_status_error(anthropic.InternalServerError, 503)] * claude_client.MAX_ATTEMPTS
+    client, messages = _client(errors)
+
+    with pytest.raises(RuntimeError):
+        await _generate(client)
+    assert messages.calls == claude_client.MAX_ATTEMPTS
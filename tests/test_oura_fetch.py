@@ -0,0 +1,88 @@
+"""
+Incremental fetch tests for OuraClient._fetch_range (the Oura API is mocked).
+"""
+
+import pytest
+
+from backend.clients import oura_client
+from backend.clients.oura_client import OuraClient
+
+
+@pytest.fixture(autouse=True)
+def _reset_fetch_state():
+    oura_client._fetch_state.clear()
+    yield
+    oura_client._fetch_state.clear()
+
+
+class FakeApi:
+    """Stands in for OuraClient._get: serves `days` (day → score) and records each request."""
+
+    def __init__(self, days: dict[str, int]):
+        self.days = days
+        self.calls: list[tuple[str, str]] = []
+        self.fail = False
+
+    def __call__(self, endpoint: str, params: dict = None):
+        self.calls.append((params["start_date"], params["end_date"]))
+        if self.fail:
+            return None
+        return {"data": [
+            {"day": day, "score": score}
+            for day, score in sorted(self.days.items())
+            if params["start_date"] <= day <= params["end_date"]
+        ]}
+
+
+def _client(api: FakeApi, monkeypatch) -> OuraClient:
+    client = OuraClient()
+    monkeypatch.setattr(client, "_get", api)
+    return client
+
+
+def _scores(items: list[dict]) -> dict[str, int]:
+    return {item["day"]: item["score"] for item in items}
+
+
+def test_incremental_fetch_refetches_trailing_days(monkeypatch):
+    api = FakeApi({f"2026-02-0{d}": 70 + d for d in range(1, 8)})
+    client = _client(api, monkeypatch)
+    client._fetch_range("daily_sleep", "2026-02-01", "2026-02-07")
+
+    # Oura finalizes an earlier day after it stopped being the newest one
+    api.days["2026-02-05"] = 99
+    api.days["2026-02-08"] = 80
+    items = client._fetch_range("daily_sleep", "2026-02-02", "2026-02-08")
+
+    assert api.calls[-1] == ("2026-02-05", "2026-02-08")
+    scores = _scores(items)
+    assert scores["2026-02-05"] == 99
+    assert scores["2026-02-08"] == 80
+    assert sorted(scores) == [f"2026-02-0{d}" for d in range(2, 9)]
+
+
+def test_trailing_window_never_starts_before_the_requested_range(monkeypatch):
+    api = FakeApi({"2026-02-01": 71, "2026-02-02": 72})
+    client = _client(api, monkeypatch)
+    client._fetch_range("daily_sleep", "2026-02-01", "2026-02-02")
+    client._fetch_range("daily_sleep", "2026-02-01", "2026-02-03")
+
+    assert api.calls[-1] == ("2026-02-01", "2026-02-03")
+
+
+def test_failed_request_falls_back_to_cached_days(monkeypatch):
+    api = FakeApi({f"2026-02-0{d}": 70 + d for d in range(1, 8)})
+    client = _client(api, monkeypatch)
+    client._fetch_range("daily_sleep", "2026-02-01", "2026-02-07")
+
+    api.fail = True
+    items = client._fetch_range("daily_sleep", "2026-02-02", "2026-02-08")
+
+    assert _scores(items) == {f"2026-02-0{d}": 70 + d for d in range(2, 8)}
+
+
+def test_failed_request_without_cache_returns_nothing(monkeypatch):
+    api = FakeApi({})
+    api.fail = True
+
+    assert _client(api, monkeypatch)._fetch_range("daily_sleep", "2026-02-01", "2026-02-07") == []
@@ -0,0 +1,60 @@
+"""
+Goals tab rewrite tests for SheetsClient.update_goals (the Sheets API is mocked).
+"""
+
+import pytest
+from gspread.utils import rowcol_to_a1
+
+from backend.clients.sheets_client import SheetsClient
+from backend.config import GOALS_HEADERS, GOALS_TAB
+
+
+class FakeWorksheet:
+    """Records update/batch_clear calls; row_count is the grid size, as in gspread."""
+
+    def __init__(self):
+        self.title = GOALS_TAB
+        self.row_count = 1000
+        self.updates: list[str] = []
+        self.clears: list[list[str]] = []
+
+    def update(self, cell_range: str, values: list[list]):
+        self.updates.append(cell_range)
+
+    def batch_clear(self, ranges: list[str]):
+        self.clears.append(ranges)
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_state():
+    yield
+    SheetsClient._read_cache.clear()
+
+
+def _client(ws: FakeWorksheet, old_goals: list[dict], monkeypatch) -> SheetsClient:
+    client = SheetsClient()
+    client._ws_cache = {GOALS_TAB: ws}
+    client._connected = True
+    monkeypatch.setattr(client, "get_goals", lambda: old_goals)
+    return client
+
+
+def _goals(n: int) -> list[dict]:
+    return [{GOALS_HEADERS[0]: f"Metric {i}"} for i in range(n)]
+
+
+def test_clears_only_rows_left_over_from_a_longer_block(monkeypatch):
+    ws = FakeWorksheet()
+    _client(ws, _goals(5), monkeypatch).update_goals(_goals(3))
+
+    # Header + 3 rows written over header + 5 rows: only sheet rows 5–6 are stale
+    assert ws.updates == [f"A1:{rowcol_to_a1(4, len(GOALS_HEADERS))}"]
+    assert ws.clears == [[f"A5:{rowcol_to_a1(6, len(GOALS_HEADERS))}"]]
+
+
+@pytest.mark.parametrize("old_count", [3, 1, 0])
+def test_no_clear_when_the_new_block_is_not_shorter(old_count, monkeypatch):
+    ws = FakeWorksheet()
+    _client(ws, _goals(old_count), monkeypatch).update_goals(_goals(3))
+
+    assert ws.clears == []
@@ -0,0 +1,99 @@
+"""
+Read-cache tests for SheetsClient — in-process and on-disk layers.
+"""
+
+import time
+
+import pytest
+
+from backend.clients import sheets_client
+from backend.clients.sheets_client import SheetsClient
+
+
+class FakeSpreadsheet:
+    def __init__(self, revision: str = "2026-02-09T10:00:00Z"):
+        self.revision = revision
+
+    def get_lastUpdateTime(self):
+        return self.revision
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheets_client, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(SheetsClient, "_last_write", 0.0)
+    SheetsClient._read_cache.clear()
+    SheetsClient._revision_state.update(value=None, checked=0.0)
+    yield tmp_path
+    SheetsClient._read_cache.clear()
+    SheetsClient._revision_state.update(value=None, checked=0.0)
+
+
+def _client() -> SheetsClient:
+    client = SheetsClient()
+    client.spreadsheet = FakeSpreadsheet()
+    return client
+
+
+class Loader:
+    """Counts calls and returns a fresh copy of `records` each time."""
+
+    def __init__(self, records: list[dict]):
+        self.records = records
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [dict(r) for r in self.records]
+
+
+RECORDS = [{"Date": "2026-02-08", "Steps": 8000}, {"Date": "2026-02-09", "Steps": 9000}]
+
+
+def test_memory_hits_return_independent_copies():
+    client, loader = _client(), Loader(RECORDS)
+
+    first = client._cached_read("daily_range", ["a", "b"], loader)
+    first.sort(key=lambda r: r["Date"], reverse=True)
+    first[0]["Steps"] = 0
+
+    second = client._cached_read("daily_range", ["a", "b"], loader)
+    second.append({"Date": "x"})
+    third = client._cached_read("daily_range", ["a", "b"], loader)
+
+    assert loader.calls == 1
+    assert second[:2] == RECORDS
+    assert third == RECORDS
+
+
+def test_disk_layer_survives_a_new_process(cache_dir):
+    loader = Loader(RECORDS)
+    assert _client()._cached_read("daily_range", ["a", "b"], loader) == RECORDS
+    assert [p.name.endswith(".json.gz") for p in cache_dir.iterdir()] == [True]
+
+    SheetsClient._read_cache.clear()  # As after a restart
+    SheetsClient._revision_state.update(value=None, checked=0.0)
+    assert _client()._cached_read("daily_range", ["a", "b"], loader) == RECORDS
+    assert loader.calls == 1
+
+
+def test_disk_entries_older_than_our_last_write_are_refetched():
+    client, loader = _client(), Loader(RECORDS)
+    client._cached_read("daily_range", ["a", "b"], loader)
+
+    time.sleep(0.01)
+    SheetsClient._mark_written()  # Drive's modifiedTime has not moved yet
+    client._cached_read("daily_range", ["a", "b"], loader)
+
+    assert loader.calls == 2
+
+
+def test_unreadable_disk_entry_falls_back_to_loader(cache_dir):
+    client, loader = _client(), Loader(RECORDS)
+    client._cached_read("daily_range", ["a", "b"], loader)
+    for path in cache_dir.glob("*.json.gz"):
+        path.write_bytes(b"not gzip")
+    SheetsClient._read_cache.clear()
+
+    assert client._cached_read("daily_range", ["a", "b"], loader) == RECORDS
+    assert loader.calls == 2
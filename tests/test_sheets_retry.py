@@ -0,0 +1,74 @@
+"""
+Retry tests for SheetsClient._retry — which failures are retried and which are raised at once.
+"""
+
+import gspread
+import pytest
+import requests
+from google.auth.exceptions import RefreshError, TransportError
+
+from backend.clients import sheets_client
+from backend.clients.sheets_client import SheetsClient
+
+
+def _api_error(status: int) -> gspread.exceptions.APIError:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{"error": {"code": %d, "message": "test", "status": "TEST"}}' % status
+    return gspread.exceptions.APIError(response)
+
+
+class Flaky:
+    """Raises each queued exception in turn, then returns "ok"."""
+
+    def __init__(self, errors: list[Exception]):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def _no_waiting(monkeypatch):
+    monkeypatch.setattr(sheets_client.time, "sleep", lambda _: None)
+
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ConnectionError("connection reset"),
+    requests.exceptions.Timeout("read timed out"),
+    TransportError("DNS lookup failed"),
+    _api_error(429),
+    _api_error(503),
+])
+def test_transient_errors_are_retried(error):
+    func = Flaky([error])
+
+    assert SheetsClient()._retry(func) == "ok"
+    assert func.calls == 2
+
+
+@pytest.mark.parametrize("error", [
+    gspread.exceptions.WorksheetNotFound("Goals"),
+    RefreshError("invalid_grant"),
+    KeyError("Date"),
+    _api_error(400),
+    _api_error(403),
+])
+def test_permanent_errors_are_raised_at_once(error):
+    func = Flaky([error])
+
+    with pytest.raises(type(error)):
+        SheetsClient()._retry(func)
+    assert func.calls == 1
+
+
+def test_gives_up_after_max_retries():
+    func = Flaky([_api_error(503)] * sheets_client.MAX_RETRIES)
+
+    with pytest.raises(gspread.exceptions.APIError):
+        SheetsClient()._retry(func)
+    assert func.calls == sheets_client.MAX_RETRIES
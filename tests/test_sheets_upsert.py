@@ -0,0 +1,240 @@
+"""
+Upsert tests for SheetsClient — merge rules and batch row placement.
+The Google Sheets API is replaced by an in-memory worksheet that applies
+batchUpdate requests the way the API does.
+"""
+
+import pytest
+
+from backend.clients.sheets_client import SheetsClient
+from backend.config import DAILY_LOG_COLUMNS, DAILY_LOG_HEADERS, DAILY_LOG_TAB
+
+WIDTH = len(DAILY_LOG_HEADERS)
+
+
+# ─── Fake Sheets API ─────────────────────────────────────────────────
+
+def _value(cell: dict):
+    """Inverse of sheets_client._cell()."""
+    entered = cell.get("userEnteredValue", {})
+    for kind in ("numberValue", "boolValue", "stringValue"):
+        if kind in entered:
+            return entered[kind]
+    return ""
+
+
+class FakeWorksheet:
+    """One tab as a grid of rows (row 0 = headers), plus the API calls SheetsClient uses."""
+
+    def __init__(self, rows: list[list], spare_rows: int = 0):
+        self.id = 7
+        self.title = DAILY_LOG_TAB
+        self.grid = [list(DAILY_LOG_HEADERS)] + [_pad(r) for r in rows]
+        self.grid += [[""] * WIDTH for _ in range(spare_rows)]
+        self.requests: list[dict] = []
+
+    @property
+    def row_count(self) -> int:
+        return len(self.grid)
+
+    @property
+    def col_count(self) -> int:
+        return WIDTH
+
+    def get_all_values(self, **kwargs) -> list[list]:
+        rows = [list(r) for r in self.grid]
+        while rows and not any(c != "" for c in rows[-1]):
+            rows.pop()
+        return rows
+
+    def col_values(self, col: int) -> list:
+        return [r[col - 1] for r in self.get_all_values()]
+
+    def apply(self, requests: list[dict]):
+        for req in requests:
+            self.requests.append(req)
+            if "updateCells" in req:
+                body = req["updateCells"]
+                start = body["start"]["rowIndex"]
+                for offset, row in enumerate(body["rows"]):
+                    assert start + offset < self.row_count, "write outside the grid"
+                    self.grid[start + offset] = _pad([_value(c) for c in row["values"]])
+            elif "insertDimension" in req:
+                rng = req["insertDimension"]["range"]
+                assert rng["startIndex"] < self.row_count
+                for _ in range(rng["endIndex"] - rng["startIndex"]):
+                    self.grid.insert(rng["startIndex"], [""] * WIDTH)
+            elif "appendDimension" in req:
+                self.grid += [[""] * WIDTH for _ in range(req["appendDimension"]["length"])]
+            else:
+                raise AssertionError(f"unexpected request {req}")
+
+    def dates(self) -> list[str]:
+        return [r[0] for r in self.get_all_values()[1:]]
+
+    def row(self, date_str: str) -> dict:
+        for r in self.grid[1:]:
+            if r[0] == date_str:
+                return dict(zip(DAILY_LOG_HEADERS, r))
+        raise KeyError(date_str)
+
+
+class FakeSpreadsheet:
+    def __init__(self, ws: FakeWorksheet):
+        self.ws = ws
+
+    def batch_update(self, body: dict):
+        self.ws.apply(body["requests"])
+        return {}
+
+
+def _pad(row: list) -> list:
+    return list(row) + [""] * (WIDTH - len(row))
+
+
+def _row(date_str: str, **values) -> list:
+    row = [""] * WIDTH
+    row[0] = date_str
+    for name, value in values.items():
+        row[DAILY_LOG_COLUMNS[name]] = value
+    return row
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_state():
+    """SheetsClient keeps row indexes and read caches at class level."""
+    yield
+    SheetsClient._date_row_cache.clear()
+    SheetsClient._sorted_keys_cache.clear()
+    SheetsClient._index_built_at.clear()
+    SheetsClient._read_cache.clear()
+
+
+def _client(ws: FakeWorksheet) -> SheetsClient:
+    client = SheetsClient()
+    client.spreadsheet = FakeSpreadsheet(ws)
+    client._ws_cache = {DAILY_LOG_TAB: ws}
+    client._connected = True
+    return client
+
+
+def _updated_rows(ws: FakeWorksheet) -> list[int]:
+    """0-indexed sheet rows written by updateCells requests."""
+    return [r["updateCells"]["start"]["rowIndex"] for r in ws.requests if "updateCells" in r]
+
+
+# ─── Batch Upsert: Row Placement ─────────────────────────────────────
+
+def test_batch_append_at_end_writes_only_new_rows():
+    ws = FakeWorksheet([_row("2026-02-01", Steps=1000), _row("2026-02-02", Steps=2000)], spare_rows=5)
+    count = _client(ws).upsert_daily_rows_batch(
+        [("2026-02-04", {"Steps": 4000}), ("2026-02-03", {"Steps": 3000})], source="oura",
+    )
+
+    assert count == 2
+    assert ws.dates() == ["2026-02-01", "2026-02-02", "2026-02-03", "2026-02-04"]
+    assert ws.row("2026-02-03")["Steps"] == 3000
+    assert ws.row("2026-02-04")["Steps"] == 4000
+    # Existing rows are not rewritten
+    assert _updated_rows(ws) == [3]
+
+
+def test_batch_append_grows_a_full_grid():
+    ws = FakeWorksheet([_row("2026-02-01", Steps=1000)])
+    _client(ws).upsert_daily_rows_batch([("2026-02-02", {"Steps": 2000})], source="oura")
+
+    assert ws.dates() == ["2026-02-01", "2026-02-02"]
+    assert any("appendDimension" in r for r in ws.requests)
+
+
+def test_batch_mid_table_backfill_inserts_without_rewriting_tail():
+    ws = FakeWorksheet([
+        _row("2026-02-01", Steps=1000),
+        _row("2026-02-03", Steps=3000),
+        _row("2026-02-05", Steps=5000),
+        _row("2026-02-06", Steps=6000),
+    ])
+    _client(ws).upsert_daily_rows_batch(
+        [("2026-02-04", {"Steps": 4000}), ("2026-02-02", {"Steps": 2000})], source="oura",
+    )
+
+    assert ws.dates() == ["2026-02-01", "2026-02-02", "2026-02-03", "2026-02-04", "2026-02-05", "2026-02-06"]
+    for day, steps in ((1, 1000), (2, 2000), (3, 3000), (4, 4000), (5, 5000), (6, 6000)):
+        assert ws.row(f"2026-02-0{day}")["Steps"] == steps
+    # Only the two inserted rows are written — rows after them are shifted, not rewritten
+    assert sum(len(r["updateCells"]["rows"]) for r in ws.requests if "updateCells" in r) == 2
+
+
+def test_batch_backfill_leaves_blank_date_rows_in_place():
+    ws = FakeWorksheet([
+        _row("2026-02-01", Steps=1000),
+        _row("", Steps=999),  # e.g. a manual note row without a date
+        _row("2026-02-05", Steps=5000),
+    ])
+    _client(ws).upsert_daily_rows_batch([("2026-02-03", {"Steps": 3000})], source="oura")
+
+    assert ws.dates() == ["2026-02-01", "", "2026-02-03", "2026-02-05"]
+    assert ws.grid[2][DAILY_LOG_COLUMNS["Steps"]] == 999
+
+
+def test_batch_changed_and_new_rows_in_one_call():
+    ws = FakeWorksheet([_row("2026-02-01", Steps=1000), _row("2026-02-03", Steps=3000)])
+    _client(ws).upsert_daily_rows_batch(
+        [("2026-02-03", {"Steps": 3500}), ("2026-02-02", {"Steps": 2000})], source="oura",
+    )
+
+    assert ws.dates() == ["2026-02-01", "2026-02-02", "2026-02-03"]
+    assert ws.row("2026-02-03")["Steps"] == 3500
+    assert ws.row("2026-02-02")["Steps"] == 2000
+    assert ws.row("2026-02-01")["Steps"] == 1000
+
+
+def test_batch_unchanged_rows_are_not_written():
+    ws = FakeWorksheet([_row("2026-02-01", Steps=1000, Nutrition_Logged="FALSE", Data_Complete="FALSE")])
+    _client(ws).upsert_daily_rows_batch([("2026-02-01", {"Steps": 1000})], source="oura")
+
+    assert ws.requests == []
+
+
+def test_batch_snapshot_returns_rows_after_write():
+    ws = FakeWorksheet([_row("2026-02-01", Steps=1000), _row("2026-02-04", Steps=4000)])
+    count, records = _client(ws).upsert_daily_rows_batch_snapshot(
+        [("2026-02-02", {"Steps": 2000})], "oura", "2026-02-01", "2026-02-03",
+    )
+
+    assert count == 1
+    assert [(r["Date"], r["Steps"]) for r in records] == [("2026-02-01", 1000), ("2026-02-02", 2000)]
+
+
+# ─── Merge Rules ─────────────────────────────────────────────────────
+
+def test_batch_merge_keeps_existing_values_for_empty_incoming():
+    ws = FakeWorksheet([_row("2026-02-01", Weight_kg=85.2, Calories=2100, Protein_g=180)])
+    _client(ws).upsert_daily_rows_batch(
+        [("2026-02-01", {"Weight_kg": None, "Calories": "", "Protein_g": 175})], source="nutrition",
+    )
+
+    row = ws.row("2026-02-01")
+    assert row["Weight_kg"] == 85.2
+    assert row["Calories"] == 2100
+    assert row["Protein_g"] == 175  # Conflicting value — incoming wins
+
+
+def test_batch_merge_fills_empty_and_partial_rows():
+    ws = FakeWorksheet([_row("2026-02-01"), _row("2026-02-02", Sleep_Score=80)])
+    _client(ws).upsert_daily_rows_batch(
+        [("2026-02-01", {"Calories": 2000}), ("2026-02-02", {"Calories": 1800})], source="nutrition",
+    )
+
+    assert ws.row("2026-02-01")["Nutrition_Logged"] == "TRUE"
+    assert ws.row("2026-02-01")["Data_Complete"] == "FALSE"
+    assert ws.row("2026-02-02")["Sleep_Score"] == 80
+    assert ws.row("2026-02-02")["Data_Complete"] == "TRUE"
+
+
+def test_batch_rejects_columns_outside_the_source():
+    ws = FakeWorksheet([_row("2026-02-01", Steps=1000)])
+    count = _client(ws).upsert_daily_rows_batch([("2026-02-01", {"Calories": 2000})], source="oura")
+
+    assert count == 0
+    assert ws.row("2026-02-01")["Calories"] == ""
@@ -0,0 +1,22 @@
+"""
+Cell coercion tests for the Telegram bot formatters.
+"""
+
+import pytest
+
+from backend.clients.telegram_bot import _safe_float, _safe_int
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None), ("", None), ("abc", None), ("nan", None), ("inf", None), ("-inf", None),
+    (12, 12), (12.9, 12), ("12.7", 12), (" 7 ", 7), (float("nan"), None), (float("inf"), None),
+])
+def test_safe_int(value, expected):
+    assert _safe_int(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None), ("", None), ("abc", None), (3, 3.0), (2.5, 2.5), ("85.2", 85.2),
+])
+def test_safe_float(value, expected):
+    assert _safe_float(value) == expected
@@ -0,0 +1,25 @@
+"""
+Tests for the shared cell value helpers.
+"""
+
+import pytest
+
+from backend.utils.value_utils import TRUTHY, safe_float
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None), ("", None), ("abc", None), ([], None),
+    (85.2, 85.2), (3, 3.0), ("85.2", 85.2), (" 7 ", 7.0), (True, 1.0),
+])
+def test_safe_float(value, expected):
+    result = safe_float(value)
+    assert result == expected
+    assert result is None or type(result) is float
+
+
+@pytest.mark.parametrize("value, checked", [
+    ("TRUE", True), ("true", True), (True, True), (1, True),
+    ("FALSE", False), (False, False), ("", False), (None, False), (0, False),
+])
+def test_truthy(value, checked):
+    assert (value in TRUTHY) is checked